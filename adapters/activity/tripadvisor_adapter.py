@@ -1,18 +1,53 @@
+import logging
 import requests
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Optional, Tuple
 from models import UserInput, Activity
 from adapters.activity.base import ActivityAdapter
+from adapters.streaming import stream_response
+from adapters.coalescing import RequestCoalescer
+from adapters.cache import ResponseCache
+from adapters.destination_cache import DestinationCache
+from adapters.rate_limit import TokenBucket
+from adapters.transport import Transport
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 class TripAdvisorAdapter(ActivityAdapter):
-    def __init__(self, api_key: str):
-        super().__init__(api_key)
+
+    PROVIDER = "tripadvisor"
+    ORIGIN = "https://tripadvisor-com1.p.rapidapi.com"
+
+    # Most attractions/details requests in flight at once
+    DETAILS_CONCURRENCY = 10
+
+    def __init__(self, api_key: str, transport: Transport = None):
+        super().__init__(api_key, transport)
         self.base_url = "tripadvisor-com1.p.rapidapi.com"
+        self.endpoint = self.ORIGIN
+        # Trips to the same city at the same time share one auto-complete call
+        self.location_coalescer = RequestCoalescer.shared("tripadvisor_auto_complete")
+        # City -> geoId, kept on disk; the mapping is stable for months
+        self.destination_cache = DestinationCache.shared("tripadvisor")
+        # Every TripAdvisor request counts against the RapidAPI plan's rate limit
+        self.rate_limiter = TokenBucket.shared("tripadvisor")
+
+    def _get(self, url: str, headers: Dict[str, str], params: Dict[str, Any], **kwargs) -> requests.Response:
+        self.rate_limiter.acquire()
+        return self.transport.get(url, headers=headers, params=params, **kwargs)
+
+    def _get_json(self, url: str, headers: Dict[str, str], params: Dict[str, Any], kind: str) -> Dict[str, Any]:
+        data = self._get(url, headers, params).json()
+        self.capture.record(self.PROVIDER, kind, data, params)
+        return data
 
     def _get_location_id(self, location: str) -> str:
-        """Get the geoId for a location using auto-complete endpoint"""
-        url = f"https://{self.base_url}/auto-complete"
-        
+        """Get the geoId for a location, from the geoId cache when possible"""
+        return self._resolve_location(location)[0]
+
+    def _resolve_location(self, location: str) -> Tuple[str, Optional[float]]:
+        """The geoId for a location, and the milliseconds saved if it came from the cache"""
         # Clean up location name
         location = location.strip()
         if not location:
@@ -21,7 +56,16 @@ class TripAdvisorAdapter(ActivityAdapter):
         # Try to extract city name if location contains additional details
         if "," in location:
             location = location.split(",")[0].strip()
-        
+
+        destination, saved_ms = self.destination_cache.resolve_timed(location, self.lookup_destination)
+        if not destination:
+            raise ValueError(f"No destination found for location: {location}")
+        return destination["geo_id"], saved_ms
+
+    def lookup_destination(self, location: str) -> Optional[Dict[str, str]]:
+        """Ask auto-complete for a location's geoId; None if TripAdvisor has none"""
+        url = f"{self.endpoint}/auto-complete"
+
         params = {
             "query": location
         }
@@ -32,15 +76,14 @@ class TripAdvisorAdapter(ActivityAdapter):
         }
 
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response_data = response.json()
-            
-            # Check if data array exists and is not empty
-            if not response_data.get("data"):
-                raise ValueError(f"No destination found for location: {location}")
+            key = ResponseCache.make_key(params)
+            response_data, _ = self.location_coalescer.do(key, lambda: self._get_json(url, headers, params, "location_search"))
             
+            # An error reply has no data; an empty list means TripAdvisor doesn't know the location
+            if "data" not in response_data:
+                raise ValueError(response_data.get("message") or f"No destination found for location: {location}")
             if not response_data["data"]:
-                raise ValueError(f"Empty results for location: {location}")
+                return None
             
             # Find the most relevant result
             for result in response_data["data"]:
@@ -56,14 +99,14 @@ class TripAdvisorAdapter(ActivityAdapter):
                 if place_type in ["CITY", "REGION"]:
                     geo_id = result.get("geoId")
                     if geo_id:
-                        return geo_id
+                        return {"geo_id": geo_id}
             
             # If no specific city/region found, use the first result
             geo_id = response_data["data"][0].get("geoId")
             if not geo_id:
                 raise ValueError(f"No valid geoId found for location: {location}")
                 
-            return geo_id
+            return {"geo_id": geo_id}
             
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to connect to TripAdvisor API: {str(e)}")
@@ -81,16 +124,20 @@ class TripAdvisorAdapter(ActivityAdapter):
         
         return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
 
-    def search_activities(self, input: UserInput) -> Dict[str, Any]:
-        """Search for activities using TripAdvisor API"""
+    def search_activities(self, input: UserInput, limit: int = None) -> Dict[str, Any]:
+        """Search for activities using TripAdvisor API
+
+        Attractions are parsed as the response streams in, and reading stops
+        once limit activities have been parsed (None reads every attraction).
+        """
         try:
-            # Get location ID first
-            geo_id = self._get_location_id(input.arrival_location)
+            # Get location ID first; a cache hit goes straight to attractions/search
+            geo_id, saved_ms = self._resolve_location(input.arrival_location)
             
             # Get activity dates
             start_date, end_date = self._get_activity_dates(input)
             
-            url = f"https://{self.base_url}/attractions/search"
+            url = f"{self.endpoint}/attractions/search"
 
             params = {
                 "geoId": geo_id,
@@ -106,87 +153,29 @@ class TripAdvisorAdapter(ActivityAdapter):
                 "X-RapidAPI-Host": self.base_url
             }
 
-            response = requests.get(url, headers=headers, params=params)
-            activity_data = response.json()
-            print("Raw TripAdvisor API response:", activity_data)
-            
+            # The attractions are parsed as they arrive, so keep the ones read only if this search is captured
+            captured = [] if self.capture.sample(self.PROVIDER) else None
+            with self._get(url, headers, params, stream=True) as response:
+                stream = stream_response(response, ("data",), {"attractions"})
+                activities = self._parse_attractions((attraction for _, attraction in stream), limit, captured, params)
+            if captured is not None:
+                self.capture.record(self.PROVIDER, "attraction_search", captured, params, sampled=True)
+
             # Check if we got a valid response
-            if not activity_data.get("data"):
+            if not stream.found_parent:
                 return {"error": "Invalid response from TripAdvisor API"}
-            
-            attractions = activity_data.get("data", {}).get("attractions", [])
-            if not attractions:
-                return {"error": "No activities found"}
 
-            activities = []
-            for attraction in attractions:
-                try:
-                    # Extract contentId from the correct path
-                    content_id = attraction.get("cardLink", {}).get("route", {}).get("params", {}).get("contentId")
-                    
-                    if not content_id:
-                        continue
-                        
-                    # Map TripAdvisor fields to Activity model fields
-                    # Extract image URLs as a list
-                    image_url = attraction.get("cardPhoto", {}).get("sizes", {}).get("urlTemplate")
-                    images = []
-                    if image_url:
-                        # Replace width and height placeholders with actual values
-                        image_url = image_url.replace("{width}", "800").replace("{height}", "600")
-                        # Ensure URL starts with https://
-                        if not image_url.startswith(('http://', 'https://')):
-                            image_url = f"https://{image_url}"
-                        images.append(image_url)
-
-                    # Extract price from merchandising text if available
-                    price_text = attraction.get("merchandisingText", {}).get("htmlString", "")
-                    price = None
-                    if price_text and "from" in price_text.lower():
-                        try:
-                            price_amount = float(price_text.split("£")[1].strip())
-                            price = {"amount": price_amount, "currency": "GBP"}
-                        except (IndexError, ValueError):
-                            pass
-
-                    activity_data = {
-                        "id": content_id,
-                        "name": attraction.get("cardTitle", {}).get("string", ""),
-                        "description": attraction.get("primaryInfo", {}).get("text", ""),
-                        "category": attraction.get("primaryInfo", {}).get("text", ""),
-                        "location": None,  # We'll get this from details endpoint
-                        "price": price,
-                        "reviews": {
-                            "rating": attraction.get("bubbleRating", {}).get("rating"),
-                            "count": attraction.get("bubbleRating", {}).get("numberReviews", {}).get("string", "0").replace("(", "").replace(")", "").replace(",", ""),
-                            "provider": "TripAdvisor"
-                        } if attraction.get("bubbleRating") else None,
-                        "schedule": None,  # We'll get this from details endpoint
-                        "booking_url": f"https://www.tripadvisor.com{attraction.get('cardLink', {}).get('route', {}).get('url', '')}",
-                        "images": images,  # Pass the list of image URLs
-                        "duration": None,  # We'll get this from details endpoint
-                        "minimum_age": None,  # We'll get this from details endpoint
-                        "maximum_age": None,  # We'll get this from details endpoint
-                        "difficulty_level": None,  # We'll get this from details endpoint
-                        "included_items": [],  # We'll get this from details endpoint
-                        "excluded_items": [],  # We'll get this from details endpoint
-                        "cancellation_policy": None,  # We'll get this from details endpoint
-                        "languages": []  # We'll get this from details endpoint
-                    }
-                    
-                    activity_obj = Activity.from_api(activity_data)
-                    activities.append(activity_obj)
-                except Exception as e:
-                    print(f"Failed to parse activity: {str(e)}")
-                    print(f"Activity data: {activity_data}")
-                    continue  # Skip activities that can't be parsed
+            if activities is None:
+                return {"error": "No activities found"}
 
             if not activities:
                 return {"error": "No activities could be parsed"}
 
             return {
                 "status": "success",
-                "results": activities
+                "results": activities,
+                # auto-complete latency skipped thanks to the geoId cache (0 when it was called)
+                "location_lookup_saved_ms": saved_ms or 0.0
             }
 
         except ValueError as e:
@@ -194,13 +183,91 @@ class TripAdvisorAdapter(ActivityAdapter):
         except Exception as e:
             return {"error": f"Failed to search activities: {str(e)}"}
 
+    def _parse_attractions(self, attractions, limit: int = None, captured: list = None, params: Dict[str, Any] = None):
+        """Map attraction cards to Activity models, stopping after limit.
+
+        Attractions read are appended to captured when it is given; cards
+        that fail to parse are captured regardless of the sample rate.
+        Returns None when there were no attractions at all.
+        """
+        seen = False
+        activities = []
+        for attraction in attractions:
+            seen = True
+            if captured is not None:
+                captured.append(attraction)
+            try:
+                # Extract contentId from the correct path
+                content_id = attraction.get("cardLink", {}).get("route", {}).get("params", {}).get("contentId")
+                
+                if not content_id:
+                    continue
+                    
+                # Map TripAdvisor fields to Activity model fields
+                # Extract image URLs as a list
+                image_url = attraction.get("cardPhoto", {}).get("sizes", {}).get("urlTemplate")
+                images = []
+                if image_url:
+                    # Replace width and height placeholders with actual values
+                    image_url = image_url.replace("{width}", "800").replace("{height}", "600")
+                    # Ensure URL starts with https://
+                    if not image_url.startswith(('http://', 'https://')):
+                        image_url = f"https://{image_url}"
+                    images.append(image_url)
+
+                # Extract price from merchandising text if available
+                price_text = attraction.get("merchandisingText", {}).get("htmlString", "")
+                price = None
+                if price_text and "from" in price_text.lower():
+                    try:
+                        price_amount = float(price_text.split("£")[1].strip())
+                        price = {"amount": price_amount, "currency": "GBP"}
+                    except (IndexError, ValueError):
+                        pass
+
+                activity_data = {
+                    "id": content_id,
+                    "name": attraction.get("cardTitle", {}).get("string", ""),
+                    "description": attraction.get("primaryInfo", {}).get("text", ""),
+                    "category": attraction.get("primaryInfo", {}).get("text", ""),
+                    "location": None,  # We'll get this from details endpoint
+                    "price": price,
+                    "reviews": {
+                        "rating": attraction.get("bubbleRating", {}).get("rating"),
+                        "count": attraction.get("bubbleRating", {}).get("numberReviews", {}).get("string", "0").replace("(", "").replace(")", "").replace(",", ""),
+                        "provider": "TripAdvisor"
+                    } if attraction.get("bubbleRating") else None,
+                    "schedule": None,  # We'll get this from details endpoint
+                    "booking_url": f"https://www.tripadvisor.com{attraction.get('cardLink', {}).get('route', {}).get('url', '')}",
+                    "images": images,  # Pass the list of image URLs
+                    "duration": None,  # We'll get this from details endpoint
+                    "minimum_age": None,  # We'll get this from details endpoint
+                    "maximum_age": None,  # We'll get this from details endpoint
+                    "difficulty_level": None,  # We'll get this from details endpoint
+                    "included_items": [],  # We'll get this from details endpoint
+                    "excluded_items": [],  # We'll get this from details endpoint
+                    "cancellation_policy": None,  # We'll get this from details endpoint
+                    "languages": []  # We'll get this from details endpoint
+                }
+                
+                activity_obj = Activity.from_api(activity_data)
+                activities.append(activity_obj)
+                if limit and len(activities) >= limit:
+                    break
+            except Exception as e:
+                logger.warning("Failed to parse TripAdvisor attraction: %s", e)
+                self.capture.record(self.PROVIDER, "attraction_parse_error", attraction, params, sampled=True)
+                continue  # Skip activities that can't be parsed
+
+        return activities if seen else None
+
     def get_activity_details(self, activity_id: str, input: UserInput) -> Dict[str, Any]:
         """Get detailed information about a specific activity"""
         try:
             # Get activity dates
             start_date, end_date = self._get_activity_dates(input)
             
-            url = f"https://{self.base_url}/attractions/details"
+            url = f"{self.endpoint}/attractions/details"
 
             params = {
                 "contentId": activity_id,
@@ -215,7 +282,32 @@ class TripAdvisorAdapter(ActivityAdapter):
                 "X-RapidAPI-Host": self.base_url
             }
 
-            response = requests.get(url, headers=headers, params=params)
-            return response.json()
+            return self._get_json(url, headers, params, "attraction_details")
         except Exception as e:
-            return {"error": f"Failed to get activity details: {str(e)}"} 
\ No newline at end of file
+            return {"error": f"Failed to get activity details: {str(e)}"}
+
+    def get_activities_details(self, activity_ids: Iterable[str], input: UserInput, max_concurrency: int = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch attractions/details for several activities at once
+
+        Requests run max_concurrency at a time (DETAILS_CONCURRENCY by default)
+        within the rate limit, so a batch that fits in the limit's burst costs
+        about one round trip.
+
+        Returns the details "data" object per activity ID, or {"error": ...}
+        for an activity whose request failed.
+        """
+        activity_ids = list(dict.fromkeys(str(activity_id) for activity_id in activity_ids))
+        if not activity_ids:
+            return {}
+
+        def details(activity_id: str) -> Dict[str, Any]:
+            response = self.get_activity_details(activity_id, input)
+            if "error" in response:
+                return response
+            if not isinstance(response.get("data"), dict):
+                return {"error": response.get("message") or "No activity details found"}
+            return response["data"]
+
+        workers = min(len(activity_ids), max_concurrency or self.DETAILS_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="tripadvisor-details") as executor:
+            return dict(zip(activity_ids, executor.map(details, activity_ids))) 
\ No newline at end of file
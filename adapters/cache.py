@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+
+class ResponseCache:
+    """
+    A two-tier cache for provider responses.
+
+    The first tier is an in-memory LRU with a time-to-live. The optional
+    second tier is a SQLite file that survives restarts; entries found there
+    are promoted back into memory. Values must be JSON-serialisable.
+
+    Keys are built from the normalised request parameters with secrets such
+    as ``api_key`` removed, so identical searches share an entry regardless
+    of which key made them.
+    """
+
+    # Parameters whose case and surrounding spaces don't change the response:
+    # place names, location ids, dates, currency and language codes. Anything
+    # else, such as SerpAPI's departure_token, is an opaque value kept verbatim
+    CASE_INSENSITIVE = frozenset({
+        "query", "city", "departure_id", "arrival_id", "dest_id", "search_type",
+        "outbound_date", "return_date", "arrival_date", "departure_date",
+        "currency", "currency_code", "hl", "gl", "languagecode",
+    })
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 1024, path: str = None):
+        """
+        Args:
+            name (str): Namespace for the entries, e.g. "serpapi_flights"
+            ttl (float): Seconds an entry stays fresh
+            max_entries (int): Size of the in-memory LRU tier
+            path (str, optional): SQLite file for the persistent tier; memory only if omitted
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "namespace TEXT, key TEXT, stored_at REAL, value TEXT, PRIMARY KEY (namespace, key))"
+            )
+            self._db.commit()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self._hit_age_total = 0.0
+        self._last_hit_age = None
+
+    @staticmethod
+    def make_key(params: Dict[str, Any], exclude: Iterable[str] = ("api_key",),
+                 case_insensitive: Iterable[str] = CASE_INSENSITIVE) -> str:
+        """
+        Build a cache key from request parameters.
+
+        Args:
+            params (Dict[str, Any]): The request parameters
+            exclude (Iterable[str]): Parameter names to leave out, such as credentials
+            case_insensitive (Iterable[str]): Parameter names whose string values are
+                stripped and lower-cased; other values are used as given
+
+        Returns:
+            str: A stable hash of the remaining parameters
+        """
+        excluded = set(exclude)
+        folded = set(case_insensitive)
+        normalised = {
+            key: value.strip().lower() if isinstance(value, str) and key in folded else value
+            for key, value in params.items() if key not in excluded and value is not None
+        }
+        payload = json.dumps(normalised, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return a fresh cached value, or None on a miss.
+
+        Args:
+            key (str): Key from make_key
+
+        Returns:
+            Optional[Any]: The cached value if present and not expired
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self._record_hit(now - stored_at)
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT stored_at, value FROM responses WHERE namespace = ? AND key = ?",
+                    (self.name, key),
+                ).fetchone()
+                if row and now - row[0] <= self.ttl:
+                    value = json.loads(row[1])
+                    self._remember(key, row[0], value)
+                    self.disk_hits += 1
+                    self._record_hit(now - row[0])
+                    return value
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value in both tiers.
+
+        Args:
+            key (str): Key from make_key
+            value (Any): JSON-serialisable value
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (namespace, key, stored_at, value) VALUES (?, ?, ?, ?)",
+                    (self.name, key, now, json.dumps(value)),
+                )
+                self._db.commit()
+
+    def record_bypass(self) -> None:
+        """Count a lookup skipped because the caller forced a refresh."""
+        with self._lock:
+            self.bypasses += 1
+
+    def clear(self) -> None:
+        """Drop every entry in this namespace from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses WHERE namespace = ?", (self.name,))
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the age of served entries in seconds."""
+        with self._lock:
+            served = self.hits
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "bypasses": self.bypasses,
+                "entries": len(self._memory),
+                "hit_rate": served / (served + self.misses) if served + self.misses else 0.0,
+                "mean_hit_age": self._hit_age_total / served if served else None,
+                "last_hit_age": self._last_hit_age,
+            }
+
+    def _remember(self, key: str, stored_at: float, value: Any) -> None:
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _record_hit(self, age: float) -> None:
+        self.hits += 1
+        self._hit_age_total += age
+        self._last_hit_age = age
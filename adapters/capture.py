@@ -0,0 +1,276 @@
+"""
+Sampled capture of provider payloads for debugging and fixtures.
+
+Providers opt in by name through PAYLOAD_CAPTURE, e.g.
+    PAYLOAD_CAPTURE=booking,tripadvisor:0.5   # booking at the default rate, tripadvisor at 50%
+    PAYLOAD_CAPTURE=*                         # every provider
+
+Read captured payloads back from the repository root:
+    python -m adapters.capture logs/booking_payloads.jsonl.gz
+"""
+import argparse
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class PayloadCapture:
+    """
+    Writes a sample of provider responses to size-capped, gzipped JSON-lines files.
+
+    Recording a payload only draws a random number and, when the payload is
+    sampled, puts a reference on a bounded queue, so the request path never
+    formats or writes anything. A background thread serialises queued
+    payloads in batches and appends each batch to
+    ``<directory>/<provider>_payloads.jsonl.gz`` as one gzip member. When a
+    file would grow past ``max_bytes`` it is rotated to ``.1``, ``.2`` and
+    so on, keeping ``backups`` old files (a single batch bigger than
+    ``max_bytes`` gets a file to itself). If the writer falls behind, new
+    payloads are dropped and counted rather than making callers wait.
+
+    Payloads must not be modified after they are recorded.
+    """
+
+    RATE = 0.05
+    MAX_BYTES = 10 * 1024 * 1024
+    BACKUPS = 5
+    QUEUE_SIZE = 256
+    # Most payloads serialised into one gzip member
+    BATCH = 64
+
+    _shared: "PayloadCapture" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, providers: Dict[str, float] = None, directory: str = "logs", max_bytes: int = MAX_BYTES,
+                 backups: int = BACKUPS, queue_size: int = QUEUE_SIZE):
+        """
+        Args:
+            providers (Dict[str, float], optional): Sample rate per opted-in provider; "*" matches any.
+                Nothing is captured if omitted
+            directory (str): Where capture files are written
+            max_bytes (int): Size at which a provider's file is rotated
+            backups (int): Rotated files kept per provider
+            queue_size (int): Payloads waiting to be written before new ones are dropped
+        """
+        self.providers = dict(providers or {})
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.write_errors = 0
+
+    @classmethod
+    def shared(cls) -> "PayloadCapture":
+        """
+        The process-wide capture, configured from the environment.
+
+        PAYLOAD_CAPTURE lists the providers to capture as name[:rate]
+        (RATE by default); capture is off when it is unset.
+        PAYLOAD_CAPTURE_DIR (default logs) and PAYLOAD_CAPTURE_MAX_BYTES
+        set where files go and when they rotate.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    cls.parse_providers(os.getenv("PAYLOAD_CAPTURE", "")),
+                    directory=os.getenv("PAYLOAD_CAPTURE_DIR", "logs"),
+                    max_bytes=int(os.getenv("PAYLOAD_CAPTURE_MAX_BYTES", cls.MAX_BYTES)),
+                )
+            return cls._shared
+
+    @classmethod
+    def parse_providers(cls, setting: str) -> Dict[str, float]:
+        """'booking,tripadvisor:0.5' -> {"booking": RATE, "tripadvisor": 0.5}"""
+        providers = {}
+        for entry in setting.split(","):
+            name, _, rate = entry.strip().partition(":")
+            if name:
+                providers[name] = float(rate) if rate else cls.RATE
+        return providers
+
+    def rate(self, provider: str) -> float:
+        """The provider's sample rate; 0 if it hasn't opted in."""
+        return self.providers.get(provider, self.providers.get("*", 0.0))
+
+    def sample(self, provider: str) -> bool:
+        """Decide whether to capture the provider's next payload."""
+        rate = self.rate(provider)
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def record(self, provider: str, kind: str, payload: Any, context: Dict[str, Any] = None,
+               sampled: bool = None) -> bool:
+        """
+        Queue a payload for writing if it is sampled.
+
+        Args:
+            provider (str): Provider name, e.g. "booking"
+            kind (str): What the payload is, e.g. "hotel_search"
+            payload (Any): JSON-serialisable response data
+            context (Dict[str, Any], optional): Request parameters or other details; api_key is dropped
+            sampled (bool, optional): A decision already taken with sample(); drawn here if omitted.
+                Pass True to keep a payload (e.g. one that failed to parse) from an opted-in provider
+
+        Returns:
+            bool: True if the payload was queued
+        """
+        if sampled is None:
+            sampled = self.sample(provider)
+        if not sampled or not self.rate(provider):
+            return False
+        entry = (time.time(), provider, kind, payload, context)
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.recorded += 1
+        self._start()
+        return True
+
+    def _start(self) -> None:
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="payload-capture", daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(entry is _STOP for entry in batch)
+            try:
+                self._write([entry for entry in batch if entry is not _STOP])
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch) -> None:
+        lines: Dict[str, list] = {}
+        for stamp, provider, kind, payload, context in batch:
+            context = {key: value for key, value in (context or {}).items() if key != "api_key"}
+            record = {"ts": round(stamp, 3), "provider": provider, "kind": kind, "context": context, "payload": payload}
+            try:
+                lines.setdefault(provider, []).append(json.dumps(record, default=str))
+            except (TypeError, ValueError) as e:
+                logger.warning("Could not serialise %s %s payload: %s", provider, kind, e)
+                with self._lock:
+                    self.write_errors += 1
+
+        for provider, records in lines.items():
+            data = gzip.compress(("\n".join(records) + "\n").encode("utf-8"), compresslevel=6)
+            try:
+                path = self.path(provider)
+                os.makedirs(self.directory, exist_ok=True)
+                if os.path.exists(path) and os.path.getsize(path) + len(data) > self.max_bytes:
+                    self._rotate(path)
+                with open(path, "ab") as file:
+                    file.write(data)
+            except OSError as e:
+                logger.warning("Could not write %s payloads: %s", provider, e)
+                with self._lock:
+                    self.write_errors += 1
+                continue
+            with self._lock:
+                self.written += len(records)
+                self.bytes_written += len(data)
+
+    def path(self, provider: str) -> str:
+        """The file a provider's payloads are currently written to."""
+        return os.path.join(self.directory, f"{provider}_payloads.jsonl.gz")
+
+    def _rotate(self, path: str) -> None:
+        stem = path[:-len(".jsonl.gz")]
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{stem}.{index}.jsonl.gz"
+            if os.path.exists(older):
+                os.replace(older, f"{stem}.{index + 1}.jsonl.gz")
+        if self.backups:
+            os.replace(path, f"{stem}.1.jsonl.gz")
+        else:
+            os.remove(path)
+
+    def flush(self) -> None:
+        """Wait until every queued payload has been written."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write what is queued and stop the writer thread."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is None or not writer.is_alive():
+            return
+        self._queue.put(_STOP)
+        writer.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Payloads queued, dropped on a full queue, written, and compressed bytes written."""
+        with self._lock:
+            return {
+                "providers": dict(self.providers),
+                "recorded": self.recorded,
+                "dropped": self.dropped,
+                "written": self.written,
+                "bytes_written": self.bytes_written,
+                "write_errors": self.write_errors,
+                "queued": self._queue.qsize(),
+            }
+
+
+def read_payloads(path: str) -> Iterator[Dict[str, Any]]:
+    """Records from a capture file, oldest first."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="List captured provider payloads.")
+    parser.add_argument("path", help="Capture file, e.g. logs/booking_payloads.jsonl.gz")
+    parser.add_argument("--kind", help="Only payloads of this kind")
+    parser.add_argument("--full", action="store_true", help="Print whole records instead of a summary")
+    args = parser.parse_args()
+
+    for record in read_payloads(args.path):
+        if args.kind and record["kind"] != args.kind:
+            continue
+        if args.full:
+            print(json.dumps(record, indent=2))
+        else:
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record["ts"]))
+            size = len(json.dumps(record["payload"]))
+            print(f"{stamp} {record['provider']} {record['kind']} {size} bytes {json.dumps(record['context'])}")
+
+
+if __name__ == "__main__":
+    main()
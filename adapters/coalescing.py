@@ -0,0 +1,137 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class RequestCoalescer:
+    """
+    Share one in-flight provider call between identical concurrent requests.
+
+    The first caller for a key makes the call; callers arriving with the same
+    key while it is running wait for it and receive the same result, or the
+    same exception. Nothing is kept once the call finishes, so this only
+    collapses concurrent duplicates; reuse over time is ResponseCache's job.
+
+    Thread and asyncio callers share the same in-flight calls. An asyncio
+    caller never blocks its event loop while waiting, but a thread caller
+    must not wait inside an event loop on a call led from that same loop.
+    Cancelling an asyncio caller, the leader included, only stops that
+    caller waiting; the shared call carries on for everyone else.
+    """
+
+    _shared: Dict[str, "RequestCoalescer"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name (str): Label for the calls coalesced, e.g. "booking_destination"
+        """
+        self.name = name
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.saved = 0
+
+    @classmethod
+    def shared(cls, name: str) -> "RequestCoalescer":
+        """The process-wide coalescer for a name, so every adapter instance joins the same calls."""
+        with cls._shared_lock:
+            if name not in cls._shared:
+                cls._shared[name] = cls(name)
+            return cls._shared[name]
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.saved += 1
+                return future, False
+            future = self._in_flight[key] = Future()
+            # A running future can't be cancelled, so a waiter giving up can't cancel it for the others
+            future.set_running_or_notify_cancel()
+            self.calls += 1
+            return future, True
+
+    def _finish(self, key: str, future: Future, result: Any = None, error: BaseException = None) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, call: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run call, or wait for the identical call already in flight.
+
+        Args:
+            key (str): Normalised request key, e.g. from ResponseCache.make_key
+            call (Callable[[], Any]): Makes the provider call
+
+        Returns:
+            Tuple[Any, bool]: The result, and whether it came from another caller's call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(), True
+        try:
+            result = call()
+        except BaseException as error:
+            self._finish(key, future, error=error)
+            raise
+        self._finish(key, future, result)
+        return result, False
+
+    async def do_async(self, key: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await call(), or the identical call already in flight.
+
+        Args:
+            key (str): Normalised request key, e.g. from ResponseCache.make_key
+            call (Callable[[], Awaitable[Any]]): Starts the provider call
+
+        Returns:
+            Tuple[Any, bool]: The result, and whether it came from another caller's call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future), True
+        # The call runs as its own task, so cancelling the leader doesn't cancel it for the waiters
+        task = asyncio.ensure_future(call())
+        task.add_done_callback(lambda done: self._finish_task(key, future, done))
+        return await asyncio.shield(task), False
+
+    def _finish_task(self, key: str, future: Future, task: "asyncio.Future") -> None:
+        if task.cancelled():
+            self._finish(key, future, error=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._finish(key, future, error=task.exception())
+        else:
+            self._finish(key, future, task.result())
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls made, calls saved by sharing, and calls currently in flight."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "saved": self.saved,
+                "in_flight": len(self._in_flight),
+            }
+
+    @classmethod
+    def all_stats(cls) -> Dict[str, Dict[str, Any]]:
+        """stats() for every shared coalescer, by name."""
+        with cls._shared_lock:
+            coalescers = list(cls._shared.values())
+        return {coalescer.name: coalescer.stats() for coalescer in coalescers}
@@ -0,0 +1,220 @@
+"""
+Long-lived cache of city -> provider destination IDs.
+
+Warm it for a list of cities from the repository root:
+    python -m adapters.destination_cache --provider booking Paris London Rome
+    python -m adapters.destination_cache --provider skyscrapper --file cities.txt
+    python -m adapters.destination_cache --provider tripadvisor --file cities.txt
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from adapters.cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+
+
+class DestinationCache:
+    """
+    A disk-backed cache of the destination a provider assigns to a city.
+
+    Destination IDs (Booking.com ``dest_id``, Sky Scrapper ``entityId``,
+    TripAdvisor ``geoId``) almost never change, so found destinations are
+    kept for ``ttl``. Cities the provider doesn't know are remembered for
+    the shorter ``negative_ttl``, so repeated searches for them don't cost a
+    call either. Errors raised while resolving are never cached.
+
+    Each entry also records how long the provider took to answer, which is
+    the latency a later hit saves.
+    """
+
+    TTL = 30 * DAY
+    NEGATIVE_TTL = DAY
+
+    _shared: Dict[str, "DestinationCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, provider: str, ttl: float = TTL, negative_ttl: float = NEGATIVE_TTL, path: str = None):
+        """
+        Args:
+            provider (str): Namespace for the entries, e.g. "booking"
+            ttl (float): Seconds a found destination stays fresh
+            negative_ttl (float): Seconds a "no destination found" answer stays fresh
+            path (str, optional): SQLite file for the entries; memory only if omitted
+        """
+        self.provider = provider
+        self.found = ResponseCache(f"{provider}_destinations", ttl=ttl, path=path)
+        self.missing = ResponseCache(f"{provider}_missing_destinations", ttl=negative_ttl, path=path)
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.lookup_ms = 0.0
+        self.saved_ms = 0.0
+
+    @classmethod
+    def shared(cls, provider: str) -> "DestinationCache":
+        """
+        The process-wide cache for a provider, stored on disk.
+
+        Set DESTINATION_CACHE_PATH to change the file (default
+        data/destination_cache.sqlite); an empty value keeps it in memory.
+        """
+        with cls._shared_lock:
+            if provider not in cls._shared:
+                path = os.getenv("DESTINATION_CACHE_PATH", os.path.join("data", "destination_cache.sqlite"))
+                cls._shared[provider] = cls(provider, path=path or None)
+            return cls._shared[provider]
+
+    @staticmethod
+    def _key(city: str) -> str:
+        return ResponseCache.make_key({"city": " ".join(city.split())})
+
+    def _cached(self, key: str) -> Tuple[bool, Optional[Dict[str, Any]], Optional[float]]:
+        """(hit, destination, lookup_ms saved) for a key."""
+        destination = None
+        entry = self.found.get(key)
+        if entry is not None:
+            destination = entry["destination"]
+        else:
+            entry = self.missing.get(key)
+            if entry is None:
+                return False, None, None
+        saved_ms = entry["lookup_ms"]
+        with self._lock:
+            self.saved_ms += saved_ms or 0.0
+        return True, destination, saved_ms
+
+    def _store(self, key: str, destination: Optional[Dict[str, Any]], lookup_ms: float) -> None:
+        with self._lock:
+            self.lookups += 1
+            self.lookup_ms += lookup_ms
+        lookup_ms = round(lookup_ms, 1)
+        if destination is None:
+            self.missing.set(key, {"lookup_ms": lookup_ms})
+        else:
+            self.found.set(key, {"destination": destination, "lookup_ms": lookup_ms})
+
+    def resolve_timed(self, city: str, lookup: Callable[[str], Optional[Dict[str, Any]]]) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+        """
+        As resolve, also returning the milliseconds a cache hit saved.
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Optional[float]]: The destination
+            (or None), and how long the provider lookup the hit stands in for
+            took; None when the provider was asked now
+        """
+        key = self._key(city)
+        hit, destination, saved_ms = self._cached(key)
+        if hit:
+            return destination, saved_ms
+
+        start = time.perf_counter()
+        destination = lookup(city)
+        self._store(key, destination, (time.perf_counter() - start) * 1000)
+        return destination, None
+
+    def resolve(self, city: str, lookup: Callable[[str], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached destination for a city, calling lookup on a miss.
+
+        Args:
+            city (str): City name as the user typed it
+            lookup (Callable): Asks the provider; returns the destination or
+                None when the provider has none
+
+        Returns:
+            Optional[Dict[str, Any]]: The destination, or None if there is none
+        """
+        return self.resolve_timed(city, lookup)[0]
+
+    async def resolve_async(self, city: str, lookup: Callable[[str], Awaitable[Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        """As resolve, for an async lookup."""
+        key = self._key(city)
+        hit, destination, _ = self._cached(key)
+        if hit:
+            return destination
+
+        start = time.perf_counter()
+        destination = await lookup(city)
+        self._store(key, destination, (time.perf_counter() - start) * 1000)
+        return destination
+
+    def warm(self, cities: Iterable[str], lookup: Callable[[str], Optional[Dict[str, Any]]],
+             max_workers: int = 4) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resolve a list of cities ahead of time.
+
+        Args:
+            cities (Iterable[str]): City names
+            lookup (Callable): As for resolve
+            max_workers (int): Lookups made at once
+
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: Destination per city (None if
+            not found); cities whose lookup failed are left out
+        """
+        def resolve(city: str):
+            try:
+                return city, self.resolve(city, lookup)
+            except Exception as e:
+                logger.warning("Failed to resolve destination for %s: %s", city, e)
+                return city, False
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = list(executor.map(resolve, cities))
+        return {city: destination for city, destination in results if destination is not False}
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the found and not-found tiers, and provider time spent and saved."""
+        with self._lock:
+            timing = {
+                "lookups": self.lookups,
+                "lookup_ms": round(self.lookup_ms, 1),
+                "saved_ms": round(self.saved_ms, 1),
+            }
+        return {"found": self.found.stats(), "missing": self.missing.stats(), **timing}
+
+
+def main() -> None:
+    from dotenv import load_dotenv
+    from adapters.activity.tripadvisor_adapter import TripAdvisorAdapter
+    from adapters.hotel.bookingcom_adapter import BookingAdapter
+    from adapters.hotel.skyscrapperbooking_adapter import SkyScrapperBookingAdapter
+
+    adapters = {"booking": BookingAdapter, "skyscrapper": SkyScrapperBookingAdapter, "tripadvisor": TripAdvisorAdapter}
+    parser = argparse.ArgumentParser(description="Preload provider destination IDs for a list of cities.")
+    parser.add_argument("cities", nargs="*", help="City names")
+    parser.add_argument("--file", help="File with one city per line")
+    parser.add_argument("--provider", choices=sorted(adapters), default="booking")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    cities = list(args.cities)
+    if args.file:
+        with open(args.file, encoding="utf-8") as file:
+            cities += [line.strip() for line in file if line.strip()]
+    if not cities:
+        parser.error("no cities given")
+
+    load_dotenv()
+    adapter = adapters[args.provider](os.getenv("RAPIDAPIKEY"))
+    results = adapter.destination_cache.warm(cities, adapter.lookup_destination, max_workers=args.workers)
+    for city in cities:
+        if city in results:
+            print(f"{city}: {results[city] if results[city] else 'no destination'}")
+        else:
+            print(f"{city}: failed")
+    stats = adapter.destination_cache.stats()
+    if stats["lookups"]:
+        print(f"{stats['lookups']} lookups took {stats['lookup_ms'] / stats['lookups']:.0f} ms each on average; "
+              f"searches for these cities now skip them")
+
+
+if __name__ == "__main__":
+    main()
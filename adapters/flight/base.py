@@ -1,12 +1,22 @@
 from abc import ABC, abstractmethod
 from models import UserInput
 from typing import Dict, Any
+from adapters.capture import PayloadCapture
+from adapters.transport import Transport
 
 class FlightAdapter(ABC):
 
-  def __init__(self, api_key: str, base_url: str):
+  # Name the provider opts in to payload capture with
+  PROVIDER: str = None
+  # Scheme and host the provider is called on, for prewarming connections
+  ORIGIN: str = None
+
+  def __init__(self, api_key: str, base_url: str, transport: Transport = None):
     self.api_key = api_key
     self.base_url = base_url
+    # Pooled connections shared with every other adapter unless one is injected
+    self.transport = transport or Transport.shared()
+    self.capture = PayloadCapture.shared()
 
   @abstractmethod
   def search_flights(self, input: UserInput, direction: str = None) -> Dict[str, Any]:
@@ -0,0 +1,135 @@
+import heapq
+import math
+from array import array
+from typing import Any, Dict, List, Sequence
+
+
+class FlightOptionBatch:
+    """
+    Every flight option in a SerpAPI response, stored column by column.
+
+    Only the four numbers used for ranking are extracted: price, total
+    duration in minutes, segment count and this flight's carbon emissions in
+    grams. Each is a flat ``array('d')`` aligned with ``options``, so ranking
+    hundreds of options never builds a model object. Values the provider
+    left out are stored as infinity and rank as worst.
+    """
+
+    CRITERIA = ("price", "duration", "segments", "carbon")
+    DEFAULT_WEIGHTS: Dict[str, float] = {"price": 0.6, "duration": 0.25, "segments": 0.1, "carbon": 0.05}
+
+    def __init__(self, options: Sequence[Dict[str, Any]]):
+        """
+        Args:
+            options (Sequence[Dict[str, Any]]): Raw SerpAPI flight options
+        """
+        self.options = options
+        self.columns: Dict[str, array] = {criterion: array("d") for criterion in self.CRITERIA}
+        price, duration = self.columns["price"], self.columns["duration"]
+        segments, carbon = self.columns["segments"], self.columns["carbon"]
+        for option in options:
+            price.append(_number(option.get("price")))
+            duration.append(_number(option.get("total_duration")))
+            segments.append(len(option.get("flights") or ()) or math.inf)
+            carbon.append(_number((option.get("carbon_emissions") or {}).get("this_flight")))
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any]) -> "FlightOptionBatch":
+        """Collect ``best_flights`` followed by ``other_flights`` from a response."""
+        return cls((data.get("best_flights") or []) + (data.get("other_flights") or []))
+
+    def __len__(self) -> int:
+        return len(self.options)
+
+    def scores(self, weights: Dict[str, float] = None) -> array:
+        """
+        Weighted sum of min-max normalised criteria; lower is better.
+
+        Args:
+            weights (Dict[str, float], optional): Weight per criterion. Missing
+                criteria count as 0. Defaults to ``DEFAULT_WEIGHTS``.
+
+        Returns:
+            array: One score per option in [0, sum of weights]
+        """
+        weights = self.DEFAULT_WEIGHTS if weights is None else weights
+        unknown = set(weights) - set(self.CRITERIA)
+        if unknown:
+            raise ValueError(f"Unknown ranking criteria: {', '.join(sorted(unknown))}")
+
+        total = array("d", bytes(8 * len(self)))
+        for criterion, weight in weights.items():
+            if not weight:
+                continue
+            column = self.columns[criterion]
+            finite = [value for value in column if value != math.inf]
+            low = min(finite, default=0.0)
+            span = (max(finite, default=0.0) - low) or 1.0
+            scale = weight / span
+            total = array("d", [
+                score + (weight if value == math.inf else (value - low) * scale)
+                for score, value in zip(total, column)
+            ])
+        return total
+
+    def pareto_front(self) -> List[int]:
+        """
+        Indexes of options no other option beats on every criterion.
+
+        Options are swept in (price, duration, segments, carbon) order, so each
+        one only needs checking against the front found so far.
+        """
+        price, duration = self.columns["price"], self.columns["duration"]
+        segments, carbon = self.columns["segments"], self.columns["carbon"]
+        order = sorted(range(len(self)), key=lambda i: (price[i], duration[i], segments[i], carbon[i]))
+
+        front: List[int] = []
+        for i in order:
+            point = (price[i], duration[i], segments[i], carbon[i])
+            dominated = False
+            for j in front:
+                other = (price[j], duration[j], segments[j], carbon[j])
+                if other != point and all(a <= b for a, b in zip(other, point)):
+                    dominated = True
+                    break
+            if not dominated:
+                front.append(i)
+        return front
+
+    def rank(self, k: int = 1, weights: Dict[str, float] = None, pareto: bool = True) -> List[int]:
+        """
+        Indexes of the k best options by weighted score, best first.
+
+        Args:
+            k (int): Number of options to return
+            weights (Dict[str, float], optional): See ``scores``
+            pareto (bool): Prefer Pareto-optimal options; dominated options are
+                only used to fill the list when the front has fewer than k
+
+        Returns:
+            List[int]: Positions in ``options``
+        """
+        if k <= 0 or not len(self):
+            return []
+        scores = self.scores(weights)
+        by_score = lambda i: (scores[i], i)
+        if not pareto:
+            return heapq.nsmallest(k, range(len(self)), key=by_score)
+
+        front = self.pareto_front()
+        ranked = heapq.nsmallest(k, front, key=by_score)
+        if len(ranked) < k:
+            chosen = set(front)
+            rest = (i for i in range(len(self)) if i not in chosen)
+            ranked += heapq.nsmallest(k - len(ranked), rest, key=by_score)
+        return ranked
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, str):
+        value = value.replace("£", "").replace(",", "").strip()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return math.inf
+    return number if math.isfinite(number) else math.inf
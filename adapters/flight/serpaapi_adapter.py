@@ -1,25 +1,95 @@
-import requests
 import json
-from typing import Dict, Any
+import os
+from typing import Dict, Any, List, Tuple
 from models import UserInput, Flight
 from adapters.flight.base import FlightAdapter
+from adapters.flight.ranking import FlightOptionBatch
+from adapters.streaming import stream_response
+from adapters.cache import ResponseCache
+from adapters.coalescing import RequestCoalescer
+from adapters.transport import Transport
 
 class SerpAPIAdapter(FlightAdapter):
 
-  def __init__(self, api_key: str, base_url: str):
-    super().__init__(api_key, base_url)
+  PROVIDER = "serpapi"
+  ORIGIN = "https://serpapi.com"
 
-  def search_flights(self, input: UserInput, direction: str = "outbound") -> Dict[str, Any]:
-    if direction == "outbound":
-      departure_id = input.departure_location
-      arrival_id = input.arrival_location
-      date = input.departure_date_leaving
+  # Fares move, so searches are only reused for a short while
+  CACHE_TTL = 15 * 60
+
+  # Ranked alternatives returned next to the chosen flight
+  TOP_K = 3
+
+  _shared_cache: ResponseCache = None
+
+  # Arrays of flight options in a Google Flights response, in document order
+  OPTION_KEYS = ("best_flights", "other_flights")
+
+  def __init__(self, api_key: str, base_url: str, cache: ResponseCache = None, weights: Dict[str, float] = None,
+               max_options: int = None, transport: Transport = None):
+    super().__init__(api_key, base_url, transport)
+    self.cache = cache or self.shared_cache()
+    # Identical searches made at the same time share one provider call
+    self.coalescer = RequestCoalescer.shared("serpapi_flights")
+    # Trade-off between price, duration, segments and carbon; see FlightOptionBatch
+    self.weights = weights
+    # Stop reading a response once this many options have arrived (None reads them all)
+    self.max_options = max_options
+
+  @classmethod
+  def shared_cache(cls) -> ResponseCache:
+    """The process-wide search cache used when no cache is injected.
+
+    Adapters are created per tool call, so the cache has to outlive them.
+    Set SERPAPI_CACHE_PATH to also keep searches across restarts.
+    """
+    if cls._shared_cache is None:
+      cls._shared_cache = ResponseCache(
+        "serpapi_flights",
+        ttl=float(os.getenv("SERPAPI_CACHE_TTL", cls.CACHE_TTL)),
+        path=os.getenv("SERPAPI_CACHE_PATH"),
+      )
+    return cls._shared_cache
+
+  def _get(self, params: Dict[str, Any], refresh: bool = False) -> Tuple[Dict[str, Any], int]:
+    """Fetch a search response, serving identical searches from the cache.
+
+    Error responses are never cached. Pass refresh=True to skip the cache
+    lookup and store the fresh response. Returns the response and the number
+    of provider calls made for it (0 when served from the cache or shared
+    with an identical search already in flight).
+
+    The body is decoded as it streams in, one flight option at a time, and
+    the connection is dropped once max_options options have been read.
+    """
+    key = self.cache.make_key({**params, "max_options": self.max_options})
+    if refresh:
+      self.cache.record_bypass()
     else:
-      departure_id = input.arrival_location
-      arrival_id = input.departure_location
-      date = input.arrival_date_coming_back
-    
-    params = {
+      cached = self.cache.get(key)
+      if cached is not None:
+        return cached, 0
+
+    data, shared = self.coalescer.do(f"{self.base_url}|{key}", lambda: self._fetch(params, key))
+    return data, 0 if shared else 1
+
+  def _fetch(self, params: Dict[str, Any], key: str) -> Dict[str, Any]:
+    with self.transport.get(self.base_url, params=params, stream=True) as response:
+      stream = stream_response(response, keys=self.OPTION_KEYS)
+      options = {option_key: [] for option_key in self.OPTION_KEYS}
+      for count, (option_key, option) in enumerate(stream, start=1):
+        options[option_key].append(option)
+        if self.max_options and count >= self.max_options:
+          break
+      data = {**stream.fields, **options}
+
+    self.capture.record(self.PROVIDER, "flight_search", data, params)
+    if "error" not in data:
+      self.cache.set(key, data)
+    return data
+
+  def _params(self, input: UserInput, departure_id: str, arrival_id: str, date: str) -> Dict[str, Any]:
+    return {
       "engine": "google_flights",
       "adults": input.adult_guests,
       "currency": "GBP",
@@ -32,37 +102,120 @@ class SerpAPIAdapter(FlightAdapter):
       "api_key": self.api_key
     }
 
+  def _rank(self, data: Dict[str, Any], top_k: int = None) -> Tuple[FlightOptionBatch, List[int], List[Flight]]:
+    """Rank every option in a response; only the winners become models."""
+    batch = FlightOptionBatch.from_response(data)
+    ranked = batch.rank(k=top_k or self.TOP_K, weights=self.weights)
+    flight_url = data.get("search_metadata", {}).get("google_flights_url", "")
+    return batch, ranked, [Flight.from_api(batch.options[index], flight_url) for index in ranked]
+
+  def search_flights(self, input: UserInput, direction: str = "outbound", refresh: bool = False, top_k: int = None) -> Dict[str, Any]:
+    if direction == "outbound":
+      departure_id = input.departure_location
+      arrival_id = input.arrival_location
+      date = input.departure_date_leaving
+    else:
+      departure_id = input.arrival_location
+      arrival_id = input.departure_location
+      date = input.arrival_date_coming_back
+
+    params = self._params(input, departure_id, arrival_id, date)
+
     try:
-      response = requests.get(self.base_url, params=params)
-      data = response.json()
+      data, calls = self._get(params, refresh=refresh)
 
       if "error" in data:
-        return {"error": f"SerpAPI error: {data['error']}"}
+        return {"error": f"SerpAPI error: {data['error']}", "provider_calls": calls}
       
       # Check if no flights are found
       if not data.get("best_flights") and not data.get("other_flights"):
         return {
           "status": "no_flights",
-          "message": f"No flights found for {departure_id} to {arrival_id} on {date}"
+          "message": f"No flights found for {departure_id} to {arrival_id} on {date}",
+          "provider_calls": calls
         }
       
-      # Try to get flight data from either best_flights or other_flights
-      best_flight = None
-      if "best_flights" in data and data["best_flights"]:
-        best_flight = data["best_flights"][0]
-      elif "other_flights" in data and data["other_flights"]:
-        best_flight = data["other_flights"][0]
-      
-      if not best_flight:
-        return {"error": f"No flight data found in response: {json.dumps(data)}"}
+      _, ranked, options = self._rank(data, top_k)
 
-      flight_url = data.get("search_metadata", {}).get("google_flights_url", "")
-      flight = Flight.from_api(best_flight, flight_url)
+      if not ranked:
+        return {"error": f"No flight data found in response: {json.dumps(data)}"}
 
       return {
         "status": "success",
-        "flight": flight,
+        "flight": options[0],
+        "options": options,
+        "provider_calls": calls
       }
 
     except Exception as e:
-      return {"error": f"SerpAPIAdapter failed: {str(e)}"}
\ No newline at end of file
+      return {"error": f"SerpAPIAdapter failed: {str(e)}"}
+
+  def search_round_trip(self, input: UserInput, include_inbound: bool = True, refresh: bool = False, top_k: int = None) -> Dict[str, Any]:
+    """Search both legs with one round-trip query.
+
+    Round-trip results list outbound options priced for the whole trip. The
+    return flights for an outbound option need a second call with its
+    departure_token, which is only made when include_inbound is set.
+
+    Returns "flight"/"options" for the outbound leg, "inbound"/"inbound_options"
+    when requested, "total_price" and "provider_calls".
+    """
+    params = self._params(input, input.departure_location, input.arrival_location, input.departure_date_leaving)
+    params.update({"type": "1", "return_date": input.arrival_date_coming_back})
+
+    try:
+      data, calls = self._get(params, refresh=refresh)
+
+      if "error" in data:
+        return {"error": f"SerpAPI error: {data['error']}", "provider_calls": calls}
+
+      if not data.get("best_flights") and not data.get("other_flights"):
+        return {
+          "status": "no_flights",
+          "message": f"No round trips found for {input.departure_location} to {input.arrival_location} "
+                     f"on {input.departure_date_leaving} - {input.arrival_date_coming_back}",
+          "provider_calls": calls
+        }
+
+      batch, ranked, options = self._rank(data, top_k)
+      if not ranked:
+        return {"error": f"No flight data found in response: {json.dumps(data)}"}
+
+      result = {
+        "status": "success",
+        "flight": options[0],
+        "options": options,
+        "total_price": f"{options[0].details.price.currency}{options[0].details.price.amount:.2f}",
+        "provider_calls": calls
+      }
+      if not include_inbound:
+        return result
+
+      token = batch.options[ranked[0]].get("departure_token")
+      if not token:
+        return {"error": "SerpAPI round trip has no departure_token for the return flights", "provider_calls": calls}
+
+      return_data, return_calls = self._get({**params, "departure_token": token}, refresh=refresh)
+      result["provider_calls"] += return_calls
+      if "error" in return_data:
+        return {"error": f"SerpAPI error: {return_data['error']}", "provider_calls": result["provider_calls"]}
+      if not return_data.get("best_flights") and not return_data.get("other_flights"):
+        return {
+          "status": "no_flights",
+          "message": f"No return flights found for {input.arrival_location} to {input.departure_location} "
+                     f"on {input.arrival_date_coming_back}",
+          "provider_calls": result["provider_calls"]
+        }
+
+      _, _, inbound_options = self._rank(return_data, top_k)
+      # Return flights carry the final price of the whole trip
+      inbound_price = inbound_options[0].details.price
+      result.update({
+        "inbound": inbound_options[0],
+        "inbound_options": inbound_options,
+        "total_price": f"{inbound_price.currency}{inbound_price.amount:.2f}"
+      })
+      return result
+
+    except Exception as e:
+      return {"error": f"SerpAPIAdapter failed: {str(e)}"}
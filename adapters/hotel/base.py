@@ -1,12 +1,45 @@
 from abc import ABC, abstractmethod
 from models import UserInput
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from adapters.transport import Transport, run_sync
+from adapters.capture import PayloadCapture
+from adapters.destination_cache import DestinationCache
 
 class HotelAdapter(ABC):
+  """Hotel providers are async; the blocking methods are facades for sync callers."""
 
-  def __init__(self, api_key: str):
+  # Namespace for this provider's cached destination IDs and captured payloads
+  PROVIDER: str = None
+  # Scheme and host the provider is called on, for prewarming connections
+  ORIGIN: str = None
+
+  def __init__(self, api_key: str, transport: Transport = None):
     self.api_key = api_key
+    # Pooled connections shared with every other adapter unless one is injected
+    self.transport = transport or Transport.shared()
+    self.destination_cache = DestinationCache.shared(self.PROVIDER or type(self).__name__)
+    self.capture = PayloadCapture.shared()
+
+  @property
+  def client(self):
+    """The transport's pooled httpx.AsyncClient for the running event loop."""
+    return self.transport.async_client()
 
   @abstractmethod
   def search_hotel_destination(self, input: UserInput) -> Dict[str, Any]:
     pass
+
+  @abstractmethod
+  async def lookup_destination_async(self, city: str) -> Optional[Dict[str, Any]]:
+    """Ask the provider for a city's destination; None if it has none."""
+    pass
+
+  def lookup_destination(self, city: str) -> Optional[Dict[str, Any]]:
+    return run_sync(self.lookup_destination_async(city))
+
+  async def resolve_destination_async(self, city: str) -> Optional[Dict[str, Any]]:
+    """The city's destination, from the destination cache when possible."""
+    return await self.destination_cache.resolve_async(city, self.lookup_destination_async)
+
+  def resolve_destination(self, city: str) -> Optional[Dict[str, Any]]:
+    return self.destination_cache.resolve(city, self.lookup_destination)
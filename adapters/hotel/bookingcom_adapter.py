@@ -1,21 +1,80 @@
-import requests
+import asyncio
+import heapq
+import itertools
+import math
+import re
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Iterable, List, Optional, Union
 from models import UserInput
+from adapters.transport import run_sync
 from adapters.hotel.base import HotelAdapter
+from adapters.transport import Transport
+from adapters.streaming import JSONArrayStream
+from adapters.coalescing import RequestCoalescer
+from adapters.cache import ResponseCache
+
+def hotel_price(hotel: Dict[str, Any]) -> float:
+  """Gross price of a search result; unknown prices sort last."""
+  return hotel.get("property", {}).get("priceBreakdown", {}).get("grossPrice", {}).get("value", float('inf'))
+
+def hotel_review_rank(hotel: Dict[str, Any]) -> float:
+  """Negated review score, so better-reviewed hotels sort first."""
+  return -(hotel.get("property", {}).get("reviewScore") or 0)
+
+_DISTANCE = re.compile(r"([\d.]+)\s*(k?m) from centre")
+
+def hotel_distance_km(hotel: Dict[str, Any]) -> float:
+  """Distance from the centre, read from the result's accessibility label."""
+  match = _DISTANCE.search(hotel.get("accessibilityLabel", ""))
+  if not match:
+    return float('inf')
+  distance = float(match.group(1))
+  return distance if match.group(2) == "km" else distance / 1000
 
 class BookingAdapter(HotelAdapter):
 
-  def __init__(self, api_key: str):
-    super().__init__(api_key)
+  PROVIDER = "booking"
+  ORIGIN = "https://booking-com21.p.rapidapi.com"
+  # Most getHotelDetails requests in flight at once
+  DETAILS_CONCURRENCY = 5
+  # Most searchHotels result pages in flight at once
+  PAGE_CONCURRENCY = 3
+  # Ranking name -> (lower-is-better key, Booking.com sort_by that orders pages by it)
+  RANKINGS = {
+    "price": (hotel_price, "price"),
+    "review_score": (hotel_review_rank, "review_score"),
+    "distance": (hotel_distance_km, "distance"),
+  }
+
+  def __init__(self, api_key: str, transport: Transport = None):
+    super().__init__(api_key, transport)
     self.base_url = "booking-com21.p.rapidapi.com"
     self.api_host = self.base_url
+    self.endpoint = self.ORIGIN
+    # Trips to the same city at the same time share one destination lookup
+    self.destination_coalescer = RequestCoalescer.shared("booking_destination")
 
   def search_hotel_destination(self, input: UserInput) -> Dict[str, Any]:
-    url = f"https://{self.base_url}/api/v1/hotels/searchDestination"
+    return self._search_destination(input.arrival_location)
+
+  async def lookup_destination_async(self, city: str) -> Optional[Dict[str, Any]]:
+    destination_response = await self._fetch_destination(city)
+    # An error reply has no data; an empty list means Booking.com doesn't know the city
+    if "data" not in destination_response:
+      raise ValueError(destination_response.get("message") or f"No destination found for {city}")
+    if not destination_response["data"]:
+      return None
+    destination = destination_response["data"][0]
+    return {"dest_id": destination["dest_id"], "search_type": destination.get("search_type")}
+
+  def _search_destination(self, query: str) -> Dict[str, Any]:
+    return run_sync(self._fetch_destination(query))
+
+  async def _fetch_destination(self, query: str) -> Dict[str, Any]:
+    url = f"{self.endpoint}/api/v1/hotels/searchDestination"
 
     params = {
-      "query": input.arrival_location
+      "query": query
     }
 
     headers = {
@@ -23,17 +82,43 @@ class BookingAdapter(HotelAdapter):
       "x-rapidapi-host": self.api_host
     }
 
-    response = requests.get(url, headers=headers, params=params)
-    return response.json()
+    key = ResponseCache.make_key(params)
+    data, _ = await self.destination_coalescer.do_async(key, lambda: self._get_json(url, headers, params, "destination_search"))
+    return data
 
-  def search_hotels(self, input: UserInput) -> Dict[str, Any]:
-    url = f"https://{self.base_url}/api/v1/hotels/searchHotels"
+  async def _get_json(self, url: str, headers: Dict[str, str], params: Dict[str, Any], kind: str) -> Dict[str, Any]:
+    response = await self.client.get(url, headers=headers, params=params)
+    response.raise_for_status()
+    data = response.json()
+    self.capture.record(self.PROVIDER, kind, data, params)
+    return data
+
+  def search_hotels(self, input: UserInput, top_k: int = 1, key: Union[str, Callable[[Dict[str, Any]], float]] = "price",
+                    max_pages: int = 1, latency_budget: float = None, page_concurrency: int = None) -> List[Dict[str, Any]]:
+    """Blocking form of search_hotels_async."""
+    return run_sync(self.search_hotels_async(input, top_k, key, max_pages, latency_budget, page_concurrency))
+
+  async def search_hotels_async(self, input: UserInput, top_k: int = 1, key: Union[str, Callable[[Dict[str, Any]], float]] = "price",
+                                max_pages: int = 1, latency_budget: float = None, page_concurrency: int = None) -> List[Dict[str, Any]]:
+    """Find the top_k hotels across up to max_pages result pages.
+
+    key is "price", "review_score", "distance" or a function returning a
+    lower-is-better number for a hotel. Named keys ask Booking.com to sort
+    by the same criterion, so once a whole page ranks no better than the
+    current k-th hotel the remaining pages are skipped. Pages are fetched
+    page_concurrency at a time (PAGE_CONCURRENCY by default) and streamed
+    into a heap that never holds more than top_k hotels; pages still
+    outstanding when latency_budget seconds have passed are abandoned.
 
-    # Get dest_id from search_hotel_destination
-    destination_response = self.search_hotel_destination(input)
-    if not destination_response.get("data"):
+    Returns the top_k hotel results, best first.
+    """
+    url = f"{self.endpoint}/api/v1/hotels/searchHotels"
+
+    # Get dest_id from the destination cache, asking searchDestination on a miss
+    destination = await self.resolve_destination_async(input.arrival_location)
+    if not destination:
         raise ValueError("No destination found")
-    dest_id = destination_response["data"][0]["dest_id"]
+    dest_id = destination["dest_id"]
 
     # Map holiday types to Booking.com search types
     search_type_mapping = {
@@ -68,32 +153,113 @@ class BookingAdapter(HotelAdapter):
       "x-rapidapi-host": self.api_host
     }
 
-    response = requests.get(url, headers=headers, params=params)
-    data = response.json()
-    
-    # Get the raw hotel data
-    hotels = data.get("data", {}).get("hotels", [])
-    
-    if not hotels:
-        return []
-        
-    # Sort hotels by price
-    sorted_hotels = sorted(
-        hotels,
-        key=lambda x: x.get("property", {}).get("priceBreakdown", {}).get("grossPrice", {}).get("value", float('inf'))
-    )
-    
-    # Return the cheapest hotel
-    return [sorted_hotels[0]]
-  
-  def get_hotel_details(self, input: UserInput) -> Dict[str, Any]:
-    url = f"https://{self.base_url}/api/v1/hotels/getHotelDetails"
-
-    # Get hotel_id from the first search result
-    search_response = self.search_hotels(input)
-    if not search_response.get("data"):
-        raise ValueError("No hotels found")
-    hotel_id = search_response["data"][0]["hotel_id"]
+    if isinstance(key, str):
+      if key not in self.RANKINGS:
+        raise ValueError(f"Unknown hotel ranking: {key}")
+      key, sort_by = self.RANKINGS[key]
+      params["sort_by"] = sort_by
+      ordered = True
+    else:
+      ordered = False
+
+    # Max-heap of the best top_k as (-key, sequence, hotel); sequence keeps ties in page order
+    best = []
+    sequence = itertools.count()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + latency_budget if latency_budget else None
+    last_page = max_pages
+    next_page = 1
+    pending = {}
+
+    workers = max(1, page_concurrency or self.PAGE_CONCURRENCY)
+    try:
+      while True:
+        while next_page <= last_page and len(pending) < workers:
+          pending[asyncio.ensure_future(self._fetch_page(url, headers, {**params, "page_number": next_page}))] = next_page
+          next_page += 1
+        if not pending:
+          break
+
+        timeout = None if deadline is None else max(0.0, deadline - loop.time())
+        done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        if not done:
+          break  # Latency budget spent; keep what has arrived
+
+        # Pages in order, so an early stop on one page drops later pages that finished alongside it
+        for task in sorted(done, key=pending.get):
+          page = pending.pop(task, None)
+          if page is None or page > last_page:
+            continue
+          hotels = task.result()
+          page_best = math.inf
+          for hotel in hotels:
+            rank = key(hotel)
+            page_best = min(page_best, rank)
+            entry = (-rank, -next(sequence), hotel)
+            if len(best) < top_k:
+              heapq.heappush(best, entry)
+            elif rank < -best[0][0]:
+              heapq.heapreplace(best, entry)
+
+          # An empty page is past the end; on a sorted search a page that can't
+          # beat the current top_k means no later page can either
+          if not hotels or (ordered and len(best) == top_k and page_best >= -best[0][0]):
+            last_page = min(last_page, page)
+            for other, other_page in list(pending.items()):
+              if other_page > last_page:
+                other.cancel()
+                del pending[other]
+    finally:
+      for task in pending:
+        task.cancel()
+
+    # Return the best hotels, best first
+    return [hotel for _, _, hotel in sorted(best, key=lambda entry: (-entry[0], -entry[1]))]
+
+  async def _fetch_page(self, url: str, headers: Dict[str, str], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Hotels are decoded as the page arrives, and reading stops once the hotels array has ended
+    stream = JSONArrayStream(parent=("data",), keys={"hotels"})
+    hotels = []
+    async with self.client.stream("GET", url, headers=headers, params=params) as response:
+      response.raise_for_status()
+      async for chunk in response.aiter_bytes():
+        hotels.extend(hotel for _, hotel in stream.feed(chunk))
+        if stream.complete:
+          break
+    if not stream.complete:
+      hotels.extend(hotel for _, hotel in stream.close())
+    self.capture.record(self.PROVIDER, "hotel_search", hotels, params)
+    return hotels
+
+  def get_hotel_details(self, hotel_ids: Iterable[Any], input: UserInput, max_concurrency: int = None) -> Dict[str, Dict[str, Any]]:
+    """Blocking form of get_hotel_details_async."""
+    return run_sync(self.get_hotel_details_async(hotel_ids, input, max_concurrency))
+
+  async def get_hotel_details_async(self, hotel_ids: Iterable[Any], input: UserInput, max_concurrency: int = None) -> Dict[str, Dict[str, Any]]:
+    """Fetch getHotelDetails for hotels found by a previous search.
+
+    All requests are issued together, at most max_concurrency at a time
+    (DETAILS_CONCURRENCY by default), so N hotels cost N requests in about
+    one round trip.
+
+    Returns the details "data" object per hotel ID, or {"error": ...} for a
+    hotel whose request failed.
+    """
+    hotel_ids = list(dict.fromkeys(str(hotel_id) for hotel_id in hotel_ids))
+    if not hotel_ids:
+      return {}
+
+    slots = asyncio.Semaphore(max(1, max_concurrency or self.DETAILS_CONCURRENCY))
+
+    async def fetch(hotel_id: str) -> Dict[str, Any]:
+      async with slots:
+        return await self._fetch_hotel_detail(hotel_id, input)
+
+    details = await asyncio.gather(*(fetch(hotel_id) for hotel_id in hotel_ids))
+    return dict(zip(hotel_ids, details))
+
+  async def _fetch_hotel_detail(self, hotel_id: str, input: UserInput) -> Dict[str, Any]:
+    url = f"{self.endpoint}/api/v1/hotels/getHotelDetails"
 
     params = {
       "hotel_id": hotel_id,
@@ -109,5 +275,10 @@ class BookingAdapter(HotelAdapter):
       "x-rapidapi-host": self.api_host
     }
 
-    response = requests.get(url, headers=headers, params=params)
-    return response.json()
\ No newline at end of file
+    try:
+      data = await self._get_json(url, headers, params, "hotel_details")
+    except Exception as e:
+      return {"error": f"Failed to get hotel details: {str(e)}"}
+    if not isinstance(data.get("data"), dict):
+      return {"error": data.get("message") or "No hotel details found"}
+    return data["data"]
@@ -1,43 +1,79 @@
-import requests
-import json
-from typing import Dict, Any
+import httpx
+from typing import Dict, Any, Optional, Union
 from models import UserInput, Hotel
+from adapters.transport import run_sync
 from adapters.hotel.base import HotelAdapter
+from adapters.transport import Transport
 
 class SkyScrapperBookingAdapter(HotelAdapter):
 
-  def __init__(self, api_key: str):
-    super().__init__(api_key)
-    self.base_url="https://sky-scrapper.p.rapidapi.com"
+  PROVIDER = "skyscrapper"
+  ORIGIN = "https://sky-scrapper.p.rapidapi.com"
 
-  def search_hotel_destination(self, input: UserInput) -> Dict[str, Any]:
-    self.url = f"{self.base_url}/api/v1/hotels/searchDestinationOrHotel"
+  def __init__(self, api_key: str, transport: Transport = None):
+    super().__init__(api_key, transport)
+    self.base_url = self.ORIGIN
+    self.api_host = "sky-scrapper.p.rapidapi.com"
+
+  def search_hotel_destination(self, input: UserInput) -> Union[str, Dict[str, Any]]:
+    return run_sync(self.search_hotel_destination_async(input))
+
+  async def search_hotel_destination_async(self, input: UserInput) -> Union[str, Dict[str, Any]]:
+    try:
+      destination = await self.resolve_destination_async(input.arrival_location)
+    except (ValueError, httpx.HTTPError) as e:
+      return {"error": str(e)}
+    if not destination:
+      return {"error": "No destination or hotel existing!"}
+    return destination["entity_id"]
+
+  async def lookup_destination_async(self, city: str) -> Optional[Dict[str, Any]]:
+    url = f"{self.base_url}/api/v1/hotels/searchDestinationOrHotel"
 
     params = {
-      "query": input.arrival_location
+      "query": city
     }
 
     headers = {
       "x-rapidapi-key": self.api_key,
-      "x-rapidapi-host": self.url
+      "x-rapidapi-host": self.api_host
     }
 
-    response = requests.get(self.url, headers=headers, params=params)
+    response = await self.client.get(url, headers=headers, params=params)
+    response.raise_for_status()
 
     response_data = response.json()
+    self.capture.record(self.PROVIDER, "destination_search", response_data, params)
 
-    if not response_data.get("data", []):
-      return {"error": "No destination or hotel existing!"}
+    # An error reply has no data; an empty list means Sky Scrapper doesn't know the city
+    if "data" not in response_data:
+      raise ValueError(response_data.get("message") or f"No destination found for {city}")
+    if not response_data["data"]:
+      return None
 
-    entity_id = response_data[0].get("entityId")
+    entity_id = response_data["data"][0].get("entityId")
 
     if not entity_id:
-      return {"error": "Entity ID not found in destination data"}
+      raise ValueError("Entity ID not found in destination data")
 
-    return entity_id
+    return {"entity_id": entity_id}
   
-  def search_hotels(self, input: UserInput, entity_id: str) -> Dict[str, Any]:
-    self.url = f"{self.base_url}/api/v1/hotels/searchHotels"
+  def search_hotels(self, input: UserInput, entity_id: str = None, top_k: int = None) -> Dict[str, Any]:
+    """Blocking form of search_hotels_async."""
+    return run_sync(self.search_hotels_async(input, entity_id, top_k))
+
+  async def search_hotels_async(self, input: UserInput, entity_id: str = None, top_k: int = None) -> Dict[str, Any]:
+    """Search hotels for the trip, cheapest first.
+
+    entity_id is resolved from input.arrival_location when not given; top_k
+    limits the results. Hotels whose data can't be parsed are skipped.
+    """
+    url = f"{self.base_url}/api/v1/hotels/searchHotels"
+
+    if entity_id is None:
+      entity_id = await self.search_hotel_destination_async(input)
+      if isinstance(entity_id, dict):
+        return entity_id
 
     params = {
       "entityId": entity_id,
@@ -50,36 +86,49 @@ class SkyScrapperBookingAdapter(HotelAdapter):
 
     headers = {
       "x-rapidapi-key": self.api_key,
-      "x-rapidapi-host": self.url
+      "x-rapidapi-host": self.api_host
     }
 
-    response = requests.get(self.url, headers=headers, params=params)
+    response = await self.client.get(url, headers=headers, params=params)
 
     data = response.json()
+    self.capture.record(self.PROVIDER, "hotel_search", data, params)
 
-    raw_hotels_data = data.get("data", {}).get("hotels", [])
+    raw_hotels_data = (data.get("data") or {}).get("hotels", [])
 
     if not raw_hotels_data:
       return {"error": "No hotels found"}
-    
+
     hotels = []
+    skipped = 0
     for hotel_data in raw_hotels_data:
-      try: 
-        hotel = Hotel.from_api(hotel_data)
-        hotels.append(hotel)
-
-        return hotel
-      except Exception as e:
-        return {"error": "Irregular hotel data: " + str(e)}
-
+      try:
+        hotels.append(Hotel.from_skyscrapper(
+          hotel_data,
+          check_in=input.departure_date_leaving,
+          check_out=input.arrival_date_coming_back
+        ))
+      except Exception:
+        skipped += 1
+        # Kept whatever the sample rate, to see what changed in the provider's format
+        self.capture.record(self.PROVIDER, "hotel_parse_error", hotel_data, params, sampled=True)
+
+    if not hotels:
+      return {"error": f"Irregular hotel data in all {skipped} hotels"}
+
+    hotels.sort(key=lambda hotel: hotel.total_price.amount if hotel.total_price else float('inf'))
 
     return {
       "status": "success",
-      "results": hotels
+      "results": hotels[:top_k] if top_k else hotels
     }
-  
+
   def get_hotel_details(self, hotel_id: str, entity_id: str) -> Dict[str, Any]:
-    self.url = f"{self.base_url}/api/v1/hotels/getHotelDetails"
+    """Blocking form of get_hotel_details_async."""
+    return run_sync(self.get_hotel_details_async(hotel_id, entity_id))
+
+  async def get_hotel_details_async(self, hotel_id: str, entity_id: str) -> Dict[str, Any]:
+    url = f"{self.base_url}/api/v1/hotels/getHotelDetails"
 
     params = {
       "hotelId": hotel_id,
@@ -89,9 +138,11 @@ class SkyScrapperBookingAdapter(HotelAdapter):
 
     headers = {
       "x-rapidapi-key": self.api_key,
-      "x-rapidapi-host": self.url
+      "x-rapidapi-host": self.api_host
     }
 
-    response = requests.get(self.url, headers=headers, params=params)
+    response = await self.client.get(url, headers=headers, params=params)
 
-    return response.json()
\ No newline at end of file
+    data = response.json()
+    self.capture.record(self.PROVIDER, "hotel_details", data, params)
+    return data
\ No newline at end of file
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limit shared by every caller of one provider.
+
+    The bucket holds up to ``capacity`` tokens and refills at ``rate``
+    tokens per second; each request takes one. A burst of up to
+    ``capacity`` requests goes out at once, after which requests are spaced
+    to the refill rate, so the provider's per-second quota is never
+    exceeded however many threads or tasks are calling.
+    """
+
+    # RapidAPI plan limits: sustained requests per second and burst size
+    RATE = 5.0
+    CAPACITY = 10
+
+    _shared: Dict[str, "TokenBucket"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, name: str, rate: float = RATE, capacity: int = CAPACITY):
+        """
+        Args:
+            name (str): Label for the limit, e.g. "tripadvisor"
+            rate (float): Tokens added per second
+            capacity (int): Most tokens held, i.e. the largest burst
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited = 0.0
+
+    @classmethod
+    def shared(cls, name: str) -> "TokenBucket":
+        """
+        The process-wide bucket for a provider.
+
+        Set <NAME>_RATE_LIMIT to "rate,capacity" (e.g. TRIPADVISOR_RATE_LIMIT=5,10)
+        to match a different plan; RATE and CAPACITY are used otherwise.
+        """
+        with cls._shared_lock:
+            if name not in cls._shared:
+                setting = os.getenv(f"{name.upper()}_RATE_LIMIT")
+                if setting:
+                    rate, _, capacity = setting.partition(",")
+                    cls._shared[name] = cls(name, float(rate), int(capacity or float(rate)))
+                else:
+                    cls._shared[name] = cls(name)
+            return cls._shared[name]
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until one is."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.acquired += 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Wait for a token.
+
+        Args:
+            timeout (float, optional): Most seconds to wait; forever if omitted
+
+        Returns:
+            bool: True once a token was taken, False if timeout ran out first
+        """
+        start = time.monotonic()
+        while True:
+            wait = self._take()
+            if not wait:
+                self._record_wait(time.monotonic() - start)
+                return True
+            if timeout is not None and time.monotonic() - start + wait > timeout:
+                return False
+            time.sleep(wait)
+
+    async def acquire_async(self, timeout: float = None) -> bool:
+        """As acquire, without blocking the event loop."""
+        start = time.monotonic()
+        while True:
+            wait = self._take()
+            if not wait:
+                self._record_wait(time.monotonic() - start)
+                return True
+            if timeout is not None and time.monotonic() - start + wait > timeout:
+                return False
+            await asyncio.sleep(wait)
+
+    def _record_wait(self, waited: float) -> None:
+        with self._lock:
+            self.waited += waited
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests let through and total seconds callers spent waiting."""
+        with self._lock:
+            return {"rate": self.rate, "capacity": self.capacity, "acquired": self.acquired, "waited": round(self.waited, 3)}
@@ -0,0 +1,215 @@
+import codecs
+import json
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Consumed text is dropped from the buffer once this many characters have been read past
+_COMPACT_AT = 1 << 14
+_WHITESPACE = " \t\n\r"
+_NUMBER_START = "-0123456789"
+# Characters a JSON number can contain; a number running to the end of the buffer may not be finished
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+class _Starved(Exception):
+    """A fed stream ran out of buffered text before the current step finished."""
+
+
+# Yielded by the parser when a fed stream needs another chunk to go on
+_STARVED = object()
+
+
+class JSONArrayStream:
+    """
+    Decode selected arrays of a JSON document while it is still arriving.
+
+    The document is read chunk by chunk. ``parent`` is the path of keys from
+    the top-level object to the object holding the arrays of interest; every
+    array under it whose key is in ``keys`` is yielded item by item as soon as
+    each item is complete, without holding the rest of the body. Values of
+    any other key met on the way are decoded whole and kept in ``fields``
+    (e.g. ``search_metadata`` or ``error``), so they should be small.
+
+    Stop iterating at any point to stop reading; the caller is responsible for
+    closing the underlying response.
+
+    Chunks that arrive asynchronously (e.g. ``httpx`` ``aiter_bytes()``) are
+    pushed instead: create the stream without chunks, pass each chunk to
+    ``feed`` and finish with ``close``; both return the items completed so
+    far. Once ``complete`` is set no more items can follow, so a pushed
+    stream can stop reading the response there.
+    """
+
+    def __init__(self, chunks: Optional[Iterable[bytes]] = None, parent: Sequence[str] = (), keys: Collection[str] = ()):
+        """
+        Args:
+            chunks (Iterable[bytes], optional): Raw body chunks, e.g. ``response.iter_content()``;
+                omit to push chunks with feed()
+            parent (Sequence[str]): Keys leading to the object that holds the arrays
+            keys (Collection[str]): Keys of the arrays to stream
+        """
+        self._chunks = None if chunks is None else iter(chunks)
+        self._closed = False
+        self._items: Optional[Iterator] = None
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._exhausted = False
+        self.parent = tuple(parent)
+        self.keys = set(keys)
+        self.fields: Dict[str, Any] = {}
+        # Whether the object at ``parent`` was present in the document
+        self.found_parent = False
+        self._finished_keys = set()
+        self._parent_closed = False
+        self.bytes_read = 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every selected array has been read, or the object that holds them has ended."""
+        return self._parent_closed or bool(self.keys) and self.keys <= self._finished_keys
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        """Yield ``(array key, item)`` pairs in document order."""
+        return self._object(0)
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, Any]]:
+        """Add the next chunk of a pushed stream; returns the ``(array key, item)`` pairs it completed."""
+        if chunk:
+            self.bytes_read += len(chunk)
+            self._buffer += self._utf8.decode(chunk)
+        return self._drain()
+
+    def close(self) -> List[Tuple[str, Any]]:
+        """End a pushed stream; returns the remaining pairs, or raises if the document is incomplete."""
+        self._closed = True
+        return self._drain()
+
+    def _drain(self) -> List[Tuple[str, Any]]:
+        if self._items is None:
+            self._items = self._object(0)
+        items = []
+        for item in self._items:
+            if item is _STARVED:
+                break
+            items.append(item)
+        return items
+
+    def _step(self, step, *args):
+        """Run a parsing step, pausing a pushed stream until it has the text to finish it.
+
+        Steps only move the position once they succeed, so a starved step is
+        simply run again after the next chunk.
+        """
+        while True:
+            try:
+                return step(*args)
+            except _Starved:
+                yield _STARVED
+
+    def _object(self, depth: int) -> Iterator[Tuple[str, Any]]:
+        if (yield from self._step(self._peek)) != "{":
+            # Not an object where one was expected (e.g. "data": null); keep it as a field
+            self.fields[self.parent[depth - 1] if depth else ""] = yield from self._step(self._value)
+            return
+        self._position += 1
+        if depth == len(self.parent):
+            self.found_parent = True
+        while True:
+            char = yield from self._step(self._peek)
+            if char == "}":
+                self._position += 1
+                if depth == len(self.parent):
+                    self._parent_closed = True
+                return
+            if char == ",":
+                self._position += 1
+                continue
+            key = yield from self._step(self._value)
+            yield from self._step(self._expect, ":")
+            if depth < len(self.parent) and key == self.parent[depth]:
+                yield from self._object(depth + 1)
+            elif depth == len(self.parent) and key in self.keys and (yield from self._step(self._peek)) == "[":
+                yield from self._array(key)
+            else:
+                self.fields[key] = yield from self._step(self._value)
+
+    def _array(self, key: str) -> Iterator[Tuple[str, Any]]:
+        self._position += 1
+        while True:
+            char = yield from self._step(self._peek)
+            if char == "]":
+                self._position += 1
+                self._finished_keys.add(key)
+                return
+            if char == ",":
+                self._position += 1
+                continue
+            yield key, (yield from self._step(self._value))
+            self._compact()
+
+    def _value(self) -> Any:
+        char = self._peek()
+        while True:
+            # A number cut by a chunk boundary can still decode (as "12" of "12.5"), so wait for its end
+            if char in _NUMBER_START and not self._exhausted:
+                end = self._position + 1
+                while end < len(self._buffer) and self._buffer[end] in _NUMBER_CHARS:
+                    end += 1
+                if end == len(self._buffer) and self._fill():
+                    continue
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            self._position = end
+            return value
+
+    def _peek(self) -> str:
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                raise json.JSONDecodeError("Unexpected end of JSON stream", self._buffer, self._position)
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buffer, self._position)
+        self._position += 1
+
+    def _fill(self) -> bool:
+        if self._chunks is None:
+            # Pushed chunks are already in the buffer; wait for more unless the stream is closed
+            if not self._closed:
+                raise _Starved()
+        else:
+            for chunk in self._chunks:
+                if chunk:
+                    self.bytes_read += len(chunk)
+                    self._buffer += self._utf8.decode(chunk)
+                    return True
+        if not self._exhausted:
+            self._exhausted = True
+            self._buffer += self._utf8.decode(b"", final=True)
+        return False
+
+    def _compact(self) -> None:
+        if self._position > _COMPACT_AT:
+            self._buffer = self._buffer[self._position:]
+            self._position = 0
+
+
+def stream_response(response, parent: Sequence[str] = (), keys: Collection[str] = (),
+                    chunk_size: int = 16384) -> JSONArrayStream:
+    """Stream the arrays of a ``requests`` response opened with ``stream=True``."""
+    return JSONArrayStream(response.iter_content(chunk_size=chunk_size), parent, keys)
+
+
+def iter_chunks(data: bytes, size: int = 16384) -> Iterator[bytes]:
+    """Split a recorded body into chunks, as a response would deliver it."""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
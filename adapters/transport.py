@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import os
+import ssl
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Iterable, Optional, TypeVar, Union
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import h2  # noqa: F401  (httpx speaks HTTP/2 only when h2 is installed)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_runner: Optional[asyncio.AbstractEventLoop] = None
+_runner_lock = threading.Lock()
+
+
+class Transport:
+    """
+    Pooled HTTP connections shared by every adapter.
+
+    Adapters are created per tool call, so a client owned by an adapter
+    would pay DNS, TCP and TLS setup on every call. The transport outlives
+    them and keeps a keep-alive pool per host, for both sides:
+    - sync: one ``requests.Session``. urllib3 keeps a pool per host.
+      ``get`` applies the connect and read timeouts unless the caller
+      passes its own.
+    - async: one ``httpx.AsyncClient`` per event loop, because httpx
+      connections belong to the loop that opened them. It uses HTTP/2
+      when the h2 package is installed, so each host needs a single
+      connection.
+    ``prewarm`` opens connections to the provider hosts ahead of the first
+    search.
+    """
+
+    CONNECT_TIMEOUT = 5.0
+    READ_TIMEOUT = 15.0
+    # RapidAPI calls for one trip go to a handful of hosts
+    MAX_HOSTS = 16
+    MAX_CONNECTIONS = 32
+    # Connections kept open per host; covers the widest fan-out (details requests)
+    MAX_KEEPALIVE = 16
+    KEEPALIVE_EXPIRY = 30.0
+
+    _shared: "Transport" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT,
+                 max_connections: int = MAX_CONNECTIONS, max_keepalive: int = MAX_KEEPALIVE,
+                 keepalive_expiry: float = KEEPALIVE_EXPIRY, http2: bool = None, verify: Union[bool, str] = True):
+        """
+        Args:
+            connect_timeout (float): Seconds to establish a connection
+            read_timeout (float): Seconds to wait for each read from the server
+            max_connections (int): Most async connections open at once
+            max_keepalive (int): Idle connections kept per host (sync) or in total (async)
+            keepalive_expiry (float): Seconds an idle async connection is kept
+            http2 (bool, optional): Use HTTP/2 for async requests; on when h2 is installed if omitted
+            verify (bool | str): Verify TLS certificates, or the CA bundle to verify them with
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive,
+                                   keepalive_expiry=keepalive_expiry)
+        self.max_keepalive = max_keepalive
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2 and HTTP2_AVAILABLE
+        self.verify = verify
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def shared(cls) -> "Transport":
+        """
+        The process-wide transport.
+
+        HTTP_CONNECT_TIMEOUT and HTTP_READ_TIMEOUT override the timeouts in
+        seconds; HTTP2=0 turns HTTP/2 off.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                http2 = os.getenv("HTTP2")
+                cls._shared = cls(
+                    connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", cls.CONNECT_TIMEOUT)),
+                    read_timeout=float(os.getenv("HTTP_READ_TIMEOUT", cls.READ_TIMEOUT)),
+                    http2=None if http2 is None else http2 not in ("0", "false", "no"),
+                )
+            return cls._shared
+
+    @property
+    def timeout(self) -> tuple:
+        """(connect, read) timeouts in the form requests takes them."""
+        return self.connect_timeout, self.read_timeout
+
+    @property
+    def session(self) -> requests.Session:
+        """The pooled session for synchronous requests."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.MAX_HOSTS, pool_maxsize=self.max_keepalive)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.verify = self.verify
+                    self._session = session
+        return self._session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """``requests.get`` over the pooled session, with the transport's timeouts by default."""
+        return self.request("GET", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        # Per request, since REQUESTS_CA_BUNDLE would otherwise override session.verify
+        kwargs.setdefault("verify", self.verify)
+        return self.session.request(method, url, **kwargs)
+
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        The pooled client for the running event loop.
+
+        Each loop gets its own client, created on first use and reused (with
+        its keep-alive connections) by every adapter on that loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            verify = ssl.create_default_context(cafile=self.verify) if isinstance(self.verify, str) else self.verify
+            timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+            client = self._clients[loop] = httpx.AsyncClient(limits=self.limits, timeout=timeout, http2=self.http2,
+                                                             verify=verify)
+        return client
+
+    def prewarm(self, origins: Iterable[str]) -> int:
+        """
+        Open a pooled connection to each origin for sync and run_sync callers.
+
+        Sends a HEAD request to every origin at once, from the session and
+        from the shared loop's client. Failures are logged and otherwise
+        ignored, since the first real request will simply connect itself.
+
+        Returns:
+            int: Connections opened
+        """
+        origins = list(dict.fromkeys(_origin(url) for url in origins))
+        if not origins:
+            return 0
+        with ThreadPoolExecutor(max_workers=len(origins), thread_name_prefix="http-prewarm") as executor:
+            warmed = sum(executor.map(self._prewarm_sync, origins))
+        return warmed + run_sync(self.prewarm_async(origins))
+
+    def _prewarm_sync(self, origin: str) -> bool:
+        try:
+            self.request("HEAD", origin).close()
+            return True
+        except requests.RequestException as e:
+            logger.warning("Could not prewarm %s: %s", origin, e)
+            return False
+
+    async def prewarm_async(self, origins: Iterable[str]) -> int:
+        """As prewarm, for the running event loop's client."""
+        client = self.async_client()
+
+        async def warm(origin: str) -> bool:
+            try:
+                await client.head(origin, timeout=self.connect_timeout)
+                return True
+            except httpx.HTTPError as e:
+                logger.warning("Could not prewarm %s: %s", origin, e)
+                return False
+
+        return sum(await asyncio.gather(*(warm(origin) for origin in dict.fromkeys(_origin(url) for url in origins))))
+
+    def close(self) -> None:
+        """Close the sync session's connections; async clients close with their loops."""
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+def async_client() -> httpx.AsyncClient:
+    """The shared transport's pooled client for the running event loop."""
+    return Transport.shared().async_client()
+
+
+def _runner_loop() -> asyncio.AbstractEventLoop:
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = asyncio.new_event_loop()
+            threading.Thread(target=_runner.run_forever, name="async-http", daemon=True).start()
+        return _runner
+
+
+def run_sync(coroutine: Awaitable[T]) -> T:
+    """
+    Run a coroutine from synchronous code and return its result.
+
+    Every synchronous caller shares one background event loop, and with it
+    one pooled client, so blocking facades keep their connections alive
+    between calls instead of paying for a new loop and new connections each
+    time as ``asyncio.run`` would. Blocks the calling thread; async code
+    should await the coroutine instead.
+    """
+    loop = _runner_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("run_sync() called from the shared loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
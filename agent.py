@@ -5,11 +5,25 @@ from langchain_core.messages import HumanMessage
 from dotenv import load_dotenv
 from typing import Tuple
 from graph.state import PlannerState
+from adapters.transport import Transport
+from adapters.flight.serpaapi_adapter import SerpAPIAdapter
+from adapters.hotel.bookingcom_adapter import BookingAdapter
+from adapters.hotel.skyscrapperbooking_adapter import SkyScrapperBookingAdapter
+from adapters.activity.tripadvisor_adapter import TripAdvisorAdapter
 
 load_dotenv()
 
 api_key = os.environ.get("GOOGLE_API_KEY")
 
+PROVIDER_ORIGINS = [SerpAPIAdapter.ORIGIN, BookingAdapter.ORIGIN, SkyScrapperBookingAdapter.ORIGIN, TripAdvisorAdapter.ORIGIN]
+
+def prewarm_providers():
+    """Open pooled connections to every provider, for sync adapters and for this event loop."""
+    transport = Transport.shared()
+    # The sync side starts right away in a thread; this loop's client connects at the next await
+    warming = asyncio.get_running_loop().run_in_executor(None, transport.prewarm, PROVIDER_ORIGINS)
+    return asyncio.gather(warming, transport.prewarm_async(PROVIDER_ORIGINS))
+
 async def main():
     initial_content = input("Please describe your trip: ")
     message = HumanMessage(content=initial_content)
@@ -22,7 +36,11 @@ async def main():
 
     # Run the planning workflow
     print("\n📝 Planning your trip...")
+    # Set HTTP_PREWARM=1 to connect to the providers while the trip is planned
+    prewarming = prewarm_providers() if os.getenv("HTTP_PREWARM") else None
     state = planner_agent.run(message)
+    if prewarming:
+        await prewarming
 
     print("\n✈️ Searching for flights...")
     state = flight_agent.run(state)
@@ -2,6 +2,7 @@ from agents import Agent
 from graph.state import PlannerState
 from tools import plan_activity
 from services import ActivityService
+from services.itinerary_planner import ItineraryPlanner
 from langchain_core.messages import AIMessage
 from langgraph.prebuilt import create_react_agent
 from dotenv import load_dotenv
@@ -10,8 +11,14 @@ load_dotenv()
 
 class ActivityAgent(Agent):
 
+    # Candidates searched per trip day, and the most searched per trip; the
+    # itinerary keeps those that fit each day's time budget
+    ACTIVITIES_PER_DAY = 3
+    MAX_CANDIDATES = 30
+
     def __init__(self, api_key: str):
         self.activity_service = ActivityService()
+        self.itinerary_planner = ItineraryPlanner()
         super().__init__(api_key)
         
         self.agent = create_react_agent(
@@ -30,7 +37,9 @@ class ActivityAgent(Agent):
         })
 
         try:
-            response = self.activity_service.search_activities(activity_input)
+            days = len(self.itinerary_planner.budgets(user_data.departure_date_leaving, user_data.arrival_date_coming_back))
+            candidates = min(self.MAX_CANDIDATES, max(1, days) * self.ACTIVITIES_PER_DAY)
+            response = self.activity_service.search_activities(activity_input, limit=candidates)
 
             if response.get("error"):
                 state.messages.append(AIMessage(content=f"Error searching activities: {response['error']}"))
@@ -40,8 +49,15 @@ class ActivityAgent(Agent):
                 state.messages.append(AIMessage(content="No suitable activities found."))
                 return state
 
-            # Select top 3 activities from the results
-            state.activities = response["results"][:3]
+            # Fill in coordinates and durations, then spread the activities over the trip
+            activities = self.activity_service.enrich_activities(response["results"], activity_input)
+            state.itinerary = self.itinerary_planner.plan(
+                activities,
+                user_data.departure_date_leaving,
+                user_data.arrival_date_coming_back,
+                start=state.hotel.location if state.hotel else None
+            )
+            state.activities = [activity for day in state.itinerary for activity in day.activities]
             activity_names = [activity.name for activity in state.activities]
             state.messages.append(AIMessage(content=f"Activities successfully found: {', '.join(activity_names)}"))
         except Exception as e:
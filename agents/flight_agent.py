@@ -1,4 +1,5 @@
 import os
+from datetime import date
 from agents import Agent
 from graph.state import PlannerState
 from tools import plan_flight
@@ -12,7 +13,10 @@ load_dotenv()
 
 class FlightAgent(Agent):
   
-  def __init__(self, api_key: str):
+  # Most airports per city searched when multi_airport is on
+  MAX_AIRPORTS_PER_CITY = 4
+
+  def __init__(self, api_key: str, flexible_days: int = 0, multi_airport: bool = False, trip_mode: str = FlightService.ONE_WAY):
     self.flight_service = FlightService(os.environ.get("SERPAKEY"), base_url="https://serpapi.com/search.json")
     super().__init__(api_key)
     
@@ -23,6 +27,12 @@ class FlightAgent(Agent):
     )
     self.question_generator = QuestionGenerator()
     self.input_validator = InputValidator()
+    # When > 0, a route with no flights is retried across +/- this many days
+    self.flexible_days = flexible_days
+    # Search every commercial airport in both cities instead of only the preferred one
+    self.multi_airport = multi_airport
+    # FlightService.ROUND_TRIP answers with one provider call, since only the outbound flight is kept
+    self.trip_mode = trip_mode
 
   def run(self, state: PlannerState) -> PlannerState:
     user_data = state.user_input
@@ -41,7 +51,24 @@ class FlightAgent(Agent):
         "arrival_location": arrival_iata
     })
 
-    response = self.flight_service.run(flight_input)
+    if self.multi_airport:
+      origins = [airport["iata"] for airport in self.lookup.find_commercial_airports(user_data.departure_location)][:self.MAX_AIRPORTS_PER_CITY]
+      destinations = [airport["iata"] for airport in self.lookup.find_commercial_airports(user_data.arrival_location)][:self.MAX_AIRPORTS_PER_CITY]
+      response = self.flight_service.run_multi_airport(flight_input, origins or [departure_iata], destinations or [arrival_iata])
+    else:
+      response = self.flight_service.run(flight_input, mode=self.trip_mode, include_inbound=False)
+
+    if response.get("status") == "no_flights" and self.flexible_days > 0:
+      flexible = self.flight_service.run_flexible(flight_input, window_days=self.flexible_days)
+      if flexible.get("status") == "success":
+        cheapest = flexible["cheapest"]
+        state.user_input = user_data.model_copy(update={
+          "departure_date_leaving": cheapest["departure_date_leaving"],
+          "arrival_date_coming_back": cheapest["arrival_date_coming_back"],
+          "length_of_stay": (date.fromisoformat(cheapest["arrival_date_coming_back"]) - date.fromisoformat(cheapest["departure_date_leaving"])).days
+        })
+        state.messages.append(AIMessage(content=f"No flights on the requested dates, so I moved the trip to {cheapest['departure_date_leaving']} - {cheapest['arrival_date_coming_back']} ({cheapest['total_price']})."))
+        response = {"status": "success", "flights": cheapest["flights"], "total_price": cheapest["total_price"]}
 
     if "error" in response:
        state.messages.append(AIMessage(content=f"Flight service error: {response['error']}")) 
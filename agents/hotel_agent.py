@@ -2,7 +2,6 @@ from agents import Agent
 from graph.state import PlannerState
 from tools import plan_hotel
 from services import HotelService
-from models.hotel import Hotel
 from langchain_core.messages import AIMessage
 from langgraph.prebuilt import create_react_agent
 from dotenv import load_dotenv
@@ -45,17 +44,10 @@ class HotelAgent(Agent):
                 state.messages.append(AIMessage(content="No suitable hotels found."))
                 return state
 
-            # Get the first (cheapest) hotel from the response
-            hotel_data = response[0]
-            state.hotel = Hotel.from_api(
-                hotel_data=hotel_data,
-                check_in=user_data.departure_date_leaving,
-                check_out=user_data.arrival_date_coming_back
-            )
-            
-            # Get the price information
-            price = hotel_data.get("property", {}).get("priceBreakdown", {}).get("grossPrice", {})
-            price_str = f"{price.get('value', 'N/A')} {price.get('currency', 'GBP')}"
+            # The first hotel is the cheapest across providers
+            state.hotel = response[0]
+            price = state.hotel.total_price
+            price_str = f"{price.amount} {price.currency}" if price else "N/A"
             
             state.messages.append(AIMessage(content=f"Found the most affordable hotel: {state.hotel.name} at {price_str}"))
         except Exception as e:
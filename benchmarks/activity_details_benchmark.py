@@ -0,0 +1,84 @@
+"""
+Enriching activities with attractions/details.
+
+Serves a synthetic attractions/search page and attractions/details
+responses from a local stub with injected latency. Compares fetching the
+details of 10 activities one by one with ActivityService.enrich_activities,
+which fetches them all at once within the TripAdvisor token bucket, and
+then checks the bucket on a plan smaller than the batch.
+
+Run from the repository root:
+    python -m benchmarks.activity_details_benchmark
+"""
+import os
+import time
+
+from benchmarks.fixtures import StubServer, make_tripadvisor_attraction_details, make_tripadvisor_attractions
+from benchmarks.flight_concurrency_benchmark import trip
+
+LATENCY = 0.2
+ACTIVITIES = 10
+
+
+def main() -> None:
+    # Keep geoIds in memory so the benchmark doesn't touch data/
+    os.environ["DESTINATION_CACHE_PATH"] = ""
+    os.environ.setdefault("RAPIDAPIKEY", "stub-key")
+    from adapters.rate_limit import TokenBucket
+    from services.activity_service import ActivityService
+
+    attractions = make_tripadvisor_attractions(30)
+    sent = []
+
+    def responder(path, params):
+        if path.endswith("auto-complete"):
+            return 200, {"data": [{"geoId": "187147"}]}
+        if path.endswith("attractions/search"):
+            return 200, attractions
+        sent.append(time.monotonic())
+        return 200, make_tripadvisor_attraction_details(params["contentId"])
+
+    with StubServer(responder, latency=LATENCY) as stub:
+        service = ActivityService()
+        adapter = service.tripadvisor_adapter
+        adapter.endpoint = stub.url
+        user_input = trip().model_copy(update={"arrival_location": "Paris"})
+        activities = adapter.search_activities(user_input, limit=ACTIVITIES)["results"]
+
+        start = time.perf_counter()
+        for activity in activities:
+            activity.with_details(adapter.get_activity_details(activity.id, user_input).get("data"))
+        serial_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        enriched = service.enrich_activities(activities, user_input)
+        elapsed = time.perf_counter() - start
+
+        # A plan allowing 4 requests at once and 4 a second: the burst goes out together, the rest wait for tokens
+        adapter.rate_limiter = TokenBucket("tripadvisor_small_plan", rate=4, capacity=4)
+        sent.clear()
+        start = time.perf_counter()
+        service.enrich_activities(activities, user_input)
+        limited_elapsed = time.perf_counter() - start
+        first = sent[0]
+        offsets = sorted(moment - first for moment in sent)
+
+    print(f"Injected latency per request: {LATENCY * 1000:.0f} ms, {ACTIVITIES} activities")
+    print(f"Details one by one:           {serial_elapsed * 1000:6.0f} ms")
+    print(f"enrich_activities:            {elapsed * 1000:6.0f} ms")
+    print(f"enrich_activities, 4 rps:     {limited_elapsed * 1000:6.0f} ms  "
+          f"(requests sent at {', '.join(f'{offset * 1000:.0f}' for offset in offsets)} ms)")
+    sample = enriched[0]
+    print(f"  {sample.name}: {sample.duration}, ages {sample.minimum_age}-{sample.maximum_age}, "
+          f"({sample.location.lat:.4f}, {sample.location.lon:.4f}), {', '.join(sample.included_items)}, "
+          f"{sample.cancellation_policy}")
+
+    assert elapsed < 2 * LATENCY < serial_elapsed
+    assert all(activity.location and activity.duration and activity.schedule for activity in enriched)
+    # Never more than the burst plus the refill in any window
+    for index, offset in enumerate(offsets):
+        assert index < 4 + offset * 4 + 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Activity searches with and without the TripAdvisor geoId cache.
+
+Serves auto-complete (the recorded logs/activity.json) and a synthetic
+attractions/search page from a local stub with injected latency. The first
+search for each city pays for the auto-complete call; repeat searches go
+straight to attractions/search and report the latency they saved. Unknown
+cities are cached as misses too, so they don't cost a call either.
+
+Run from the repository root:
+    python -m benchmarks.activity_geo_cache_benchmark
+"""
+import json
+import os
+import time
+
+from benchmarks.fixtures import StubServer, make_tripadvisor_attractions
+from benchmarks.flight_concurrency_benchmark import trip
+
+LATENCY = 0.2
+CITIES = ["Paris", "Rome", "Lisbon"]
+
+
+def main(repeats: int = 3) -> None:
+    # Keep geoIds in memory so the benchmark doesn't touch data/
+    os.environ["DESTINATION_CACHE_PATH"] = ""
+    from adapters.activity.tripadvisor_adapter import TripAdvisorAdapter
+
+    with open("logs/activity.json", encoding="utf-8") as file:
+        auto_complete = json.load(file)
+    attractions = make_tripadvisor_attractions(30)
+    auto_complete_calls = []
+
+    def responder(path, params):
+        if path.endswith("auto-complete"):
+            auto_complete_calls.append(params["query"])
+            return 200, auto_complete if params["query"] != "Atlantis" else {"status": True, "data": []}
+        return 200, attractions
+
+    with StubServer(responder, latency=LATENCY) as stub:
+        adapter = TripAdvisorAdapter("stub-key")
+        adapter.endpoint = stub.url
+
+        print(f"Injected latency per request: {LATENCY * 1000:.0f} ms")
+        for round_number in range(repeats):
+            for city in CITIES:
+                user_input = trip().model_copy(update={"arrival_location": city})
+                start = time.perf_counter()
+                result = adapter.search_activities(user_input, limit=3)
+                elapsed = time.perf_counter() - start
+                print(f"round {round_number + 1}  {city:<7} {elapsed * 1000:5.0f} ms  "
+                      f"saved {result['location_lookup_saved_ms']:5.0f} ms  ({len(result['results'])} activities)")
+
+        for _ in range(repeats):
+            result = adapter.search_activities(trip().model_copy(update={"arrival_location": "Atlantis"}))
+        print(f"Unknown city, {repeats} searches: {result['error']}")
+
+    stats = adapter.destination_cache.stats()
+    print(f"auto-complete calls: {len(auto_complete_calls)} for {len(CITIES) * repeats + repeats} searches; "
+          f"{stats['lookup_ms']:.0f} ms spent, {stats['saved_ms']:.0f} ms saved")
+    assert len(auto_complete_calls) == len(CITIES) + 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark for the nearest-airport index.
+
+Compares AirportGeoIndex.nearest / within_radius against a brute-force
+haversine scan over every airport with coordinates, for random query points
+around existing airports, and checks both return the same airports.
+
+Run from the repository root:
+    python -m benchmarks.airport_geo_benchmark
+"""
+import random
+import time
+
+from services.airport_geo import haversine_km
+from services.airport_lookup import CityToAirportService
+
+
+def brute_force(points, lat, lon):
+    """Distance to every airport, nearest first."""
+    return sorted((haversine_km(lat, lon, point_lat, point_lon), row) for row, point_lat, point_lon in points)
+
+
+def main(csv_path: str = "data/airports.dat", queries: int = 500, k: int = 5, radius_km: float = 150, seed: int = 11) -> None:
+    rng = random.Random(seed)
+    service = CityToAirportService(csv_path)
+    latitudes = service.snapshot.numeric("latitude")
+    longitudes = service.snapshot.numeric("longitude")
+
+    start = time.perf_counter()
+    index = service.geo_index
+    build_elapsed = time.perf_counter() - start
+
+    points = [(row, latitudes[row], longitudes[row]) for row in index.rows]
+    # Jitter real airport positions so queries land where airports actually are
+    targets = []
+    for _ in range(queries):
+        _, lat, lon = rng.choice(points)
+        targets.append((max(-90.0, min(90.0, lat + rng.uniform(-1, 1))), (lon + rng.uniform(-1, 1) + 180) % 360 - 180))
+
+    start = time.perf_counter()
+    brute = [brute_force(points, lat, lon) for lat, lon in targets]
+    brute_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    nearest = [index.nearest(lat, lon, k) for lat, lon in targets]
+    nearest_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    within = [index.within_radius(lat, lon, radius_km) for lat, lon in targets]
+    within_elapsed = time.perf_counter() - start
+
+    mismatches = 0
+    for expected, got_nearest, got_within in zip(brute, nearest, within):
+        if [round(d, 6) for d, _ in expected[:k]] != [round(d, 6) for _, d in got_nearest]:
+            mismatches += 1
+        if {row for d, row in expected if d <= radius_km} != {row for row, _ in got_within}:
+            mismatches += 1
+
+    print(f"Airports indexed:        {len(index)}")
+    print(f"Index build:             {build_elapsed * 1000:.0f} ms")
+    print(f"Brute-force haversine:   {brute_elapsed / queries * 1e6:.0f} us/query")
+    print(f"k-d tree nearest(k={k}):   {nearest_elapsed / queries * 1e6:.0f} us/query")
+    print(f"k-d tree within {radius_km:g} km: {within_elapsed / queries * 1e6:.0f} us/query")
+    print(f"Mismatched results:      {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
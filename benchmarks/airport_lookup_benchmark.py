@@ -0,0 +1,57 @@
+"""
+Micro-benchmark for CityToAirportService lookups.
+
+Compares the original linear-scan lookup against the hash-indexed lookup
+across every distinct city in data/airports.dat.
+
+Run from the repository root:
+    python -m benchmarks.airport_lookup_benchmark
+"""
+import time
+from typing import Dict, List
+
+from services.airport_lookup import CityToAirportService
+
+
+def linear_find_airports_by_city(airports: List[Dict], city_name: str) -> List[Dict]:
+    """The pre-index implementation: scan every airport on every call."""
+    city_name = city_name.strip().lower()
+    return [airport for airport in airports if airport["city"] == city_name]
+
+
+def linear_find_first_iata_by_city(airports: List[Dict], city_name: str) -> str:
+    """The pre-index implementation of the preferred-airport selection."""
+    matches = linear_find_airports_by_city(airports, city_name)
+    if not matches:
+        return None
+    for airport in matches:
+        if "international" in airport["name"].lower():
+            return airport["iata"]
+    return matches[0]["iata"]
+
+
+def main(csv_path: str = "data/airports.dat") -> None:
+    service = CityToAirportService(csv_path)
+    airports = list(service.airports)
+    # Major-airport overrides short-circuit both paths identically, so leave them out
+    cities = sorted(city for city in service.city_index if city not in service.major_airports)
+
+    start = time.perf_counter()
+    old_results = [linear_find_first_iata_by_city(airports, city) for city in cities]
+    old_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_results = [service.find_first_iata_by_city(city) for city in cities]
+    new_elapsed = time.perf_counter() - start
+
+    mismatches = sum(1 for old, new in zip(old_results, new_results) if old != new)
+
+    print(f"Cities resolved:      {len(cities)}")
+    print(f"Linear scan:          {old_elapsed * 1000:.1f} ms ({old_elapsed / len(cities) * 1e6:.1f} us/lookup)")
+    print(f"Hash index:           {new_elapsed * 1000:.3f} ms ({new_elapsed / len(cities) * 1e6:.3f} us/lookup)")
+    print(f"Speed-up:             {old_elapsed / max(new_elapsed, 1e-9):.0f}x")
+    print(f"Mismatched results:   {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Memory benchmark for the columnar airport store.
+
+Uses tracemalloc to compare the heap held by three CityToAirportService
+instances (one per service created in a typical process) against the
+previous layout: a list of four-string dicts per airport, an iata_to_city
+dict, and city / (city, country) indexes holding lists of those dicts.
+
+The snapshot's memory-mapped pages are file-backed and shared between
+processes, so tracemalloc does not count them; only Python heap is compared.
+
+Run from the repository root:
+    python -m benchmarks.airport_memory_benchmark
+"""
+import gc
+import tracemalloc
+from typing import Dict, List
+
+from services.airport_lookup import CityToAirportService
+from services.airport_snapshot import AirportSnapshot, read_airports_csv
+
+
+class LegacyAirportTables:
+    """The list-of-dicts representation the service used before the columnar store."""
+
+    def __init__(self, csv_path: str):
+        self.airports: List[Dict] = [
+            {field: row[field] for field in AirportSnapshot.RECORD_FIELDS} for row in read_airports_csv(csv_path)
+        ]
+        self.iata_to_city = {airport["iata"].upper(): airport["city"] for airport in self.airports}
+        self.city_index: Dict[str, List[Dict]] = {}
+        self.city_country_index: Dict[tuple, List[Dict]] = {}
+        for airport in self.airports:
+            self.city_index.setdefault(airport["city"], []).append(airport)
+            self.city_country_index.setdefault((airport["city"], airport["country"]), []).append(airport)
+
+
+def measure(factory, instances: int = 3) -> int:
+    gc.collect()
+    tracemalloc.start()
+    kept = [factory() for _ in range(instances)]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+
+def main(csv_path: str = "data/airports.dat") -> None:
+    # Build the snapshot outside the measured region
+    AirportSnapshot.load(csv_path)
+
+    legacy = measure(lambda: LegacyAirportTables(csv_path))
+    columnar = measure(lambda: CityToAirportService(csv_path))
+
+    print(f"List-of-dicts x3:       {legacy / 1024 / 1024:.2f} MiB")
+    print(f"Columnar service x3:    {columnar / 1024 / 1024:.2f} MiB")
+    print(f"Saved:                  {(legacy - columnar) / 1024 / 1024:.2f} MiB ({1 - columnar / legacy:.0%})")
+
+
+if __name__ == "__main__":
+    main()
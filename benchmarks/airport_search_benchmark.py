@@ -0,0 +1,88 @@
+"""
+Benchmark for typo-tolerant airport search.
+
+Every distinct city in data/airports.dat is run through the search index
+with one random single-character typo (substitution, insertion, deletion or
+transposition). Reports latency percentiles and how often the intended city
+is the top-ranked or a top-5 candidate, then checks what the
+find_first_iata_by_city fallback resolves for a few misspellings and for
+short inputs that must not resolve at all.
+
+Run from the repository root:
+    python -m benchmarks.airport_search_benchmark
+"""
+import random
+import string
+import time
+
+from services.airport_lookup import CityToAirportService
+from services.airport_search import normalize_query
+
+# Query -> IATA code the fuzzy fallback should return; None where it must not guess
+FALLBACK_CASES = {
+    "Barcelon": "BCN",
+    "Lisboa": "LIS",
+    "Frankfrt": "FRA",
+    "New York City": "JFK",
+    "Charles de Gaulle": "CDG",
+    "Seville": "SVQ",
+    "LA": None,
+    "York": None,
+    "Par": None,
+}
+
+
+def add_typo(word: str, rng: random.Random) -> str:
+    """Apply one random single-character edit to a word."""
+    position = rng.randrange(len(word))
+    operation = rng.choice(("substitute", "insert", "delete", "transpose"))
+    letter = rng.choice(string.ascii_lowercase)
+    if operation == "substitute":
+        return word[:position] + letter + word[position + 1:]
+    if operation == "insert":
+        return word[:position] + letter + word[position:]
+    if operation == "delete" and len(word) > 1:
+        return word[:position] + word[position + 1:]
+    if position < len(word) - 1:
+        return word[:position] + word[position + 1] + word[position] + word[position + 2:]
+    return word + letter
+
+
+def main(csv_path: str = "data/airports.dat", seed: int = 7) -> None:
+    rng = random.Random(seed)
+    service = CityToAirportService(csv_path)
+
+    start = time.perf_counter()
+    index = service.search_index
+    build_elapsed = time.perf_counter() - start
+
+    cities = sorted({normalize_query(city) for city in service.city_index if len(normalize_query(city)) >= 4})
+    queries = [(city, add_typo(city, rng)) for city in cities]
+
+    timings = []
+    top1 = top5 = 0
+    for city, query in queries:
+        start = time.perf_counter()
+        results = index.search(query, limit=5)
+        timings.append(time.perf_counter() - start)
+        terms = [term for term, kind, _, _ in results if kind == "city"]
+        top1 += bool(terms) and terms[0] == city
+        top5 += city in terms
+
+    timings.sort()
+    print(f"Index build:          {build_elapsed * 1000:.0f} ms")
+    print(f"Queries:              {len(queries)}")
+    print(f"Mean latency:         {sum(timings) / len(timings) * 1e6:.0f} us")
+    print(f"p50 / p95 / p99:      {timings[len(timings) // 2] * 1e6:.0f} / "
+          f"{timings[int(len(timings) * 0.95)] * 1e6:.0f} / {timings[int(len(timings) * 0.99)] * 1e6:.0f} us")
+    print(f"Top-1 recall:         {top1 / len(queries):.1%}")
+    print(f"Top-5 recall:         {top5 / len(queries):.1%}")
+
+    resolved = {query: service.find_first_iata_by_city(query) for query in FALLBACK_CASES}
+    for query, iata in resolved.items():
+        print(f"  {query!r:<20} -> {iata}")
+    assert resolved == FALLBACK_CASES, resolved
+
+
+if __name__ == "__main__":
+    main()
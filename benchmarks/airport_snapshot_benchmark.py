@@ -0,0 +1,62 @@
+"""
+Cold-start benchmark for the memory-mapped airport snapshot.
+
+Each scenario runs in a fresh interpreter and loads the airport table three
+times, once for each CityToAirportService created per process today
+(FlightAgent, the FlightAgent inside PlannerAgent and tools/flight_tool.py).
+The CSV scenario parses the file every time; the snapshot scenario maps the
+compiled snapshot once and shares it.
+
+Run from the repository root:
+    python -m benchmarks.airport_snapshot_benchmark
+"""
+import json
+import subprocess
+import sys
+
+SCENARIO = """
+import json, resource, time
+from services.airport_snapshot import AirportSnapshot, read_airports_csv
+
+def rss_kb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+baseline = rss_kb()
+start = time.perf_counter()
+if {mode!r} == "csv":
+    tables = [read_airports_csv({csv_path!r}) for _ in range(3)]
+else:
+    tables = [AirportSnapshot.load({csv_path!r}).records() for _ in range(3)]
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "rss_kb": rss_kb() - baseline, "rows": len(tables[0])}}))
+"""
+
+
+def run(mode: str, csv_path: str) -> dict:
+    output = subprocess.check_output([sys.executable, "-c", SCENARIO.format(mode=mode, csv_path=csv_path)])
+    return json.loads(output)
+
+
+def main(csv_path: str = "data/airports.dat") -> None:
+    # Make sure the snapshot exists so the timed run measures a warm cache
+    run("snapshot", csv_path)
+
+    csv_result = run("csv", csv_path)
+    snapshot_result = run("snapshot", csv_path)
+
+    print(f"Rows loaded:               {csv_result['rows']}")
+    print(f"CSV parse x3:              {csv_result['seconds'] * 1000:.1f} ms, +{csv_result['rss_kb'] / 1024:.1f} MiB RSS")
+    print(f"Shared snapshot x3:        {snapshot_result['seconds'] * 1000:.1f} ms, +{snapshot_result['rss_kb'] / 1024:.1f} MiB RSS")
+    print(f"Startup time saved:        {(csv_result['seconds'] - snapshot_result['seconds']) * 1000:.1f} ms")
+    print(f"RSS saved:                 {(csv_result['rss_kb'] - snapshot_result['rss_kb']) / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
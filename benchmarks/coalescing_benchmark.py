@@ -0,0 +1,112 @@
+"""
+Request coalescing for identical concurrent provider calls.
+
+Fires the same SerpAPI search from many threads at once against a local
+stub, then the same request from many asyncio tasks, and reports how many
+requests reached the stub and how many calls the coalescer saved. Also
+checks an error from the shared call reaches every waiting caller, and
+that cancelling one caller (a waiter or the leader, as a hedged search
+does with the losing provider) leaves the others their result.
+
+Run from the repository root:
+    python -m benchmarks.coalescing_benchmark
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from adapters.cache import ResponseCache
+from adapters.coalescing import RequestCoalescer
+from adapters.flight.serpaapi_adapter import SerpAPIAdapter
+from benchmarks.fixtures import StubServer, make_serpapi_response
+from benchmarks.flight_concurrency_benchmark import trip
+
+CALLERS = 20
+LATENCY = 0.3
+
+
+def threaded(stub: StubServer) -> None:
+    adapter = SerpAPIAdapter("stub-key", f"{stub.url}/search.json", cache=ResponseCache("coalescing-benchmark", ttl=60))
+    before = adapter.coalescer.stats()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        # refresh=True so only coalescing, not the cache, can save calls
+        results = list(executor.map(lambda _: adapter.search_flights(trip(), refresh=True), range(CALLERS)))
+    elapsed = time.perf_counter() - start
+    after = adapter.coalescer.stats()
+
+    prices = {result["flight"].details.price.amount for result in results}
+    calls = sum(result["provider_calls"] for result in results)
+    print(f"Threads: {CALLERS} searches -> {stub.requests} provider call(s) in {elapsed * 1000:.0f} ms, "
+          f"saved {after['saved'] - before['saved']}, provider_calls reported {calls}")
+    assert stub.requests == 1 and calls == 1 and len(prices) == 1
+
+
+async def in_tasks(url: str) -> list:
+    coalescer = RequestCoalescer("async-benchmark")
+    fetch = lambda: asyncio.to_thread(lambda: requests.get(url).json())
+    results = await asyncio.gather(*(coalescer.do_async("same-request", fetch) for _ in range(CALLERS)), return_exceptions=True)
+    return results, coalescer.stats()
+
+
+async def cancelled(url: str, cancel: int) -> list:
+    """Leader plus two waiters; cancel the caller at index cancel halfway through the call."""
+    coalescer = RequestCoalescer("cancel-benchmark")
+    fetch = lambda: asyncio.to_thread(lambda: requests.get(url).json())
+    tasks = []
+    for _ in range(3):
+        tasks.append(asyncio.ensure_future(coalescer.do_async("same-request", fetch)))
+        await asyncio.sleep(0)
+    await asyncio.sleep(LATENCY / 2)
+    tasks[cancel].cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    return results, coalescer.stats()
+
+
+def main() -> None:
+    with StubServer(lambda path, params: (200, make_serpapi_response(50)), latency=LATENCY) as stub:
+        threaded(stub)
+
+    with StubServer(lambda path, params: (200, make_serpapi_response(50)), latency=LATENCY) as stub:
+        start = time.perf_counter()
+        results, stats = asyncio.run(in_tasks(f"{stub.url}/search.json"))
+        elapsed = time.perf_counter() - start
+        shared = sum(1 for _, was_shared in results if was_shared)
+        print(f"Tasks:   {CALLERS} requests -> {stub.requests} provider call(s) in {elapsed * 1000:.0f} ms, "
+              f"saved {stats['saved']}, {shared} shared results")
+        assert stub.requests == 1 and stats["saved"] == CALLERS - 1
+
+    for cancel, role in ((1, "waiter"), (0, "leader")):
+        with StubServer(lambda path, params: (200, {"price": 120}), latency=LATENCY) as stub:
+            results, stats = asyncio.run(cancelled(stub.url, cancel))
+            others = [result for index, result in enumerate(results) if index != cancel]
+            print(f"Cancel:  {role} cancelled -> {results[cancel].__class__.__name__}; others got "
+                  f"{', '.join(type(result).__name__ for result in others)} from {stub.requests} provider call(s)")
+            assert isinstance(results[cancel], asyncio.CancelledError)
+            assert all(isinstance(result, tuple) and result[0] == {"price": 120} for result in others)
+            assert stub.requests == 1 and stats["in_flight"] == 0
+
+    with StubServer(lambda path, params: (500, {}), latency=LATENCY) as stub:
+        coalescer = RequestCoalescer("error-benchmark")
+
+        def failing():
+            response = requests.get(stub.url)
+            response.raise_for_status()
+
+        def call(_):
+            try:
+                coalescer.do("same-request", failing)
+            except requests.HTTPError as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+            errors = list(executor.map(call, range(CALLERS)))
+        print(f"Errors:  {sum(error is not None for error in errors)}/{CALLERS} callers got the error "
+              f"from {stub.requests} provider call(s)")
+        assert all(errors) and stub.requests == 1
+
+
+if __name__ == "__main__":
+    main()
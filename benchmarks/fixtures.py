@@ -0,0 +1,303 @@
+"""
+Synthetic provider payloads and a local stub server for the benchmarks.
+
+The payloads follow the shape of real SerpAPI Google Flights responses so
+the adapters and models can be exercised without network access or quota.
+"""
+import json
+import os
+import random
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Tuple
+from urllib.parse import parse_qs, urlparse
+
+AIRLINES = ["British Airways", "easyJet", "Ryanair", "Air France", "KLM", "Lufthansa", "Vueling", "Iberia"]
+
+
+def make_flight_option(rng: random.Random, departure_id: str = "LHR", arrival_id: str = "CDG") -> Dict:
+    """Build one SerpAPI flight option with one or two segments."""
+    segments = []
+    legs = [(departure_id, arrival_id)] if rng.random() < 0.6 else [(departure_id, "AMS"), ("AMS", arrival_id)]
+    for origin, destination in legs:
+        airline = rng.choice(AIRLINES)
+        segments.append({
+            "departure_airport": {"name": f"{origin} Airport", "id": origin, "time": "2026-07-10 08:15"},
+            "arrival_airport": {"name": f"{destination} Airport", "id": destination, "time": "2026-07-10 10:35"},
+            "duration": rng.randint(55, 240),
+            "airplane": rng.choice(["Airbus A320", "Boeing 737", "Embraer 190"]),
+            "airline": airline,
+            "airline_logo": "https://www.gstatic.com/flights/airline_logos/70px/BA.png",
+            "travel_class": "Economy",
+            "flight_number": f"{airline[:2].upper()} {rng.randint(100, 9999)}",
+            "legroom": "29 in",
+            "extensions": ["Average legroom (29 in)", "Wi-Fi for a fee", "Carbon emissions estimate: 61 kg"],
+        })
+    total = sum(segment["duration"] for segment in segments) + (rng.randint(40, 300) if len(segments) > 1 else 0)
+    typical = rng.randint(60000, 120000)
+    this_flight = int(typical * rng.uniform(0.7, 1.3))
+    return {
+        "flights": segments,
+        "layovers": [{"duration": 60, "name": "Amsterdam Airport Schiphol", "id": "AMS"}] if len(segments) > 1 else [],
+        "total_duration": total,
+        "carbon_emissions": {
+            "this_flight": this_flight,
+            "typical_for_this_route": typical,
+            "difference_percent": round((this_flight - typical) / typical * 100),
+        },
+        "price": rng.randint(40, 650),
+        "type": "One way",
+        "airline_logo": "https://www.gstatic.com/flights/airline_logos/70px/multi.png",
+        "extensions": [],
+        "booking_token": "WyJDalJJ" + "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(120)),
+    }
+
+
+def make_serpapi_response(options: int = 10, seed: int = 0, departure_id: str = "LHR", arrival_id: str = "CDG",
+                          round_trip: bool = False) -> Dict:
+    """
+    Build a SerpAPI Google Flights response with the given number of options.
+
+    With ``round_trip`` the options are typed "Round trip" and carry the
+    ``departure_token`` used to fetch their return flights.
+    """
+    rng = random.Random(seed)
+    flights = [make_flight_option(rng, departure_id, arrival_id) for _ in range(options)]
+    if round_trip:
+        for number, flight in enumerate(flights):
+            flight["type"] = "Round trip"
+            flight["departure_token"] = f"token-{departure_id}-{arrival_id}-{seed}-{number}"
+    best = min(3, len(flights))
+    return {
+        "search_metadata": {
+            "id": "stub",
+            "status": "Success",
+            "google_flights_url": "https://www.google.com/travel/flights?hl=en&curr=GBP",
+        },
+        "search_parameters": {"engine": "google_flights", "departure_id": departure_id, "arrival_id": arrival_id},
+        "best_flights": flights[:best],
+        "other_flights": flights[best:],
+        "price_insights": {"lowest_price": min((flight["price"] for flight in flights), default=0)},
+    }
+
+
+def make_booking_hotel_details(hotel_id, rooms: int = 2) -> Dict:
+    """Build a Booking.com getHotelDetails response for one hotel."""
+    hotel_id = int(hotel_id)
+    rng = random.Random(hotel_id)
+    return {
+        "status": True,
+        "message": "Success",
+        "data": {
+            "hotel_id": hotel_id,
+            "hotel_name": f"Hotel {hotel_id}",
+            "url": f"https://www.booking.com/hotel/fr/{hotel_id}.html",
+            "address": f"{rng.randint(1, 200)} Rue de Rivoli",
+            "city": "Paris",
+            "zip": f"750{rng.randint(10, 20)}",
+            "latitude": 48.85 + rng.uniform(-0.05, 0.05),
+            "longitude": 2.35 + rng.uniform(-0.05, 0.05),
+            "review_nr": rng.randint(10, 5000),
+            "facilities_block": {"facilities": [{"name": name} for name in ("Free WiFi", "Non-smoking rooms", "Lift", "24-hour front desk")]},
+            "rooms": {
+                str(hotel_id * 100 + number): {
+                    "description": "Comfortable room",
+                    "photos": [{"url_original": f"https://cf.bstatic.com/xdata/images/hotel/max1280/{hotel_id}{number}{photo}.jpg"} for photo in range(3)],
+                }
+                for number in range(rooms)
+            },
+            "block": [{
+                "room_name": rng.choice(["Double Room", "Superior Twin Room", "Deluxe King Room"]),
+                "max_occupancy": rng.choice([2, 3, 4]),
+                "paymentterms": {"cancellation": {"type": rng.choice(["free_cancellation", "non_refundable"])}},
+            }],
+        },
+    }
+
+
+def make_skyscrapper_hotels(booking_search: Dict, overlap: int = 8, extra: int = 12, seed: int = 0) -> Dict:
+    """
+    Build a Sky Scrapper searchHotels response for the same city as a Booking.com page.
+
+    The first ``overlap`` Booking.com hotels are listed again under Sky
+    Scrapper's naming (name case and "Hotel" prefix vary, coordinates drift
+    by a few metres) with slightly different prices; ``extra`` hotels are
+    only on Sky Scrapper.
+    """
+    rng = random.Random(seed)
+    hotels = []
+    for number, booking in enumerate(booking_search["data"]["hotels"][:overlap]):
+        prop = booking["property"]
+        name = prop["name"].upper() if number % 2 else prop["name"].replace("Hotel ", "")
+        hotels.append({
+            "hotelId": str(9000 + number),
+            "name": name,
+            "stars": prop.get("propertyClass"),
+            "distance": "1.2 km from city centre",
+            "rawPrice": round(prop["priceBreakdown"]["grossPrice"]["value"] * rng.uniform(0.9, 1.1), 2),
+            "price": "",
+            "rating": {"value": str(round(prop.get("reviewScore", 8) / 2, 1)), "count": prop.get("reviewCount")},
+            "coordinates": [prop["longitude"] + rng.uniform(-0.0005, 0.0005), prop["latitude"] + rng.uniform(-0.0005, 0.0005)],
+            "heroImage": f"https://content.skyscnr.com/available/{9000 + number}.jpg",
+        })
+    for number in range(extra):
+        hotels.append({
+            "hotelId": str(9500 + number),
+            "name": f"Maison {number}",
+            "stars": rng.randint(2, 5),
+            "distance": f"{rng.uniform(0.2, 6):.1f} km from city centre",
+            "rawPrice": rng.randint(300, 2500),
+            "rating": {"value": f"{rng.uniform(3, 5):.1f}", "count": rng.randint(10, 3000)},
+            "coordinates": [2.35 + rng.uniform(-0.05, 0.05), 48.85 + rng.uniform(-0.05, 0.05)],
+        })
+    rng.shuffle(hotels)
+    return {"status": True, "message": "Successful", "data": {"hotels": hotels}}
+
+
+ATTRACTION_TYPES = ["Museums", "Historic Sites", "Walking Tours", "Food Tours", "Parks", "Boat Tours", "Theatres", "Churches"]
+
+
+def make_tripadvisor_attractions(count: int = 30, seed: int = 0) -> Dict:
+    """Build a TripAdvisor attractions/search response with ``count`` attraction cards."""
+    rng = random.Random(seed)
+    attractions = []
+    for number in range(count):
+        content_id = str(100000 + number)
+        attractions.append({
+            "__typename": "AppPresentation_SingleCard",
+            "cardTitle": {"string": f"{number + 1}. Attraction {content_id}"},
+            "primaryInfo": {"text": rng.choice(ATTRACTION_TYPES)},
+            "bubbleRating": {"rating": round(rng.uniform(3.5, 5.0), 1), "numberReviews": {"string": f"({rng.randint(10, 90000):,})"}},
+            "merchandisingText": {"htmlString": f"from £{rng.randint(5, 120)}"} if rng.random() < 0.7 else {},
+            "cardPhoto": {"sizes": {"urlTemplate": f"https://dynamic-media-cdn.tripadvisor.com/media/photo-o/{content_id}.jpg?w={{width}}&h={{height}}"}},
+            "cardLink": {"route": {"url": f"/Attraction_Review-g187147-d{content_id}", "params": {"contentId": content_id}}},
+        })
+    return {"status": True, "message": "Success", "data": {"attractions": attractions}}
+
+
+def make_tripadvisor_attraction_details(content_id) -> Dict:
+    """Build a TripAdvisor attractions/details response for one attraction."""
+    rng = random.Random(int(content_id))
+    hours = rng.choice([1, 2, 3, 4])
+    return {
+        "status": True,
+        "message": "Success",
+        "data": {
+            "contentId": str(content_id),
+            "geoPoint": {"latitude": 48.85 + rng.uniform(-0.05, 0.05), "longitude": 2.35 + rng.uniform(-0.05, 0.05)},
+            "duration": f"{hours}-{hours + 1} hours",
+            "startTimes": [f"2099-07-1{day}T{rng.choice(['09', '10', '14'])}:00:00" for day in range(1, 4)],
+            "availableDates": [f"2099-07-1{day}T00:00:00" for day in range(1, 6)],
+            "ageRange": {"min": rng.choice([0, 6, 12, 18]), "max": 99},
+            "inclusions": [{"text": "Skip-the-line entry"}, {"text": "Professional guide"}],
+            "exclusions": [{"text": "Hotel pickup"}],
+            "cancellationPolicy": {"text": "Free cancellation up to 24 hours in advance"},
+            "languages": rng.sample(["English", "French", "Spanish", "German", "Italian"], 2),
+            "difficulty": rng.choice(["Easy", "Moderate"]),
+        },
+    }
+
+
+_certificate = None
+
+
+def self_signed_certificate() -> Tuple[str, str]:
+    """(certificate, key) paths for 127.0.0.1, made once per process with the openssl CLI."""
+    global _certificate
+    if _certificate is None:
+        directory = tempfile.mkdtemp(prefix="stub-tls-")
+        cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-keyout", key, "-out", cert,
+             "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost"],
+            check=True, capture_output=True,
+        )
+        _certificate = cert, key
+    return _certificate
+
+
+class StubServer:
+    """
+    A local HTTP server that answers every GET with a JSON payload after a delay.
+
+    ``responder`` receives the request path and parsed query parameters and
+    returns ``(status, payload)``. Counts requests so benchmarks can report
+    provider calls, and connections so they can report handshakes. With
+    ``tls=True`` it serves HTTPS with a self-signed certificate; clients
+    verify it against ``certificate``.
+    """
+
+    def __init__(self, responder: Callable[[str, Dict], Tuple[int, Dict]], latency: float = 0.0, tls: bool = False):
+        self.responder = responder
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self.certificate = None
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this, reused
+            # keep-alive connections stall on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                with stub._lock:
+                    stub.connections += 1
+                super().setup()
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                parsed = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+                time.sleep(stub.latency)
+                status, payload = stub.responder(parsed.path, params)
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            def handle_error(self, request, client_address):
+                # Clients that stop reading early (streaming decodes) just hang up
+                if not isinstance(sys.exc_info()[1], ConnectionError):
+                    super().handle_error(request, client_address)
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        if tls:
+            self.certificate, key = self_signed_certificate()
+            context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            context.load_cert_chain(self.certificate, key)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"{'https' if self.certificate else 'http'}://{host}:{port}"
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,76 @@
+"""
+Timing check for concurrent outbound/inbound searches in FlightService.run.
+
+Runs FlightService against a local SerpAPI stub with injected latency and
+compares the wall time with the sequential baseline (one adapter call after
+the other). Also checks that a failing leg returns without waiting for the
+slow one.
+
+Run from the repository root:
+    python -m benchmarks.flight_concurrency_benchmark
+"""
+import time
+
+from benchmarks.fixtures import StubServer, make_serpapi_response
+from models import UserInput
+from services.flight_service import FlightService
+
+LATENCY = 0.5
+
+
+def trip() -> UserInput:
+    return UserInput(
+        departure_location="LHR",
+        arrival_location="CDG",
+        adult_guests=2,
+        departure_date_leaving="2099-07-10",
+        length_of_stay=7,
+        holiday_type="city break",
+        arrival_date_coming_back="2099-07-17",
+    )
+
+
+def main() -> None:
+    def responder(path, params):
+        return 200, make_serpapi_response(options=10, seed=len(params.get("outbound_date", "")),
+                                          departure_id=params["departure_id"], arrival_id=params["arrival_id"])
+
+    with StubServer(responder, latency=LATENCY) as stub:
+        service = FlightService("stub-key", f"{stub.url}/search.json")
+        user_input = trip()
+
+        # refresh=True so every run reaches the stub instead of the shared search cache
+        start = time.perf_counter()
+        service.adapter.search_flights(user_input, direction="outbound", refresh=True)
+        service.adapter.search_flights(user_input, direction="inbound", refresh=True)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = service.run(user_input, refresh=True)
+        concurrent = time.perf_counter() - start
+
+    print(f"Injected latency per call: {LATENCY * 1000:.0f} ms")
+    print(f"Sequential legs:           {sequential * 1000:.0f} ms")
+    print(f"Concurrent legs:           {concurrent * 1000:.0f} ms ({result.get('status')}, total {result.get('total_price')})")
+    assert result.get("status") == "success", result
+    assert concurrent < sequential * 0.75, "legs did not overlap"
+
+    # A failing leg should not wait for the slow leg to finish
+    def failing(path, params):
+        if params["departure_id"] == "CDG":
+            return 200, {"error": "Google Flights hasn't returned any results for this query."}
+        time.sleep(LATENCY * 2)
+        return 200, make_serpapi_response(options=1)
+
+    with StubServer(failing, latency=0.0) as stub:
+        service = FlightService("stub-key", f"{stub.url}/search.json")
+        start = time.perf_counter()
+        result = service.run(trip(), refresh=True)
+        failed = time.perf_counter() - start
+
+    print(f"Failing inbound leg:       {failed * 1000:.0f} ms -> {result}")
+    assert "error" in result and failed < LATENCY * 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark for ranking every SerpAPI flight option.
+
+Compares building a Flight model for every option and ranking the models
+against ranking the columnar FlightOptionBatch and building models only for
+the top-k, on synthetic responses with hundreds of options, and checks both
+pick the same flights.
+
+Run from the repository root:
+    python -m benchmarks.flight_ranking_benchmark
+"""
+import time
+
+from adapters.flight.ranking import FlightOptionBatch
+from benchmarks.fixtures import make_serpapi_response
+from models import Flight
+
+
+def rank_models(data, k, weights):
+    """Parse every option into a Flight, then score the models."""
+    url = data["search_metadata"]["google_flights_url"]
+    flights = [Flight.from_api(option, url) for option in data["best_flights"] + data["other_flights"]]
+    columns = {
+        "price": [flight.details.price.amount for flight in flights],
+        "duration": [flight.details.total_duration for flight in flights],
+        "segments": [len(flight.details.flights) for flight in flights],
+        "carbon": [flight.details.carbon_emissions.this_flight for flight in flights],
+    }
+    scores = [0.0] * len(flights)
+    for criterion, weight in weights.items():
+        low, high = min(columns[criterion]), max(columns[criterion])
+        span = (high - low) or 1.0
+        scores = [score + (value - low) * weight / span for score, value in zip(scores, columns[criterion])]
+    order = sorted(range(len(flights)), key=lambda i: (scores[i], i))[:k]
+    return [flights[i] for i in order]
+
+
+def rank_batch(data, k, weights):
+    """Rank the columnar batch and build models for the winners only."""
+    url = data["search_metadata"]["google_flights_url"]
+    batch = FlightOptionBatch.from_response(data)
+    return [Flight.from_api(batch.options[i], url) for i in batch.rank(k=k, weights=weights, pareto=False)]
+
+
+def timed(function, responses, k, weights):
+    start = time.perf_counter()
+    results = [function(data, k, weights) for data in responses]
+    return results, (time.perf_counter() - start) / len(responses)
+
+
+def main(sizes=(100, 300, 800), repeats: int = 20, k: int = 3) -> None:
+    weights = FlightOptionBatch.DEFAULT_WEIGHTS
+    print(f"{'options':>8} {'all models':>12} {'batch + top-k':>14} {'speed-up':>9} {'pareto':>7} {'mismatches':>11}")
+    for size in sizes:
+        responses = [make_serpapi_response(size, seed=seed) for seed in range(repeats)]
+        old_results, old_elapsed = timed(rank_models, responses, k, weights)
+        new_results, new_elapsed = timed(rank_batch, responses, k, weights)
+        mismatches = sum(
+            1 for old, new in zip(old_results, new_results)
+            if [flight.details.booking_token for flight in old] != [flight.details.booking_token for flight in new]
+        )
+        front = sum(len(FlightOptionBatch.from_response(data).pareto_front()) for data in responses) / repeats
+        print(
+            f"{size:>8} {old_elapsed * 1000:>9.2f} ms {new_elapsed * 1000:>11.2f} ms "
+            f"{old_elapsed / new_elapsed:>8.1f}x {front:>7.1f} {mismatches:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
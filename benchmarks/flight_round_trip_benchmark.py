@@ -0,0 +1,63 @@
+"""
+Provider calls and latency per trip for each FlightService search mode.
+
+Runs FlightService against a local SerpAPI stub that answers one-way,
+round-trip and departure_token queries, and counts the requests each mode
+makes for a single trip. Then runs a flexible-date search twice; legs the
+earlier searches already made, and the whole second run, come from the
+search cache and must not be counted as provider calls.
+
+Run from the repository root:
+    python -m benchmarks.flight_round_trip_benchmark
+"""
+import time
+
+from benchmarks.fixtures import StubServer, make_serpapi_response
+from benchmarks.flight_concurrency_benchmark import trip
+from services.flight_service import FlightService
+
+LATENCY = 0.3
+
+
+def responder(path, params):
+    if params.get("departure_token"):
+        # Return flights for the chosen outbound option
+        return 200, make_serpapi_response(options=10, seed=2, departure_id=params["arrival_id"],
+                                          arrival_id=params["departure_id"], round_trip=True)
+    return 200, make_serpapi_response(options=10, seed=1, departure_id=params["departure_id"],
+                                      arrival_id=params["arrival_id"], round_trip=params.get("type") == "1")
+
+
+def main() -> None:
+    modes = [
+        ("one-way legs", {"mode": FlightService.ONE_WAY}),
+        ("round trip + return flights", {"mode": FlightService.ROUND_TRIP, "include_inbound": True}),
+        ("round trip, outbound only", {"mode": FlightService.ROUND_TRIP, "include_inbound": False}),
+    ]
+    print(f"Injected latency per call: {LATENCY * 1000:.0f} ms")
+    with StubServer(responder, latency=LATENCY) as stub:
+        service = FlightService("stub-key", f"{stub.url}/search.json")
+        for label, options in modes:
+            before = stub.requests
+            start = time.perf_counter()
+            # refresh=True so every mode reaches the stub instead of the shared search cache
+            result = service.run(trip(), refresh=True, **options)
+            elapsed = time.perf_counter() - start
+            assert result.get("status") == "success", result
+            assert result["provider_calls"] == stub.requests - before
+            print(f"{label:<28} {result['provider_calls']} calls  {elapsed * 1000:5.0f} ms  total {result['total_price']}")
+
+        for label in ("flexible +/-1 day", "flexible +/-1 day, again"):
+            before = stub.requests
+            start = time.perf_counter()
+            result = service.run_flexible(trip(), window_days=1)
+            elapsed = time.perf_counter() - start
+            assert result.get("status") == "success", result
+            assert result["provider_calls"] == stub.requests - before
+            print(f"{label:<28} {result['provider_calls']} calls  {elapsed * 1000:5.0f} ms  "
+                  f"total {result['cheapest']['total_price']}")
+        assert result["provider_calls"] == 0
+
+
+if __name__ == "__main__":
+    main()
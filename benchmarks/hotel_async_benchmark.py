@@ -0,0 +1,84 @@
+"""
+Concurrent hotel searches on one event loop.
+
+Serves the recorded Booking.com pages from logs/ from a local stub with
+injected latency and runs two HotelService searches for different cities
+concurrently with asyncio.gather. With the old blocking adapters each search
+held the event loop for its whole duration, so two searches took twice as
+long and nothing else on the loop could run meanwhile; on the async
+adapters the searches overlap and a ticker task keeps running throughout.
+
+Run from the repository root:
+    python -m benchmarks.hotel_async_benchmark
+"""
+import asyncio
+import os
+import time
+
+from benchmarks.fixtures import StubServer
+from benchmarks.flight_concurrency_benchmark import trip
+from benchmarks.hotel_details_benchmark import load_log
+
+LATENCY = 0.3
+TICK = 0.01
+
+
+def main() -> None:
+    # Keep destination IDs in memory so the benchmark doesn't touch data/
+    os.environ["DESTINATION_CACHE_PATH"] = ""
+    os.environ.setdefault("RAPIDAPIKEY", "stub-key")
+    from adapters.transport import run_sync
+    from services.hotel_service import HotelService
+
+    destinations = load_log("logs/booking_destination_search_*.json")
+    hotels = load_log("logs/booking_hotel_search_*.json")
+
+    def responder(path, params):
+        if path.endswith("searchDestination"):
+            return 200, destinations
+        return 200, hotels
+
+    with StubServer(responder, latency=LATENCY) as stub:
+        service = HotelService()
+        adapter = service.booking_adapter
+        adapter.endpoint = stub.url
+        trips = [trip().model_copy(update={"arrival_location": city}) for city in ("Paris", "Lyon")]
+        for user_input in trips:
+            adapter.resolve_destination(user_input.arrival_location)
+
+        start = time.perf_counter()
+        for user_input in trips:
+            adapter.search_hotels(user_input, top_k=3)
+        serial_elapsed = time.perf_counter() - start
+
+        async def concurrent():
+            ticks = 0
+            searching = True
+
+            async def ticker():
+                nonlocal ticks
+                while searching:
+                    await asyncio.sleep(TICK)
+                    ticks += 1
+
+            ticking = asyncio.ensure_future(ticker())
+            start = time.perf_counter()
+            results = await asyncio.gather(*(adapter.search_hotels_async(user_input, top_k=3) for user_input in trips))
+            elapsed = time.perf_counter() - start
+            searching = False
+            await ticking
+            return results, elapsed, ticks
+
+        results, elapsed, ticks = run_sync(concurrent())
+
+    print(f"Injected latency per request: {LATENCY * 1000:.0f} ms")
+    print(f"Two searches, one after the other: {serial_elapsed * 1000:5.0f} ms")
+    print(f"Two searches with asyncio.gather:  {elapsed * 1000:5.0f} ms  ({ticks} ticks of the loop meanwhile)")
+    assert all(len(found) == 3 for found in results)
+    # The searches overlap: together they take about one request, not two
+    assert elapsed < 1.5 * LATENCY < serial_elapsed
+    assert ticks >= 0.5 * elapsed / TICK
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Hotel search followed by details for the top N hotels.
+
+Serves the recorded Booking.com searchDestination and searchHotels pages
+from logs/ and synthetic getHotelDetails responses from a local stub with
+injected latency. Compares the old flow, where each hotel's details re-ran
+the destination lookup and the search before fetching details (3 serial
+requests per hotel), with HotelService.search_hotels_with_details (one
+search plus N parallel detail requests).
+
+Run from the repository root:
+    python -m benchmarks.hotel_details_benchmark
+"""
+import asyncio
+import glob
+import json
+import os
+import time
+
+from benchmarks.fixtures import StubServer, make_booking_hotel_details
+from benchmarks.flight_concurrency_benchmark import trip
+
+LATENCY = 0.2
+
+
+def load_log(pattern: str) -> dict:
+    with open(sorted(glob.glob(pattern))[-1], encoding="utf-8") as file:
+        return json.load(file)
+
+
+def main(top_n: int = 5) -> None:
+    # Keep destination IDs in memory so the benchmark doesn't touch data/
+    os.environ["DESTINATION_CACHE_PATH"] = ""
+    os.environ.setdefault("RAPIDAPIKEY", "stub-key")
+    from adapters.transport import run_sync
+    from services.hotel_service import HotelService
+
+    destinations = load_log("logs/booking_destination_search_*.json")
+    hotels = load_log("logs/booking_hotel_search_*.json")
+
+    def responder(path, params):
+        if path.endswith("searchDestination"):
+            return 200, destinations
+        if path.endswith("searchHotels"):
+            return 200, hotels
+        return 200, make_booking_hotel_details(params["hotel_id"])
+
+    with StubServer(responder, latency=LATENCY) as stub:
+        service = HotelService()
+        adapter = service.booking_adapter
+        adapter.endpoint = stub.url
+        user_input = trip().model_copy(update={"arrival_location": "Paris"})
+
+        # Old flow: every hotel's details re-ran the destination lookup and the search
+        start = time.perf_counter()
+        found = adapter.search_hotels(user_input, top_k=top_n)
+        for hotel in found:
+            adapter._search_destination(user_input.arrival_location)
+            adapter.search_hotels(user_input, top_k=top_n)
+            run_sync(adapter._fetch_hotel_detail(str(hotel["hotel_id"]), user_input))
+        old_elapsed = time.perf_counter() - start
+        old_requests = stub.requests
+
+        start = time.perf_counter()
+        merged = asyncio.run(service.search_hotels_with_details(user_input, top_n=top_n))
+        new_elapsed = time.perf_counter() - start
+        new_requests = stub.requests - old_requests
+
+    print(f"Injected latency per request: {LATENCY * 1000:.0f} ms, top {top_n} hotels")
+    print(f"Re-searching per hotel:       {old_requests:>2} requests  {old_elapsed * 1000:6.0f} ms")
+    print(f"Search + parallel details:    {new_requests:>2} requests  {new_elapsed * 1000:6.0f} ms")
+    for hotel in merged:
+        print(f"  {hotel.name:<40} {hotel.total_price.amount:8.2f} {hotel.total_price.currency}  "
+              f"{hotel.address}  {len(hotel.images or [])} photos  {hotel.room.room_type if hotel.room else ''}")
+    assert new_requests == 1 + top_n and len(merged) == top_n
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Hedged hotel search across Booking.com and Sky Scrapper.
+
+Serves the recorded Booking.com pages from logs/ and a synthetic Sky
+Scrapper page listing some of the same properties from a local stub, with a
+separate injected latency per provider. Compares waiting for both providers
+with HotelService.search_hotels, which answers once the first good-enough
+result has waited HEDGE seconds for the other, and shows the duplicates
+removed when both answers are merged.
+
+Run from the repository root:
+    python -m benchmarks.hotel_hedging_benchmark
+"""
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.fixtures import StubServer, make_skyscrapper_hotels
+from benchmarks.flight_concurrency_benchmark import trip
+from benchmarks.hotel_details_benchmark import load_log
+
+HEDGE = 0.3
+TOP_N = 5
+
+
+def main() -> None:
+    # Keep destination IDs in memory so the benchmark doesn't touch data/
+    os.environ["DESTINATION_CACHE_PATH"] = ""
+    os.environ.setdefault("RAPIDAPIKEY", "stub-key")
+    from services.hotel_service import HotelService, dedupe_hotels
+
+    destinations = load_log("logs/booking_destination_search_*.json")
+    booking_page = load_log("logs/booking_hotel_search_*.json")
+    sky_page = make_skyscrapper_hotels(booking_page)
+    latency = {"booking": 0.0, "skyscrapper": 0.0}
+    failing = set()
+
+    def responder(path, params):
+        if path.endswith("searchDestinationOrHotel"):
+            return 200, {"status": True, "data": [{"entityId": "27539733", "entityName": "Paris"}]}
+        if path.endswith("searchDestination"):
+            return 200, destinations
+        provider = "booking" if "dest_id" in params else "skyscrapper"
+        time.sleep(latency[provider])
+        if provider in failing:
+            return 500, {"status": False, "message": "Internal error"}
+        return 200, booking_page if provider == "booking" else sky_page
+
+    with StubServer(responder) as stub:
+        service = HotelService()
+        service.booking_adapter.endpoint = stub.url
+        service.skyscrapper_adapter.base_url = stub.url
+        user_input = trip().model_copy(update={"arrival_location": "Paris"})
+        service.booking_adapter.resolve_destination(user_input.arrival_location)
+        service.skyscrapper_adapter.resolve_destination(user_input.arrival_location)
+
+        def timed(**kwargs):
+            start = time.perf_counter()
+            hotels = asyncio.run(service.search_hotels(user_input, top_n=TOP_N, **kwargs))
+            return hotels, time.perf_counter() - start
+
+        print(f"Top {TOP_N} hotels, hedge delay {HEDGE * 1000:.0f} ms")
+        for booking_latency, sky_latency, broken in ((0.2, 1.5, ()), (1.5, 0.2, ()), (0.2, 0.35, ()), (0.2, 0.3, ("booking",))):
+            latency.update(booking=booking_latency, skyscrapper=sky_latency)
+            failing.clear()
+            failing.update(broken)
+            both, both_elapsed = timed(hedge_delay=float("inf"))
+            hedged, hedged_elapsed = timed(hedge_delay=HEDGE)
+            sources = sorted({hotel.provider for hotel in hedged})
+            label = f"booking {booking_latency * 1000:4.0f} ms{' (failing)' if broken else ''}, sky scrapper {sky_latency * 1000:4.0f} ms"
+            print(f"{label:<46} wait for both {both_elapsed * 1000:5.0f} ms   hedged {hedged_elapsed * 1000:5.0f} ms  "
+                  f"from {', '.join(sources)}")
+            assert hedged_elapsed <= min(both_elapsed, max(booking_latency, sky_latency)) + HEDGE + 0.15
+
+        latency.update(booking=0.0, skyscrapper=0.0)
+        failing.clear()
+        merged = asyncio.run(service.search_hotels(user_input, top_n=100, hedge_delay=5))
+        listed = len(booking_page["data"]["hotels"]) + len(sky_page["data"]["hotels"])
+        print(f"Merged {listed} listings into {len(merged)} hotels")
+        assert len(merged) == len(dedupe_hotels(merged)) == listed - 8
+
+    print(json.dumps(service.stats.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Top-k hotel search across several Booking.com result pages.
+
+Serves searchHotels pages built from the recorded page in logs/ from a local
+stub with injected latency: 20 hotels per page, ordered by the requested
+sort_by, with prices rising page by page. Compares scanning every page one
+after another with BookingAdapter.search_hotels, which fetches pages
+concurrently and stops once a page can no longer improve the top k.
+
+Run from the repository root:
+    python -m benchmarks.hotel_pagination_benchmark
+"""
+import copy
+import os
+import time
+
+from benchmarks.fixtures import StubServer
+from benchmarks.flight_concurrency_benchmark import trip
+from benchmarks.hotel_details_benchmark import load_log
+
+LATENCY = 0.15
+PAGES = 10
+
+
+def make_page(template: dict, page: int, sort_by: str = None) -> dict:
+    """A searchHotels page whose prices rise with the page number (within the page only if sorted)."""
+    data = copy.deepcopy(template)
+    hotels = data["data"]["hotels"]
+    if page > PAGES:
+        data["data"]["hotels"] = []
+        return data
+    for i, hotel in enumerate(hotels):
+        slot = i if sort_by == "price" else (i * 7) % len(hotels)
+        hotel["hotel_id"] = page * 1000 + i
+        hotel["property"]["priceBreakdown"]["grossPrice"]["value"] = 100.0 * page + 5 * slot
+    return data
+
+
+def scan_all_pages(adapter, top_k: int):
+    """The naive approach: every page, one request at a time, then sort."""
+    from adapters.transport import run_sync
+    from adapters.hotel.bookingcom_adapter import hotel_price
+
+    url = f"{adapter.endpoint}/api/v1/hotels/searchHotels"
+    hotels = []
+    for page in range(1, PAGES + 1):
+        hotels += run_sync(adapter._fetch_page(url, {}, {"page_number": page}))
+    return sorted(hotels, key=hotel_price)[:top_k]
+
+
+def main() -> None:
+    # Keep destination IDs in memory so the benchmark doesn't touch data/
+    os.environ["DESTINATION_CACHE_PATH"] = ""
+    from adapters.hotel.bookingcom_adapter import BookingAdapter, hotel_price
+
+    destinations = load_log("logs/booking_destination_search_*.json")
+    template = load_log("logs/booking_hotel_search_*.json")
+
+    def responder(path, params):
+        if path.endswith("searchDestination"):
+            return 200, destinations
+        return 200, make_page(template, int(params.get("page_number", 1)), params.get("sort_by"))
+
+    with StubServer(responder, latency=LATENCY) as stub:
+        adapter = BookingAdapter("stub-key")
+        adapter.endpoint = stub.url
+        user_input = trip().model_copy(update={"arrival_location": "Paris"})
+        adapter.resolve_destination(user_input.arrival_location)
+
+        print(f"Injected latency per page: {LATENCY * 1000:.0f} ms, {PAGES} pages of 20 hotels")
+        for top_k in (5, 30):
+            before = stub.requests
+            start = time.perf_counter()
+            expected = scan_all_pages(adapter, top_k)
+            serial_elapsed = time.perf_counter() - start
+            serial_requests = stub.requests - before
+
+            before = stub.requests
+            start = time.perf_counter()
+            found = adapter.search_hotels(user_input, top_k=top_k, key="price", max_pages=PAGES)
+            elapsed = time.perf_counter() - start
+            # Pages abandoned mid-flight still reach the server; count them too
+            time.sleep(2 * LATENCY)
+            requests = stub.requests - before
+
+            print(f"top {top_k:>2}  serial scan of every page: {serial_requests:>2} pages  {serial_elapsed * 1000:6.0f} ms")
+            print(f"        concurrent, early stop:    {requests:>2} pages  {elapsed * 1000:6.0f} ms")
+            assert [hotel_price(hotel) for hotel in found] == [hotel_price(hotel) for hotel in expected]
+
+        # A custom key can't rely on the provider's order, so only the budget bounds the search
+        budget = 2.5 * LATENCY
+        before = stub.requests
+        start = time.perf_counter()
+        found = adapter.search_hotels(user_input, top_k=5, key=lambda hotel: hotel["hotel_id"] % 97,
+                                      max_pages=PAGES, latency_budget=budget)
+        elapsed = time.perf_counter() - start
+        print(f"custom key, {budget * 1000:.0f} ms budget:    {stub.requests - before:>2} pages  {elapsed * 1000:6.0f} ms  "
+              f"({len(found)} hotels)")
+        assert elapsed < budget + LATENCY and len(found) == 5
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark for the day-by-day itinerary planner.
+
+Builds synthetic cities whose activities sit in a few neighbourhood
+clusters around a hotel and plans a week-long trip for 20 to 200
+candidates. Compares ItineraryPlanner against dealing activities out to
+the days round-robin in search order (what a fixed "N per day" split does)
+and against the planner's own insertion step without 2-opt, and checks
+that no day goes over its time budget.
+
+Run from the repository root:
+    python -m benchmarks.itinerary_benchmark
+"""
+import random
+import time
+from datetime import date, timedelta
+
+from models.activity import Activity
+from models.location import Location
+from services.itinerary_planner import ItineraryPlanner
+
+START = date(2025, 6, 2)
+END = date(2025, 6, 8)
+HOTEL = Location(lat=48.8566, lon=2.3522)
+
+
+def make_city(count: int, seed: int, clusters: int = 6, spread_km: float = 6.0):
+    """Activities in neighbourhood clusters within spread_km of the hotel."""
+    rng = random.Random(seed)
+    km_lat = 1 / 111.2
+    km_lon = km_lat / 0.658  # cos(48.86 degrees)
+    centres = [(rng.uniform(-spread_km, spread_km), rng.uniform(-spread_km, spread_km)) for _ in range(clusters)]
+    activities = []
+    for index in range(count):
+        x, y = rng.choice(centres)
+        x, y = x + rng.gauss(0, 0.6), y + rng.gauss(0, 0.6)
+        activities.append(Activity(
+            id=str(index),
+            name=f"Attraction {index}",
+            location=Location(lat=HOTEL.lat + y * km_lat, lon=HOTEL.lon + x * km_lon),
+            duration=timedelta(minutes=rng.choice([45, 60, 90, 120, 180])),
+        ))
+    return activities
+
+
+def round_robin(planner: ItineraryPlanner, activities):
+    """Deal activities to the days in turn, skipping days they don't fit, keeping search order."""
+    budgets = [budget for _, budget in planner.budgets(START, END)]
+    planner._project(activities, HOTEL)
+    minutes = [activity.duration.total_seconds() / 60 for activity in activities]
+    routes = [[] for _ in budgets]
+    day = 0
+    for index, duration in enumerate(minutes):
+        for offset in range(len(budgets)):
+            candidate = (day + offset) % len(budgets)
+            route = routes[candidate] + [index]
+            travel = planner._route_km(route) / planner.speed_kmh * 60
+            if sum(minutes[i] for i in route) + travel <= budgets[candidate]:
+                routes[candidate] = route
+                day = candidate + 1
+                break
+    return routes
+
+
+def summarise(planner: ItineraryPlanner, routes):
+    return sum(len(route) for route in routes), sum(planner._route_km(route) for route in routes)
+
+
+def main(sizes=(20, 50, 100, 200), repeats: int = 5, seed: int = 3) -> None:
+    planner = ItineraryPlanner()
+    budgets = dict(planner.budgets(START, END))
+    print(f"{len(budgets)}-day trip, budgets {sorted(set(budgets.values()))} minutes")
+    print(f"{'candidates':>10} {'solver ms':>10} {'planned':>8} {'km/activity':>12} "
+          f"{'greedy only':>12} {'round robin':>12}")
+    for size in sizes:
+        activities = make_city(size, seed + size)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            plan = planner.plan(activities, START, END, HOTEL)
+        elapsed = (time.perf_counter() - start) / repeats
+
+        for day in plan:
+            assert day.total_minutes <= budgets[day.day] + 0.1, day
+        planned = sum(len(day.activities) for day in plan)
+        travel_km = sum(day.travel_km for day in plan)
+
+        planner._project(activities, HOTEL)
+        minutes = [activity.duration.total_seconds() / 60 for activity in activities]
+        greedy_count, greedy_km = summarise(planner, planner._assign(minutes, list(budgets.values())))
+        naive_count, naive_km = summarise(planner, round_robin(planner, activities))
+
+        print(f"{size:>10} {elapsed * 1000:>10.1f} {planned:>8} {travel_km / planned:>12.2f} "
+              f"{greedy_km / greedy_count:>12.2f} {naive_km / naive_count:>12.2f}")
+        # 2-opt only ever shortens a day, and planning beats dealing activities out blindly
+        assert travel_km <= greedy_km + 0.001 * len(plan)
+        assert travel_km / planned < naive_km / naive_count
+        assert planned >= naive_count
+        assert elapsed < 1.0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Cost of keeping provider payloads on the request path.
+
+Uses the recorded Booking.com search page in logs/ (about 50 KB of JSON) as
+the payload. It compares three things per request:
+    - printing the raw response to a redirected stdout, as the adapters
+      used to do;
+    - PayloadCapture.record at the default sample rate;
+    - PayloadCapture.record capturing everything.
+It then checks that the capture files read back, that rotation keeps them
+under the size cap, and that a burst larger than the queue is dropped
+rather than blocking. Last, it captures a page through BookingAdapter
+against a local stub and checks that the api_key is not written.
+
+Run from the repository root:
+    python -m benchmarks.payload_capture_benchmark
+"""
+import contextlib
+import glob
+import os
+import tempfile
+import time
+
+from adapters.capture import PayloadCapture, read_payloads
+from benchmarks.fixtures import StubServer
+from benchmarks.hotel_details_benchmark import load_log
+
+CALLS = 300
+MAX_BYTES = 1024 * 1024
+
+
+def per_call_us(action, calls: int = CALLS) -> float:
+    start = time.perf_counter()
+    for index in range(calls):
+        action(index)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    payload = load_log("logs/booking_hotel_search_*.json")
+    params = {"dest_id": "-1456928", "search_type": "CITY", "api_key": "secret"}
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "stdout.txt"), "w") as stdout, contextlib.redirect_stdout(stdout):
+            print_us = per_call_us(lambda _: print("Raw Booking.com API response:", payload))
+
+        sampled = PayloadCapture({"booking": PayloadCapture.RATE}, directory=os.path.join(directory, "sampled"))
+        sampled_us = per_call_us(lambda _: sampled.record("booking", "hotel_search", payload, params))
+        sampled.flush()
+
+        capture = PayloadCapture({"booking": 1.0}, directory=os.path.join(directory, "all"), max_bytes=MAX_BYTES,
+                                 backups=2, queue_size=CALLS)
+        capture_us = per_call_us(lambda _: capture.record("booking", "hotel_search", payload, params))
+        start = time.perf_counter()
+        capture.flush()
+        drain_ms = (time.perf_counter() - start) * 1000
+        stats = capture.stats()
+        files = sorted(glob.glob(os.path.join(directory, "all", "booking_payloads*.jsonl.gz")))
+        sizes = [os.path.getsize(path) for path in files]
+        latest = list(read_payloads(capture.path("booking")))
+
+        burst = PayloadCapture({"booking": 1.0}, directory=os.path.join(directory, "burst"), queue_size=8)
+        burst_us = per_call_us(lambda _: burst.record("booking", "hotel_search", payload, params), calls=1000)
+        burst.flush()
+
+        def responder(path, query):
+            return 200, payload
+
+        os.environ.setdefault("RAPIDAPIKEY", "stub-key")
+        os.environ["DESTINATION_CACHE_PATH"] = ""
+        from adapters.transport import run_sync
+        from adapters.hotel.bookingcom_adapter import BookingAdapter
+        adapter = BookingAdapter("stub-key")
+        adapter.capture = PayloadCapture({"booking": 1.0}, directory=os.path.join(directory, "adapter"))
+        with StubServer(responder) as stub:
+            hotels = run_sync(adapter._fetch_page(f"{stub.url}/api/v1/hotels/searchHotels", {}, {**params, "page_number": 1}))
+        adapter.capture.flush()
+        captured = list(read_payloads(adapter.capture.path("booking")))
+
+    print(f"Payload: {len(str(payload)) / 1024:.0f} KB, {CALLS} requests")
+    print(f"print() to stdout:              {print_us:8.1f} us per request")
+    print(f"record(), {PayloadCapture.RATE:.0%} sampled:          {sampled_us:8.1f} us per request "
+          f"({sampled.stats()['written']} written)")
+    print(f"record(), everything:           {capture_us:8.1f} us per request "
+          f"(writer drained the rest in {drain_ms:.0f} ms)")
+    print(f"  {stats['written']} payloads, {stats['bytes_written'] / 1024:.0f} KB gzipped, "
+          f"files {', '.join(f'{size / 1024:.0f} KB' for size in sizes)} (cap {MAX_BYTES / 1024:.0f} KB)")
+    print(f"Burst of 1000 into a queue of 8: {burst_us:7.1f} us per request, {burst.stats()['dropped']} dropped")
+    print(f"Adapter page: {len(hotels)} hotels captured, context {captured[0]['context']}")
+
+    assert sampled_us * 10 < print_us
+    assert capture_us * 10 < print_us
+    assert stats["written"] == CALLS and not stats["dropped"] and not stats["write_errors"]
+    assert len(files) == 3 and all(size <= MAX_BYTES for size in sizes)
+    assert latest[-1]["payload"] == payload
+    assert burst.stats()["dropped"] > 0 and burst_us < print_us
+    assert captured[0]["kind"] == "hotel_search" and captured[0]["payload"] == hotels
+    assert "api_key" not in captured[0]["context"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Streaming versus full JSON decoding of provider responses.
+
+Feeds each body to the decoder in 16 KB chunks at a simulated link speed and
+compares response.json()-style decoding (wait for the whole body, then
+json.loads) with JSONArrayStream, reporting the time to the first result,
+the time to the top-k results and the peak memory of each path (measured
+with tracemalloc, excluding the simulated network). The pushed rows feed
+the same chunks to JSONArrayStream.feed from an async generator, as the
+async Booking.com adapter does with httpx, and stop reading once the
+stream is complete or enough items have arrived; their body column is the
+part of the body read.
+
+Before timing anything, a small document is split at every byte offset
+(and fed a byte at a time) to check that both ways of reading it decode
+values cut by a chunk boundary, such as 12.5 split after "12.".
+
+Bodies: the recorded Booking.com searchHotels page in logs/ and a SerpAPI
+Google Flights response from benchmarks.fixtures.
+
+Run from the repository root:
+    python -m benchmarks.streaming_decode_benchmark
+"""
+import asyncio
+import glob
+import heapq
+import json
+import time
+import tracemalloc
+
+from adapters.streaming import JSONArrayStream, iter_chunks
+from benchmarks.fixtures import make_serpapi_response
+
+CHUNK = 16384
+# Bytes per second delivered by the simulated connection
+LINK_SPEED = 2_000_000
+# Numbers, literals, escapes and multi-byte UTF-8 that a chunk boundary can cut through
+SPLIT_DOCUMENT = ('{"n": 12.5, "a": [1.25, 2, -3e-2, 1E+3, 0, true, null, "x\\u00e9", "Zürich", {"k": [4.5]}], '
+                  '"z": -0.5}').encode("utf-8")
+
+
+def arrive(body: bytes):
+    """Yield chunks no faster than the simulated link delivers them."""
+    start = time.perf_counter()
+    delivered = 0
+    for chunk in iter_chunks(body, CHUNK):
+        delivered += len(chunk)
+        delay = start + delivered / LINK_SPEED - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        yield chunk
+
+
+def full_decode(body, parent, keys, select):
+    start = time.perf_counter()
+    data = json.loads(b"".join(arrive(body)))
+    for key in parent:
+        data = data.get(key, {})
+    items = [item for key in keys for item in data.get(key, [])]
+    first = time.perf_counter() - start
+    result = select(iter(items))
+    return first, time.perf_counter() - start, result
+
+
+def stream_decode(body, parent, keys, select):
+    start = time.perf_counter()
+    first = None
+
+    def items():
+        nonlocal first
+        for _, item in JSONArrayStream(arrive(body), parent, keys):
+            if first is None:
+                first = time.perf_counter() - start
+            yield item
+
+    result = select(items())
+    return first, time.perf_counter() - start, result
+
+
+async def arrive_async(body: bytes):
+    """As arrive, without blocking the event loop."""
+    start = time.perf_counter()
+    delivered = 0
+    for chunk in iter_chunks(body, CHUNK):
+        delivered += len(chunk)
+        delay = start + delivered / LINK_SPEED - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield chunk
+
+
+def fed_items(chunks, parent, keys):
+    stream = JSONArrayStream(parent=parent, keys=keys)
+    for chunk in chunks:
+        yield from (item for _, item in stream.feed(chunk))
+        if stream.complete:
+            return
+    yield from (item for _, item in stream.close())
+
+
+def pushed_decode(body, parent, keys, select, limit=None):
+    """Push chunks as they arrive, stopping once the stream is complete or limit items are in."""
+    async def run():
+        start = time.perf_counter()
+        first = None
+        items = []
+        stream = JSONArrayStream(parent=parent, keys=keys)
+        async for chunk in arrive_async(body):
+            items.extend(item for _, item in stream.feed(chunk))
+            if first is None and items:
+                first = time.perf_counter() - start
+            if stream.complete or limit is not None and len(items) >= limit:
+                break
+        else:
+            items.extend(item for _, item in stream.close())
+        return first, time.perf_counter() - start, select(iter(items)), stream.bytes_read
+
+    return asyncio.run(run())
+
+
+def check_splits() -> int:
+    """Decode SPLIT_DOCUMENT cut at every byte offset, pulled and pushed; returns the splits checked."""
+    expected = json.loads(SPLIT_DOCUMENT)
+    fields = {key: value for key, value in expected.items() if key != "a"}
+    splits = [[SPLIT_DOCUMENT[:cut], SPLIT_DOCUMENT[cut:]] for cut in range(len(SPLIT_DOCUMENT) + 1)]
+    splits.append([SPLIT_DOCUMENT[index:index + 1] for index in range(len(SPLIT_DOCUMENT))])
+    for chunks in splits:
+        pulled = JSONArrayStream(chunks, keys={"a"})
+        assert [item for _, item in pulled] == expected["a"] and pulled.fields == fields, chunks
+        pushed = JSONArrayStream(keys={"a"})
+        items = [item for chunk in chunks for _, item in pushed.feed(chunk)] + [item for _, item in pushed.close()]
+        assert items == expected["a"] and pushed.fields == fields, chunks
+    return len(splits)
+
+
+def peak_memory(decode, *args) -> int:
+    tracemalloc.start()
+    decode(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(k: int = 3) -> None:
+    hotel_price = lambda hotel: hotel.get("property", {}).get("priceBreakdown", {}).get("grossPrice", {}).get("value", float("inf"))
+    cases = []
+    for path in sorted(glob.glob("logs/booking_hotel_search_*.json")):
+        with open(path, "rb") as file:
+            cases.append((
+                f"Booking hotels, {k} cheapest", file.read(), ("data",), ("hotels",),
+                lambda items: heapq.nsmallest(k, items, key=hotel_price), None,
+            ))
+    serpapi = json.dumps(make_serpapi_response(400, seed=9)).encode("utf-8")
+    cases.append((
+        f"SerpAPI flights, first {k * 10}", serpapi, (), ("best_flights", "other_flights"),
+        lambda items: [item for _, item in zip(range(k * 10), items)], k * 10,
+    ))
+    cases.append((
+        "SerpAPI flights, all", serpapi, (), ("best_flights", "other_flights"), list, None,
+    ))
+
+    print(f"Chunk boundaries: {check_splits()} splits of a {len(SPLIT_DOCUMENT)}-byte document decoded alike")
+    print(f"Link speed {LINK_SPEED / 1e6:.0f} MB/s, {CHUNK // 1024} KB chunks")
+    print(f"{'':<28} {'body':>7} {'first result':>19} {'top-k ready':>19} {'peak memory':>21}")
+    for label, body, parent, keys, select, limit in cases:
+        full_first, full_done, full_result = full_decode(body, parent, keys, select)
+        stream_first, stream_done, stream_result = stream_decode(body, parent, keys, select)
+        assert full_result == stream_result, label
+        full_peak = peak_memory(lambda: json.loads(b"".join(iter_chunks(body, CHUNK))))
+        stream_peak = peak_memory(lambda: select(item for _, item in JSONArrayStream(iter_chunks(body, CHUNK), parent, keys)))
+        print(
+            f"{label:<28} {len(body) / 1024:>5.0f}KB "
+            f"{full_first * 1000:>7.1f} -> {stream_first * 1000:>5.1f} ms "
+            f"{full_done * 1000:>7.1f} -> {stream_done * 1000:>5.1f} ms "
+            f"{full_peak / 1024:>7.0f} -> {stream_peak / 1024:>5.0f} KB"
+        )
+        pushed_first, pushed_done, pushed_result, pushed_bytes = pushed_decode(body, parent, keys, select, limit)
+        assert pushed_result == full_result, label
+        pushed_peak = peak_memory(lambda: select(fed_items(iter_chunks(body, CHUNK), parent, keys)))
+        if limit is not None:
+            assert pushed_done * 2 < full_done, label
+        print(
+            f"{'  pushed (async)':<28} {pushed_bytes / 1024:>5.0f}KB "
+            f"{full_first * 1000:>7.1f} -> {pushed_first * 1000:>5.1f} ms "
+            f"{full_done * 1000:>7.1f} -> {pushed_done * 1000:>5.1f} ms "
+            f"{full_peak / 1024:>7.0f} -> {pushed_peak / 1024:>5.0f} KB"
+        )
+
+
+if __name__ == "__main__":
+    main()
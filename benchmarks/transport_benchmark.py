@@ -0,0 +1,116 @@
+"""
+Benchmark for the shared pooled transport.
+
+Makes 50 sequential calls to a local HTTPS stub in two ways: with
+module-level ``requests.get``, as the adapters used to, and through
+Transport. Does the same for httpx, comparing a new client per call with
+the pooled client. It counts the TLS connections the stub accepted,
+checks that TripAdvisorAdapter reuses the injected transport's
+connection, times a first request after prewarm against a cold one, and
+checks that a slow response hits the read timeout instead of hanging.
+
+Run from the repository root:
+    python -m benchmarks.transport_benchmark
+"""
+import os
+import ssl
+import time
+
+import httpx
+import requests
+
+from benchmarks.fixtures import StubServer, make_tripadvisor_attraction_details
+from benchmarks.flight_concurrency_benchmark import trip
+
+CALLS = 50
+SLOW = 1.0
+
+
+def timed(calls, stub: StubServer):
+    """(ms per call, connections opened) for a callable run CALLS times."""
+    connections = stub.connections
+    start = time.perf_counter()
+    for index in range(CALLS):
+        calls(index)
+    return (time.perf_counter() - start) / CALLS * 1000, stub.connections - connections
+
+
+def main() -> None:
+    os.environ["DESTINATION_CACHE_PATH"] = ""
+    from adapters.activity.tripadvisor_adapter import TripAdvisorAdapter
+    from adapters.rate_limit import TokenBucket
+    from adapters.transport import Transport, run_sync
+
+    def responder(path, params):
+        if path == "/slow":
+            time.sleep(SLOW)
+        return 200, make_tripadvisor_attraction_details(params.get("contentId", 1))
+
+    with StubServer(responder, tls=True) as stub:
+        url = f"{stub.url}/attractions/details"
+        transport = Transport(verify=stub.certificate)
+
+        unpooled_ms, unpooled_connections = timed(
+            lambda index: requests.get(url, params={"contentId": index}, verify=stub.certificate).json(), stub)
+        pooled_ms, pooled_connections = timed(
+            lambda index: transport.get(url, params={"contentId": index}).json(), stub)
+
+        context = ssl.create_default_context(cafile=stub.certificate)
+
+        async def new_client(index):
+            async with httpx.AsyncClient(verify=context) as client:
+                return (await client.get(url, params={"contentId": index})).json()
+
+        async def shared_client(index):
+            return (await transport.async_client().get(url, params={"contentId": index})).json()
+
+        async_unpooled_ms, async_unpooled_connections = timed(lambda index: run_sync(new_client(index)), stub)
+        async_pooled_ms, async_pooled_connections = timed(lambda index: run_sync(shared_client(index)), stub)
+
+        adapter = TripAdvisorAdapter("stub-key", transport=transport)
+        adapter.endpoint = stub.url
+        adapter.rate_limiter = TokenBucket("transport_benchmark", rate=1000, capacity=1000)
+        user_input = trip()
+        adapter_ms, adapter_connections = timed(
+            lambda index: adapter.get_activity_details(str(index), user_input)["data"], stub)
+
+        cold = Transport(verify=stub.certificate)
+        start = time.perf_counter()
+        cold.get(url).json()
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        warm = Transport(verify=stub.certificate)
+        warmed = warm.prewarm([stub.url])
+        start = time.perf_counter()
+        warm.get(url).json()
+        warm_ms = (time.perf_counter() - start) * 1000
+
+        impatient = Transport(read_timeout=0.2, verify=stub.certificate)
+        start = time.perf_counter()
+        try:
+            impatient.get(f"{stub.url}/slow")
+            timed_out = False
+        except requests.Timeout:
+            timed_out = True
+        timeout_elapsed = time.perf_counter() - start
+
+    print(f"{CALLS} sequential HTTPS calls to a local stub (HTTP/2 {'on' if transport.http2 else 'unavailable, HTTP/1.1'})")
+    print(f"requests.get per call:        {unpooled_ms:6.2f} ms/call, {unpooled_connections} new TLS connections")
+    print(f"Transport.get:                {pooled_ms:6.2f} ms/call, {pooled_connections} new TLS connections")
+    print(f"httpx client per call:        {async_unpooled_ms:6.2f} ms/call, {async_unpooled_connections} new TLS connections")
+    print(f"Transport.async_client():     {async_pooled_ms:6.2f} ms/call, {async_pooled_connections} new TLS connections")
+    print(f"TripAdvisorAdapter details:   {adapter_ms:6.2f} ms/call, {adapter_connections} new TLS connections")
+    print(f"First request, cold:          {cold_ms:6.2f} ms")
+    print(f"First request after prewarm:  {warm_ms:6.2f} ms  ({warmed} connections prewarmed)")
+    print(f"Read timeout 200 ms on a {SLOW * 1000:.0f} ms response: gave up after {timeout_elapsed * 1000:.0f} ms")
+
+    assert unpooled_connections == CALLS and pooled_connections == 1
+    assert async_unpooled_connections == CALLS and async_pooled_connections == 1
+    assert adapter_connections == 0
+    assert pooled_ms * 2 < unpooled_ms and async_pooled_ms * 2 < async_unpooled_ms
+    assert warmed == 2 and warm_ms < cold_ms
+    assert timed_out and timeout_elapsed < SLOW
+
+
+if __name__ == "__main__":
+    main()
@@ -36,6 +36,7 @@ def holiday_package_node(holiday_package_service: HolidayPackageService):
         inbound_flight=state.flight,  # Assuming same flight for simplicity
         hotel=state.hotel,
         activities=state.activities,
+        itinerary=state.itinerary,
         start_date=state.user_input.departure_date_leaving,
         end_date=state.user_input.arrival_date_coming_back,
         number_of_guests=state.user_input.adult_guests,
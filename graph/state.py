@@ -4,6 +4,7 @@ from models.user_input import UserInput
 from models.flight import Flight
 from models.hotel import Hotel
 from models.activity import Activity
+from models.itinerary import ItineraryDay
 from models.holiday_package import HolidayPackage
 from langchain_core.messages.base import BaseMessage
 
@@ -12,5 +13,6 @@ class PlannerState(BaseModel):
   flight: Optional[Flight]
   hotel: Optional[Hotel]
   activities: Optional[List[Activity]] = None
+  itinerary: Optional[List[ItineraryDay]] = None
   holiday_package: Optional[HolidayPackage] = None
   messages: List[BaseMessage]
\ No newline at end of file
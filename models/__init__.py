@@ -4,8 +4,9 @@ from .carbon_emissions import CarbonEmissions
 from .flight import Flight
 from .holiday_package import HolidayPackage
 from .hotel import Hotel
+from .itinerary import ItineraryDay
 from .price import Price
 from .user_input import UserInput
 from .location import Location
 
-__all__ = ['Activity', 'AirportInfo', 'CarbonEmissions', 'Flight', 'HolidayPackage', 'Hotel', 'Price', 'UserInput', 'Location']
\ No newline at end of file
+__all__ = ['Activity', 'AirportInfo', 'CarbonEmissions', 'Flight', 'HolidayPackage', 'Hotel', 'ItineraryDay', 'Price', 'UserInput', 'Location']
\ No newline at end of file
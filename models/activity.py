@@ -1,5 +1,6 @@
+import re
 from pydantic import BaseModel, HttpUrl, Field
-from typing import Optional, List
+from typing import Any, Optional, List
 from models.location import Location
 from models.price import Price
 from datetime import datetime, timedelta
@@ -129,8 +130,8 @@ class Activity(BaseModel):
             description=activity_data.get("description"),
             category=activity_data.get("category"),
             location=Location(
-                latitude=activity_data.get("latitude"),
-                longitude=activity_data.get("longitude")
+                lat=activity_data.get("latitude"),
+                lon=activity_data.get("longitude")
             ) if activity_data.get("latitude") and activity_data.get("longitude") else None,
             price=Price(
                 amount=activity_data.get("price", {}).get("amount"),
@@ -157,3 +158,71 @@ class Activity(BaseModel):
             cancellation_policy=activity_data.get("cancellation_policy"),
             languages=activity_data.get("languages", [])
         )
+
+    def with_details(self, details: dict) -> 'Activity':
+        """Return a copy filled in from a TripAdvisor attractions/details "data" object.
+
+        Only fields the search result left empty are set: location,
+        duration, schedule, age limits, inclusions, cancellation policy,
+        languages and difficulty.
+        """
+        if not details or "error" in details:
+            return self
+
+        update = {}
+        # "location" can also be a plain address string or a list; only a dict holds coordinates
+        geo = next((value for value in (details.get("geoPoint"), details.get("location")) if isinstance(value, dict)), details)
+        if not self.location and geo.get("latitude") is not None and geo.get("longitude") is not None:
+            update["location"] = Location(lat=geo["latitude"], lon=geo["longitude"])
+
+        minutes = _minutes(details.get("durationMinutes", details.get("duration")))
+        if minutes and not self.duration:
+            update["duration"] = timedelta(minutes=minutes)
+
+        start_times = details.get("startTimes") or []
+        available_dates = details.get("availableDates") or []
+        if not self.schedule and (start_times or available_dates):
+            update["schedule"] = ActivitySchedule(
+                start_time=start_times[0] if start_times else None,
+                duration=timedelta(minutes=minutes) if minutes else None,
+                available_dates=available_dates or None
+            )
+
+        ages = details.get("ageRange") or {}
+        if self.minimum_age is None and details.get("minAge", ages.get("min")) is not None:
+            update["minimum_age"] = details.get("minAge", ages.get("min"))
+        if self.maximum_age is None and details.get("maxAge", ages.get("max")) is not None:
+            update["maximum_age"] = details.get("maxAge", ages.get("max"))
+
+        for field, key in (("included_items", "inclusions"), ("excluded_items", "exclusions"), ("languages", "languages")):
+            if not getattr(self, field) and details.get(key):
+                update[field] = [_text(item) for item in details[key] if _text(item)]
+
+        if not self.cancellation_policy and details.get("cancellationPolicy"):
+            update["cancellation_policy"] = _text(details["cancellationPolicy"])
+        if not self.difficulty_level and details.get("difficulty"):
+            update["difficulty_level"] = _text(details["difficulty"])
+        if not self.description and details.get("about"):
+            update["description"] = _text(details["about"])
+
+        return self.model_copy(update=update)
+
+
+def _text(value: Any) -> Optional[str]:
+    """TripAdvisor text fields come as plain strings or {"text": ...} objects."""
+    if isinstance(value, dict):
+        value = value.get("text") or value.get("string")
+    return str(value).strip() if value else None
+
+
+def _minutes(value: Any) -> Optional[float]:
+    """Minutes from a number, {"minutes": n}, or text such as "2-3 hours" (lower bound)."""
+    if isinstance(value, dict):
+        value = value.get("minutes")
+    if isinstance(value, (int, float)):
+        return value
+    match = re.search(r"(\d+(?:\.\d+)?)(?:\s*-\s*\d+(?:\.\d+)?)?\s*(hour|hr|h|minute|min|m)", str(value or ""), re.IGNORECASE)
+    if not match:
+        return None
+    number = float(match.group(1))
+    return number * 60 if match.group(2).lower().startswith("h") else number
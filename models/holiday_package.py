@@ -4,6 +4,7 @@ from datetime import date
 from models.flight import Flight
 from models.hotel import Hotel
 from models.activity import Activity
+from models.itinerary import ItineraryDay
 from models.price import Price
 
 class HolidayPackage(BaseModel):
@@ -14,6 +15,7 @@ class HolidayPackage(BaseModel):
     inbound_flight: Optional[Flight] = Field(None, description="Inbound flight details")
     hotel: Optional[Hotel] = Field(None, description="Hotel details")
     activities: Optional[List[Activity]] = Field(None, description="Selected activities")
+    itinerary: Optional[List[ItineraryDay]] = Field(None, description="Activities arranged day by day")
     start_date: date = Field(..., description="Holiday start date")
     end_date: date = Field(..., description="Holiday end date")
     total_price: Price = Field(..., description="Total package price")
@@ -79,6 +81,16 @@ class HolidayPackage(BaseModel):
 
         return True
 
+    @staticmethod
+    def _format_activity(activity: Activity) -> str:
+        price = f"{activity.price.amount} {activity.price.currency}" if activity.price else "Not specified"
+        return f"""
+{activity.name}
+Category: {activity.category}
+Duration: {activity.duration}
+Price: {price}
+"""
+
     def generate_itinerary(self) -> str:
         """Generate a detailed itinerary for the holiday package"""
         itinerary = f"""
@@ -106,13 +118,16 @@ Room Type: {self.hotel.room.room_type if self.hotel.room else 'Not specified'}
 
 ACTIVITIES:
 """
-        for activity in self.activities:
-            itinerary += f"""
-{activity.name}
-Category: {activity.category}
-Duration: {activity.duration}
-Price: {activity.price.amount} {activity.price.currency}
+        if self.itinerary:
+            for number, day in enumerate(self.itinerary, start=1):
+                itinerary += f"""
+Day {number} ({day.day:%A %d %B}): {len(day.activities)} activities, {day.travel_km:.1f} km between stops
 """
+                for activity in day.activities:
+                    itinerary += self._format_activity(activity)
+        else:
+            for activity in self.activities or []:
+                itinerary += self._format_activity(activity)
 
         itinerary += f"""
 TOTAL COST: {self.total_price.amount} {self.total_price.currency}
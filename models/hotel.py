@@ -1,3 +1,4 @@
+import re
 from pydantic import BaseModel, HttpUrl, Field
 from typing import Optional, List
 from models.location import Location
@@ -36,6 +37,7 @@ class Hotel(BaseModel):
     booking_url: Optional[HttpUrl] = Field(None, description="URL to book the hotel")
     images: Optional[List[HotelImage]] = Field(None, description="Hotel images")
     total_price: Optional[Price] = Field(None, description="Total price for the stay")
+    provider: Optional[str] = Field(None, description="Provider the hotel was found on (e.g., booking)")
 
     @property
     def hotel_name(self) -> str:
@@ -123,5 +125,96 @@ class Hotel(BaseModel):
             total_price=Price(
                 amount=gross_price.get("value"),
                 currency=gross_price.get("currency", "GBP")
-            ) if gross_price else None
-        )
\ No newline at end of file
+            ) if gross_price else None,
+            provider="booking"
+        )
+
+    @classmethod
+    def from_skyscrapper(cls, hotel_data: dict, check_in: Optional[date] = None, check_out: Optional[date] = None,
+                         currency: str = "GBP") -> 'Hotel':
+        """Create a Hotel instance from a Sky Scrapper searchHotels result"""
+        rating = hotel_data.get("rating") or {}
+        price = hotel_data.get("rawPrice")
+        if price is None and hotel_data.get("price"):
+            digits = re.sub(r"[^\d.]", "", str(hotel_data["price"]))
+            price = float(digits) if digits else None
+
+        # Coordinates come as [longitude, latitude]
+        coordinates = hotel_data.get("coordinates") or []
+        location = Location(lat=coordinates[1], lon=coordinates[0]) if len(coordinates) == 2 else None
+
+        return cls(
+            id=str(hotel_data["hotelId"]),
+            name=hotel_data["name"],
+            entity_id=str(hotel_data["hotelId"]),
+            address=hotel_data.get("distance"),
+            location=location,
+            stars=hotel_data.get("stars") or None,
+            reviews=HotelReview(
+                # Sky Scrapper rates out of 5
+                rating=float(rating["value"]) * 2,
+                count=rating.get("count"),
+                provider="Skyscanner"
+            ) if rating.get("value") else None,
+            check_in=check_in,
+            check_out=check_out,
+            images=[HotelImage(url=hotel_data["heroImage"])] if hotel_data.get("heroImage") else [],
+            total_price=Price(amount=price, currency=currency) if price is not None else None,
+            provider="skyscrapper"
+        )
+
+    def with_details(self, details: dict) -> 'Hotel':
+        """Return a copy filled in from a Booking.com getHotelDetails "data" object.
+
+        The search result only has a partial address (district and distance
+        from the centre) and a room described by its beds, so the full address
+        and the room name from details replace those. Otherwise fields the
+        search result already provided are kept, and details only add what it
+        left out (location, facilities, photos, room capacity and terms).
+        """
+        if not details or "error" in details:
+            return self
+
+        update = {}
+        address = ", ".join(str(part) for part in (details.get("address"), details.get("city"), details.get("zip")) if part)
+        if address:
+            update["address"] = address
+        if not self.location and details.get("latitude") and details.get("longitude"):
+            update["location"] = Location(lat=details["latitude"], lon=details["longitude"])
+        if not self.booking_url and details.get("url"):
+            update["booking_url"] = details["url"]
+
+        facilities = [
+            facility.get("name") for facility in (details.get("facilities_block") or {}).get("facilities", [])
+            if facility.get("name")
+        ] or [
+            highlight.get("name") for highlight in details.get("property_highlight_strip", [])
+            if highlight.get("name")
+        ]
+        if facilities and not self.amenities:
+            update["amenities"] = facilities
+
+        rooms = details.get("rooms") or {}
+        photos = [
+            photo.get("url_original") or photo.get("url_max")
+            for room in rooms.values() for photo in room.get("photos", [])
+        ]
+        known = {str(image.url) for image in self.images or []}
+        new_images = [HotelImage(url=url) for url in dict.fromkeys(photo for photo in photos if photo) if url not in known]
+        if new_images:
+            update["images"] = (self.images or []) + new_images
+
+        block = (details.get("block") or [{}])[0]
+        if self.room and block:
+            update["room"] = self.room.model_copy(update={
+                "room_type": block.get("room_name") or self.room.room_type,
+                "capacity": self.room.capacity or block.get("max_occupancy"),
+                "refundable": self.room.refundable or (block.get("paymentterms", {}).get("cancellation", {}).get("type") == "free_cancellation"),
+            })
+
+        if not self.total_price:
+            gross = (details.get("product_price_breakdown") or {}).get("gross_amount") or {}
+            if gross.get("value") is not None:
+                update["total_price"] = Price(amount=gross["value"], currency=gross.get("currency", "GBP"))
+
+        return self.model_copy(update=update)
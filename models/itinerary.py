@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import List
+from datetime import date
+from models.activity import Activity
+
+class ItineraryDay(BaseModel):
+    day: date = Field(..., description="Date of this day of the trip")
+    activities: List[Activity] = Field(default_factory=list, description="Activities in the order they are visited")
+    activity_minutes: float = Field(0, description="Time spent at the activities")
+    travel_minutes: float = Field(0, description="Estimated time travelling between stops")
+    travel_km: float = Field(0, description="Distance travelled between stops")
+
+    @property
+    def total_minutes(self) -> float:
+        return self.activity_minutes + self.travel_minutes
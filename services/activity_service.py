@@ -1,9 +1,12 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
+import logging
 import os
-from models import UserInput
+from models import UserInput, Activity
 from adapters.activity.tripadvisor_adapter import TripAdvisorAdapter
 from services.base import Service
 
+logger = logging.getLogger(__name__)
+
 class ActivityService(Service):
     def __init__(self):
         super().__init__()
@@ -14,11 +17,11 @@ class ActivityService(Service):
         # Initialize adapters
         self.tripadvisor_adapter = TripAdvisorAdapter(self.rapid_api_key)
 
-    def search_activities(self, input: UserInput) -> Dict[str, Any]:
-        """Search for activities using available adapters"""
+    def search_activities(self, input: UserInput, limit: int = None) -> Dict[str, Any]:
+        """Search for activities using available adapters, returning at most limit"""
         try:
             # Try TripAdvisor first
-            response = self.tripadvisor_adapter.search_activities(input)
+            response = self.tripadvisor_adapter.search_activities(input, limit=limit)
             
             # If TripAdvisor fails or returns no results
             if response.get("error") or not response.get("results"):
@@ -42,4 +45,30 @@ class ActivityService(Service):
             return response
 
         except Exception as e:
-            return {"error": f"Failed to get activity details: {str(e)}"}
\ No newline at end of file
+            return {"error": f"Failed to get activity details: {str(e)}"}
+
+    def enrich_activities(self, activities: List[Activity], input: UserInput, top_n: int = None) -> List[Activity]:
+        """Fill in the first top_n activities (all by default) from their details.
+
+        Details for all of them are fetched at once within TripAdvisor's rate
+        limit, so enriching a handful of activities costs about one round
+        trip. Activities whose details can't be fetched or applied are
+        returned as they were, as are any past top_n.
+        """
+        top = activities[:top_n] if top_n is not None else activities
+        if not top:
+            return activities
+        try:
+            details = self.tripadvisor_adapter.get_activities_details([activity.id for activity in top], input)
+        except Exception as e:
+            logger.warning("Failed to get activity details: %s", e)
+            return activities
+
+        enriched = []
+        for activity in top:
+            try:
+                enriched.append(activity.with_details(details.get(activity.id, {})))
+            except Exception as e:
+                logger.warning("Failed to apply details to activity %s: %s", activity.id, e)
+                enriched.append(activity)
+        return enriched + activities[len(top):]
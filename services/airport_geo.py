@@ -0,0 +1,152 @@
+import heapq
+import math
+from array import array
+from typing import List, Sequence, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    phi, lam = math.radians(lat), math.radians(lon)
+    return math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi)
+
+
+def _chord_to_km(squared_chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(squared_chord) / 2))
+
+
+class AirportGeoIndex:
+    """
+    A static k-d tree over airport coordinates.
+
+    Points are stored as unit vectors on the sphere, where straight-line
+    (chord) distance orders points exactly like great-circle distance, so the
+    tree needs no special handling for the antimeridian or the poles. The tree
+    is implicit: the points are permuted in place so that the median of every
+    index range is the splitting node, and all coordinates live in flat
+    ``array('d')`` columns.
+    """
+
+    def __init__(self, latitudes: Sequence[float], longitudes: Sequence[float]):
+        """
+        Build the index from row-aligned coordinate columns.
+
+        Args:
+            latitudes (Sequence[float]): Latitude per airport row (NaN if unknown)
+            longitudes (Sequence[float]): Longitude per airport row (NaN if unknown)
+        """
+        rows = [
+            row for row, (lat, lon) in enumerate(zip(latitudes, longitudes))
+            if not (math.isnan(lat) or math.isnan(lon))
+        ]
+        vectors = {row: _unit_vector(latitudes[row], longitudes[row]) for row in rows}
+
+        self._build(rows, vectors, 0, len(rows), 0)
+        self.rows = array("I", rows)
+        self.axes = [array("d", (vectors[row][axis] for row in rows)) for axis in range(3)]
+
+    @staticmethod
+    def _build(rows: List[int], vectors: dict, lo: int, hi: int, depth: int) -> None:
+        # Sort each range on the splitting axis so its median becomes the node
+        stack = [(lo, hi, depth)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= 1:
+                continue
+            axis = depth % 3
+            rows[lo:hi] = sorted(rows[lo:hi], key=lambda row: vectors[row][axis])
+            mid = (lo + hi) // 2
+            stack.append((lo, mid, depth + 1))
+            stack.append((mid + 1, hi, depth + 1))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Tuple[int, float]]:
+        """
+        Find the k airports closest to a point.
+
+        Args:
+            lat (float): Latitude in degrees
+            lon (float): Longitude in degrees
+            k (int): Number of airports to return
+
+        Returns:
+            List[Tuple[int, float]]: ``(row, distance_km)`` pairs, nearest first
+        """
+        if k <= 0 or not len(self.rows):
+            return []
+        target = _unit_vector(lat, lon)
+        xs, ys, zs = self.axes
+        best: List[Tuple[float, int]] = []  # max-heap of (-squared chord, position)
+
+        stack = [(0, len(self.rows), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            dx, dy, dz = xs[mid] - target[0], ys[mid] - target[1], zs[mid] - target[2]
+            squared = dx * dx + dy * dy + dz * dz
+            if len(best) < k:
+                heapq.heappush(best, (-squared, mid))
+            elif squared < -best[0][0]:
+                heapq.heapreplace(best, (-squared, mid))
+
+            split = (dx, dy, dz)[depth % 3]
+            near, far = ((lo, mid), (mid + 1, hi)) if split > 0 else ((mid + 1, hi), (lo, mid))
+            # Push the far side first so the near side is explored first
+            if len(best) < k or split * split < -best[0][0]:
+                stack.append((far[0], far[1], depth + 1))
+            stack.append((near[0], near[1], depth + 1))
+
+        return [(self.rows[position], _chord_to_km(-negative)) for negative, position in sorted(best, reverse=True)]
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> List[Tuple[int, float]]:
+        """
+        Find every airport within a great-circle radius of a point.
+
+        Args:
+            lat (float): Latitude in degrees
+            lon (float): Longitude in degrees
+            radius_km (float): Search radius in kilometres
+
+        Returns:
+            List[Tuple[int, float]]: ``(row, distance_km)`` pairs, nearest first
+        """
+        if radius_km < 0 or not len(self.rows):
+            return []
+        target = _unit_vector(lat, lon)
+        xs, ys, zs = self.axes
+        angle = min(math.pi, radius_km / EARTH_RADIUS_KM)
+        limit = (2 * math.sin(angle / 2)) ** 2
+
+        found = []
+        stack = [(0, len(self.rows), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            dx, dy, dz = xs[mid] - target[0], ys[mid] - target[1], zs[mid] - target[2]
+            squared = dx * dx + dy * dy + dz * dz
+            if squared <= limit:
+                found.append((squared, mid))
+
+            split = (dx, dy, dz)[depth % 3]
+            if split > 0 or split * split <= limit:
+                stack.append((lo, mid, depth + 1))
+            if split <= 0 or split * split <= limit:
+                stack.append((mid + 1, hi, depth + 1))
+
+        found.sort()
+        return [(self.rows[position], _chord_to_km(squared)) for squared, position in found]
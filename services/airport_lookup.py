@@ -1,5 +1,11 @@
-import csv
-from typing import List, Dict
+import math
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Dict, Tuple, Union
+from services.airport_snapshot import AirportSnapshot, AirportRecords
+from services.airport_search import AirportSearchIndex
+from services.airport_geo import AirportGeoIndex
 
 class CityToAirportService:
     """
@@ -9,8 +15,16 @@ class CityToAirportService:
     - Find airports by city name
     - Look up IATA codes for cities
     - Find cities by IATA codes
+    - Search for airports with typo-tolerant matching
+    - Find airports near a point or a city
     """
 
+    # Minimum fuzzy score for find_first_iata_by_city to accept a non-exact match
+    FUZZY_MATCH_THRESHOLD = 0.8
+    # Airport names containing these are not served by scheduled passenger flights
+    NON_COMMERCIAL_MARKERS = ("heliport", "air base", "airbase", "air force", "afb", "army", "naval",
+                              "raf ", "airfield", "seaplane", "air station")
+
     def __init__(self, csv_path: str):
         """
         Initialize the service with airport data from a CSV file.
@@ -19,8 +33,6 @@ class CityToAirportService:
             csv_path (str): Path to the CSV file containing airport data
         """
         self.airports = self.__load_airports(csv_path)
-        # Create a lookup dictionary for IATA codes
-        self.iata_to_city = {airport["iata"].upper(): airport["city"] for airport in self.airports}
         # Define major airports for common cities
         self.major_airports = {
           "london": "LHR",  # Heathrow
@@ -59,43 +71,119 @@ class CityToAirportService:
             "helsinki": "helsinki"
         }
 
-    def __load_airports(self, path: str) -> List[Dict]:
+        # Indexes are derived from the snapshot once and shared by every service using it
+        indexes = self.snapshot.derived("lookup_indexes", self.__build_indexes)
+        self.city_index: Dict[str, array] = indexes["city_index"]
+        self.city_country_index: Dict[Tuple[str, str], array] = indexes["city_country_index"]
+        self.preferred_by_city: Dict[str, str] = indexes["preferred_by_city"]
+        self.preferred_by_city_country: Dict[Tuple[str, str], str] = indexes["preferred_by_city_country"]
+        self.rows_by_iata: array = indexes["rows_by_iata"]
+
+    def __load_airports(self, path: str) -> AirportRecords:
         """
-        Load airport data from a CSV file.
+        Load airport data from the shared snapshot of a CSV file.
+        
+        The CSV is only parsed when its compiled snapshot is missing or stale;
+        every other service in the process reuses the same mapped snapshot.
         
         Args:
             path (str): Path to the CSV file
             
         Returns:
-            List[Dict]: List of airport dictionaries containing city, name, country, and IATA code
+            AirportRecords: Read-only sequence of airport dictionaries containing
+            city, name, country, and IATA code, decoded on access
             
         Raises:
             FileNotFoundError: If the CSV file cannot be found
             ValueError: If the CSV file is malformed or empty
         """
-        airports = []
-        try:
-            with open(path, encoding="utf-8") as file:
-                reader = csv.reader(file)
-                for row in reader:
-                    if len(row) < 5:
-                        continue  # Skip malformed rows
-                    iata = row[4].strip()
-                    if iata and iata != "\\N":
-                        airports.append({
-                            "city": row[2].strip().lower(),
-                            "name": row[1].strip(),
-                            "country": row[3].strip().lower(),
-                            "iata": iata,
-                        })
-            if not airports:
-                raise ValueError("No valid airport data found in the CSV file")
-            return airports
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Airport data file not found: {path}")
-        except Exception as e:
-            raise ValueError(f"Error loading airport data: {str(e)}")
+        self.snapshot = AirportSnapshot.load(path)
+        return self.snapshot.records()
     
+    @classmethod
+    def __build_indexes(cls, snapshot: AirportSnapshot) -> Dict:
+        """
+        Build the columnar indexes used by the lookup methods.
+
+        Airports are grouped by city and by (city, country) into compact arrays
+        of row numbers, and the preferred IATA code for every key is resolved
+        once here so that lookups are single dictionary hits. Row data itself
+        stays in the snapshot's string table and is only decoded for results.
+
+        Args:
+            snapshot (AirportSnapshot): The airport snapshot to index
+
+        Returns:
+            Dict: The indexes, keyed by attribute name
+        """
+        cities = [sys.intern(city) for city in snapshot.column("city")]
+        countries = [sys.intern(country) for country in snapshot.column("country")]
+        names = snapshot.column("name")
+        iatas = snapshot.column("iata")
+
+        city_index: Dict[str, array] = {}
+        city_country_index: Dict[Tuple[str, str], array] = {}
+        for row, (city, country) in enumerate(zip(cities, countries)):
+            if city not in city_index:
+                city_index[city] = array("I")
+            city_index[city].append(row)
+            key = (city, country)
+            if key not in city_country_index:
+                city_country_index[key] = array("I")
+            city_country_index[key].append(row)
+
+        return {
+            "city_index": city_index,
+            "city_country_index": city_country_index,
+            "preferred_by_city": {
+                city: cls.__preferred_iata(rows, names, iatas) for city, rows in city_index.items()
+            },
+            "preferred_by_city_country": {
+                key: cls.__preferred_iata(rows, names, iatas) for key, rows in city_country_index.items()
+            },
+            # Row numbers ordered by IATA code, searched with bisect instead of a dict of copied keys
+            "rows_by_iata": array("I", sorted(range(len(iatas)), key=lambda row: iatas[row].upper())),
+        }
+
+    @staticmethod
+    def __preferred_iata(rows: array, names: List[str], iatas: List[str]) -> str:
+        """
+        Pick the IATA code to use for a group of airports in the same city.
+
+        Args:
+            rows (array): Rows of the airports sharing a city (and optionally country)
+            names (List[str]): Airport name column
+            iatas (List[str]): IATA code column
+
+        Returns:
+            str: The first international airport's IATA code, or the first airport's
+        """
+        # Prefer international airport
+        for row in rows:
+            if "international" in names[row].lower():
+                return iatas[row]
+
+        # Return first match if no international airport
+        return iatas[rows[0]]
+
+    def __row_by_iata(self, iata_code: str) -> int:
+        """
+        Find the row of an airport by IATA code.
+
+        Args:
+            iata_code (str): Upper-case IATA code
+
+        Returns:
+            int: The row number if found, None otherwise
+        """
+        get = self.snapshot.get
+        position = bisect_left(self.rows_by_iata, iata_code, key=lambda row: get("iata", row).upper())
+        if position < len(self.rows_by_iata):
+            row = self.rows_by_iata[position]
+            if get("iata", row).upper() == iata_code:
+                return row
+        return None
+
     def find_airports_by_city(self, city_name: str, country_name: str = None) -> List[Dict]:
         """
         Find all airports in a given city.
@@ -114,9 +202,10 @@ class CityToAirportService:
             
         if country_name:
             country_name = country_name.strip().lower()
-            return [airport for airport in self.airports 
-                    if airport["city"] == city_name and airport["country"] == country_name]
-        return [airport for airport in self.airports if airport["city"] == city_name]
+            rows = self.city_country_index.get((city_name, country_name), ())
+        else:
+            rows = self.city_index.get(city_name, ())
+        return [self.airports[row] for row in rows]
 
     def find_first_iata_by_city(self, city_name: str, country_name: str = None) -> str:
         """
@@ -125,8 +214,10 @@ class CityToAirportService:
         This method implements a smart selection algorithm that:
         1. First checks if the city has a predefined major airport
         2. Then checks if the input is an alternative name
-        3. Then searches the full database
+        3. Then looks up the preferred airport precomputed for the city
         4. Prioritizes international airports when multiple options exist
+        5. Falls back to the best fuzzy match for misspelt or variant names,
+           considering commercial airports only
         
         Args:
             city_name (str): Name of the city to search for
@@ -148,17 +239,158 @@ class CityToAirportService:
             if city_key in self.major_airports:
                 return self.major_airports[city_key]
 
-        matches = self.find_airports_by_city(city_key, country_name)
-        if not matches:
-            return None
+        if country_name:
+            country_key = country_name.strip().lower()
+            iata = self.preferred_by_city_country.get((city_key, country_key))
+        else:
+            country_key = None
+            iata = self.preferred_by_city.get(city_key)
+        if iata:
+            return iata
 
-        # Prefer international airport
-        for airport in matches:
-            if "international" in airport["name"].lower():
-                return airport["iata"]
+        for candidate in self.search_airports(city_key):
+            if candidate["score"] < self.FUZZY_MATCH_THRESHOLD:
+                break
+            if country_key and candidate["country"] != country_key:
+                continue
+            if candidate["kind"] == "city":
+                if candidate["city"] in self.major_airports:
+                    return self.major_airports[candidate["city"]]
+                # The city's preferred airport may be an air base, e.g. Moron for Sevilla
+                airports = [
+                    airport for airport in self.find_airports_by_city(candidate["city"], candidate["country"])
+                    if self.__is_commercial(airport["name"])
+                ]
+                if airports:
+                    international = [airport for airport in airports if "international" in airport["name"].lower()]
+                    return (international or airports)[0]["iata"]
+            elif candidate["kind"] != "airport" or self.__is_commercial(candidate["match"]):
+                return candidate["iata"]
+        return None
 
-        # Return first match if no international airport
-        return matches[0]["iata"]
+    def __is_commercial(self, name: str) -> bool:
+        """False for heliports, military bases and similar fields, judged by airport name."""
+        name = name.lower()
+        return not any(marker in name for marker in self.NON_COMMERCIAL_MARKERS)
+
+    @property
+    def search_index(self) -> AirportSearchIndex:
+        """The fuzzy search index, built on first use so exact hits never pay for it."""
+        return self.snapshot.derived("search_index", lambda snapshot: AirportSearchIndex(
+            cities=snapshot.column("city"),
+            names=snapshot.column("name"),
+            iatas=snapshot.column("iata"),
+            icaos=snapshot.column("icao"),
+        ))
+
+    def search_airports(self, query: str, limit: int = 5) -> List[Dict]:
+        """
+        Search airports by city name, airport name or IATA/ICAO code, tolerating typos.
+        
+        Exact names and codes are returned straight from the index; anything else
+        is ranked by trigram overlap and edit distance.
+        
+        Args:
+            query (str): Free-text search such as "Barcelon", "Lisboa" or "EGLL"
+            limit (int): Maximum number of candidates to return
+            
+        Returns:
+            List[Dict]: Ranked candidates, best first, each with the matched text,
+            match kind ("city", "airport", "iata" or "icao"), score, city, country
+            and IATA code
+        """
+        candidates = []
+        for term, kind, score, rows in self.search_index.search(query, limit=limit):
+            if kind == "city":
+                # One candidate per country, e.g. Birmingham UK and Birmingham US
+                seen = set()
+                for row in rows:
+                    airport = self.airports[row]
+                    key = (airport["city"], airport["country"])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    candidates.append({
+                        "match": term,
+                        "kind": kind,
+                        "score": score,
+                        "city": airport["city"],
+                        "country": airport["country"],
+                        "iata": self.preferred_by_city_country[key],
+                    })
+            else:
+                for row in rows:
+                    airport = self.airports[row]
+                    candidates.append({
+                        "match": term,
+                        "kind": kind,
+                        "score": score,
+                        "city": airport["city"],
+                        "country": airport["country"],
+                        "iata": airport["iata"],
+                    })
+        return candidates[:limit]
+
+    def find_commercial_airports(self, city_name: str, country_name: str = None) -> List[Dict]:
+        """
+        Find every commercial airport serving a city, preferred airport first.
+        
+        Heliports, military bases and similar fields are dropped. Without a
+        country, the search is limited to the country of the city's preferred
+        airport, so "London" means the UK airports rather than London, Ontario.
+        
+        Args:
+            city_name (str): Name of the city to search for
+            country_name (str, optional): Name of the country to filter by
+            
+        Returns:
+            List[Dict]: Matching airports, preferred airport first
+        """
+        preferred = self.find_first_iata_by_city(city_name, country_name)
+        if not preferred:
+            return []
+        preferred_row = self.__row_by_iata(preferred)
+        city = self.snapshot.get("city", preferred_row)
+        country = country_name.strip().lower() if country_name else self.snapshot.get("country", preferred_row)
+
+        airports = [
+            airport for airport in self.find_airports_by_city(city, country)
+            if self.__is_commercial(airport["name"])
+        ]
+        airports.sort(key=lambda airport: airport["iata"] != preferred)
+        if not airports or airports[0]["iata"] != preferred:
+            airports.insert(0, self.airports[preferred_row])
+        return airports
+
+    def resolve_many(self, cities: Iterable[str], countries: Union[str, Iterable[str]] = None) -> List[str]:
+        """
+        Resolve many cities to IATA codes in one call, e.g. every leg of a batch of trips.
+        
+        Inputs are normalised and deduplicated first, so each distinct
+        (city, country) pair goes through find_first_iata_by_city only once.
+        
+        Args:
+            cities (Iterable[str]): City names to resolve
+            countries (str or Iterable[str], optional): A single country applied to every
+                city, or one country per city (None entries mean no filter)
+            
+        Returns:
+            List[str]: The IATA code for each input city in input order, None where not found
+        """
+        cities = list(cities)
+        if countries is None or isinstance(countries, str):
+            countries = [countries] * len(cities)
+        else:
+            countries = list(countries)
+            if len(countries) != len(cities):
+                raise ValueError("countries must be a single value or match the number of cities")
+
+        keys = [
+            (city.strip().lower(), country.strip().lower() if country else None)
+            for city, country in zip(cities, countries)
+        ]
+        resolved = {key: self.find_first_iata_by_city(*key) for key in dict.fromkeys(keys)}
+        return [resolved[key] for key in keys]
 
     def find_city_by_iata(self, iata_code: str) -> str:
         """
@@ -177,4 +409,68 @@ class CityToAirportService:
         if len(iata_code) != 3 or not iata_code.isalpha():
             return None
         
-        return self.iata_to_city.get(iata_code)
\ No newline at end of file
+        row = self.__row_by_iata(iata_code)
+        return self.snapshot.get("city", row) if row is not None else None
+
+    @property
+    def geo_index(self) -> AirportGeoIndex:
+        """The spatial index over airport coordinates, built on first use."""
+        return self.snapshot.derived("geo_index", lambda snapshot: AirportGeoIndex(
+            latitudes=snapshot.numeric("latitude"),
+            longitudes=snapshot.numeric("longitude"),
+        ))
+
+    def nearest(self, lat: float, lon: float, k: int = 5) -> List[Dict]:
+        """
+        Find the airports closest to a point.
+        
+        Args:
+            lat (float): Latitude in degrees
+            lon (float): Longitude in degrees
+            k (int): Number of airports to return
+            
+        Returns:
+            List[Dict]: Airport dictionaries with an added distance_km, nearest first
+        """
+        return [dict(self.airports[row], distance_km=round(distance, 1))
+                for row, distance in self.geo_index.nearest(lat, lon, k)]
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> List[Dict]:
+        """
+        Find every airport within a radius of a point.
+        
+        Args:
+            lat (float): Latitude in degrees
+            lon (float): Longitude in degrees
+            radius_km (float): Search radius in kilometres
+            
+        Returns:
+            List[Dict]: Airport dictionaries with an added distance_km, nearest first
+        """
+        return [dict(self.airports[row], distance_km=round(distance, 1))
+                for row, distance in self.geo_index.within_radius(lat, lon, radius_km)]
+
+    def find_airports_near_city(self, city_name: str, radius_km: float = 150, country_name: str = None) -> List[Dict]:
+        """
+        Find alternative airports around a city, e.g. when a route has no flights.
+        
+        The search is centred on the city's preferred airport.
+        
+        Args:
+            city_name (str): Name of the city to search around
+            radius_km (float): Search radius in kilometres
+            country_name (str, optional): Name of the country to filter the city by
+            
+        Returns:
+            List[Dict]: Airport dictionaries with an added distance_km, nearest first,
+            or an empty list if the city cannot be resolved
+        """
+        iata = self.find_first_iata_by_city(city_name, country_name)
+        row = self.__row_by_iata(iata) if iata else None
+        if row is None:
+            return []
+        lat = self.snapshot.numeric("latitude")[row]
+        lon = self.snapshot.numeric("longitude")[row]
+        if math.isnan(lat) or math.isnan(lon):
+            return []
+        return self.within_radius(lat, lon, radius_km)
@@ -0,0 +1,185 @@
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalise a place name for fuzzy matching.
+
+    Lower-cases, strips accents and collapses punctuation and whitespace, so
+    "São Paulo" and "sao  paulo" produce the same key.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char if char.isalnum() else " " for char in text if not unicodedata.combining(char))
+    return " ".join(text.split())
+
+
+def trigrams(term: str) -> Set[str]:
+    """Return the distinct padded trigrams of a normalised term."""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_similarity(a: str, b: str, max_distance: int = 2) -> float:
+    """
+    Edit-distance similarity in [0, 1] (1 means identical).
+
+    Uses optimal string alignment distance, so a transposition counts as one
+    edit, restricted to a diagonal band of ``max_distance``. Pairs further
+    apart than that score 0.
+    """
+    if a == b:
+        return 1.0
+    if len(a) < len(b):
+        a, b = b, a
+    if len(a) - len(b) > max_distance:
+        return 0.0
+
+    too_far = max_distance + 1
+    before_previous = None
+    previous = [j if j <= max_distance else too_far for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [i if i <= max_distance else too_far] + [too_far] * len(b)
+        for j in range(max(1, i - max_distance), min(len(b), i + max_distance) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before_previous[j - 2] + 1)
+            current[j] = value
+        if min(current) > max_distance:
+            return 0.0
+        before_previous, previous = previous, current
+    distance = previous[-1]
+    return 1.0 - distance / len(a) if distance <= max_distance else 0.0
+
+
+class AirportSearchIndex:
+    """
+    A typo-tolerant search index over city names, airport names and codes.
+
+    IATA/ICAO codes and exact normalised names are answered from a dictionary.
+    Everything else goes through a trigram index: candidates are gathered from
+    the posting lists of the query's trigrams, the best few by trigram overlap
+    are re-scored with an edit-distance similarity, and the result is ranked.
+    """
+
+    # Trigrams shared by more terms than this are too common to shortlist on
+    MAX_POSTING = 300
+    # Only this many trigram-overlap leaders are re-scored
+    SHORTLIST = 10
+    # Airport names are long, so partial matches on them rank below city matches
+    NAME_WEIGHT = 0.85
+    # A whole-word prefix only counts as a near match when the names share this
+    # much of their trigrams, so "york" is not taken for "york landing"
+    PREFIX_COVERAGE = 0.5
+    # Shorter queries are contained in too many airport names to score on containment
+    MIN_CONTAINMENT_LENGTH = 6
+
+    def __init__(self, cities: Sequence[str], names: Sequence[str], iatas: Sequence[str], icaos: Sequence[str]):
+        """
+        Build the index from row-aligned airport columns.
+
+        Args:
+            cities (Sequence[str]): City name per airport row
+            names (Sequence[str]): Airport name per airport row
+            iatas (Sequence[str]): IATA code per airport row
+            icaos (Sequence[str]): ICAO code per airport row (may be empty)
+        """
+        self.terms: List[str] = []
+        self.kinds: List[str] = []
+        self.rows: List[List[int]] = []
+        self.gram_counts: List[int] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.exact: Dict[str, int] = {}
+        self.codes: Dict[str, List[Tuple[str, int]]] = {}
+
+        term_ids: Dict[Tuple[str, str], int] = {}
+        for row, (city, name) in enumerate(zip(cities, names)):
+            for kind, term in (("city", normalize_query(city)), ("airport", normalize_query(name))):
+                if not term:
+                    continue
+                term_id = term_ids.get((kind, term))
+                if term_id is None:
+                    term_id = term_ids[(kind, term)] = len(self.terms)
+                    self.terms.append(term)
+                    self.kinds.append(kind)
+                    self.rows.append([])
+                    grams = trigrams(term)
+                    self.gram_counts.append(len(grams))
+                    # City names win exact hits over identically named airports
+                    if kind == "city" or term not in self.exact:
+                        self.exact[term] = term_id
+                    for gram in grams:
+                        self.postings.setdefault(gram, []).append(term_id)
+                self.rows[term_id].append(row)
+
+        for row, (iata, icao) in enumerate(zip(iatas, icaos)):
+            for kind, code in (("iata", iata), ("icao", icao)):
+                if code:
+                    self.codes.setdefault(code.lower(), []).append((kind, row))
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[Tuple[str, str, float, List[int]]]:
+        """
+        Find the best matching terms for a query.
+
+        Args:
+            query (str): Free-text city name, airport name or code
+            limit (int): Maximum number of candidates to return
+            min_score (float): Candidates scoring below this are dropped
+
+        Returns:
+            List[Tuple[str, str, float, List[int]]]: ``(term, kind, score, rows)``
+            tuples, best first. ``kind`` is one of "city", "airport", "iata" or
+            "icao" and ``rows`` are the matching airport row numbers.
+        """
+        term = normalize_query(query)
+        if not term:
+            return []
+
+        results = []
+        if term in self.codes:
+            for kind, row in self.codes[term]:
+                results.append((term.upper(), kind, 1.0, [row]))
+        if term in self.exact:
+            term_id = self.exact[term]
+            results.append((term, self.kinds[term_id], 1.0, self.rows[term_id]))
+        if results:
+            return results[:limit]
+
+        query_grams = trigrams(term)
+        postings = sorted((self.postings.get(gram, []) for gram in query_grams), key=len)
+        # The rarest trigrams are enough to shortlist; grams like "  s" only add noise
+        selective = [posting for posting in postings if len(posting) <= self.MAX_POSTING] or postings[:3]
+        overlap = Counter()
+        for posting in selective:
+            overlap.update(posting)
+        if not overlap:
+            return []
+
+        scored = []
+        for term_id, _ in overlap.most_common(self.SHORTLIST):
+            candidate = self.terms[term_id]
+            shared = len(query_grams & trigrams(candidate))
+            score = max(
+                2.0 * shared / (len(query_grams) + self.gram_counts[term_id]),
+                edit_similarity(term, candidate),
+            )
+            if ((candidate.startswith(term + " ") or term.startswith(candidate + " "))
+                    and shared >= self.PREFIX_COVERAGE * max(len(query_grams), self.gram_counts[term_id])):
+                # "new york city" -> "new york": one name is a whole-word prefix of the other
+                score = max(score, 0.9)
+            if self.kinds[term_id] == "airport":
+                if len(term) >= self.MIN_CONTAINMENT_LENGTH:
+                    # "charles de gaulle" is all there in "charles de gaulle international airport"
+                    score = max(score, shared / len(query_grams))
+                score *= self.NAME_WEIGHT
+            if score >= min_score:
+                scored.append((score, len(self.rows[term_id]), term_id))
+
+        # Higher score first; among equals prefer places served by more airports
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        return [
+            (self.terms[term_id], self.kinds[term_id], round(score, 3), self.rows[term_id])
+            for score, _, term_id in scored[:limit]
+        ]
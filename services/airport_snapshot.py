@@ -0,0 +1,348 @@
+import contextlib
+import csv
+import hashlib
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class AirportSnapshot:
+    """
+    A compiled, memory-mapped snapshot of the airport CSV.
+
+    The CSV is parsed once and written next to it as a compact binary file:
+    a fixed header followed by one string column per field, each stored as
+    an array of ``uint32`` offsets into a UTF-8 string table. The file is
+    mapped read-only, so every service in the process shares the same pages
+    and forked workers inherit them without re-parsing anything.
+
+    The header records the CSV's mtime, size and SHA-256, and the snapshot is
+    rebuilt automatically as soon as any of them no longer matches the CSV.
+    """
+
+    COLUMNS: Tuple[str, ...] = ("city", "name", "country", "iata", "icao")
+    NUMERIC_COLUMNS: Tuple[str, ...] = ("latitude", "longitude")
+    # Fields exposed on the airport dictionaries returned by records()
+    RECORD_FIELDS: Tuple[str, ...] = ("city", "name", "country", "iata")
+
+    _MAGIC = b"APSN"
+    _VERSION = 3
+    # magic, version, column count, row count, csv mtime_ns, csv size, csv sha256
+    _HEADER = struct.Struct("<4sHHIqq32s")
+
+    _registry: Dict[str, "AirportSnapshot"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, path: str, mapping: mmap.mmap):
+        magic, version, column_count, rows, mtime_ns, size, digest = self._HEADER.unpack_from(mapping, 0)
+        expected_columns = len(self.COLUMNS) + len(self.NUMERIC_COLUMNS)
+        if magic != self._MAGIC or version != self._VERSION or column_count != expected_columns:
+            raise ValueError(f"Unsupported airport snapshot format: {path}")
+
+        self.path = path
+        self._mmap = mapping
+        self._view = memoryview(mapping)
+        self.rows = rows
+        self.csv_mtime_ns = mtime_ns
+        self.csv_size = size
+        self.csv_sha256 = digest
+
+        self._offsets: Dict[str, memoryview] = {}
+        self._strings: Dict[str, memoryview] = {}
+        position = self._HEADER.size
+        for column in self.COLUMNS:
+            position = _align(position)
+            (blob_length,) = struct.unpack_from("<I", mapping, position)
+            position += 4
+            offsets_end = position + 4 * (rows + 1)
+            self._offsets[column] = self._view[position:offsets_end].cast("I")
+            self._strings[column] = self._view[offsets_end:offsets_end + blob_length]
+            position = offsets_end + blob_length
+
+        self._numbers: Dict[str, memoryview] = {}
+        for column in self.NUMERIC_COLUMNS:
+            position = _align(position, 8)
+            self._numbers[column] = self._view[position:position + 8 * rows].cast("d")
+            position += 8 * rows
+
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+
+
+    @classmethod
+    def load(cls, csv_path: str, snapshot_path: str = None) -> "AirportSnapshot":
+        """
+        Return the shared snapshot for a CSV file, building it if needed.
+
+        Snapshots are cached per process, so repeated calls for the same CSV
+        return the same mapped object until the CSV changes on disk.
+
+        Args:
+            csv_path (str): Path to the airports CSV file
+            snapshot_path (str, optional): Where to store the compiled snapshot.
+                Defaults to ``<csv_path>.snapshot``.
+
+        Returns:
+            AirportSnapshot: The memory-mapped snapshot
+
+        Raises:
+            FileNotFoundError: If the CSV file cannot be found
+            ValueError: If the CSV file is malformed or empty
+        """
+        csv_path = os.path.abspath(csv_path)
+        with cls._registry_lock:
+            try:
+                stat = os.stat(csv_path)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Airport data file not found: {csv_path}")
+
+            snapshot = cls._registry.get(csv_path)
+            if snapshot is not None and snapshot.matches_stat(stat):
+                return snapshot
+
+            snapshot = cls._open_or_build(csv_path, snapshot_path or f"{csv_path}.snapshot", stat)
+            cls._registry[csv_path] = snapshot
+            return snapshot
+
+    @classmethod
+    def _open_or_build(cls, csv_path: str, snapshot_path: str, stat: os.stat_result) -> "AirportSnapshot":
+        snapshot = cls._try_open(snapshot_path)
+        if snapshot is not None and snapshot.matches_stat(stat) and snapshot.csv_sha256 == _sha256(csv_path):
+            return snapshot
+
+        try:
+            cls.build(csv_path, snapshot_path)
+        except OSError:
+            # The data directory may be read-only; fall back to a per-user temp location
+            digest = hashlib.sha1(csv_path.encode("utf-8")).hexdigest()[:16]
+            snapshot_path = os.path.join(tempfile.gettempdir(), f"airports-{digest}.snapshot")
+            cls.build(csv_path, snapshot_path)
+        return cls._try_open(snapshot_path)
+
+    @classmethod
+    def _try_open(cls, snapshot_path: str) -> "AirportSnapshot":
+        try:
+            with open(snapshot_path, "rb") as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            return cls(snapshot_path, mapping)
+        except (ValueError, TypeError, struct.error):
+            # Views into a truncated file may still reference the mapping
+            with contextlib.suppress(BufferError):
+                mapping.close()
+            return None
+
+    @classmethod
+    def build(cls, csv_path: str, snapshot_path: str) -> None:
+        """
+        Parse the airports CSV and write a compiled snapshot.
+
+        The snapshot is written to a temporary file and atomically moved into
+        place, so concurrent readers never observe a partially written file.
+
+        Args:
+            csv_path (str): Path to the airports CSV file
+            snapshot_path (str): Destination path for the snapshot
+
+        Raises:
+            FileNotFoundError: If the CSV file cannot be found
+            ValueError: If the CSV file is malformed or empty
+        """
+        stat = os.stat(csv_path)
+        rows = read_airports_csv(csv_path)
+
+        chunks = []
+        position = cls._HEADER.size
+        for column in cls.COLUMNS:
+            offsets = array("I", [0])
+            blob = bytearray()
+            for row in rows:
+                blob += row[column].encode("utf-8")
+                offsets.append(len(blob))
+            padding = b"\0" * (_align(position) - position)
+            chunks.extend([padding, struct.pack("<I", len(blob)), offsets.tobytes(), bytes(blob)])
+            position += len(padding) + 4 + len(offsets) * offsets.itemsize + len(blob)
+
+        for column in cls.NUMERIC_COLUMNS:
+            values = array("d", (row[column] for row in rows))
+            padding = b"\0" * (_align(position, 8) - position)
+            chunks.extend([padding, values.tobytes()])
+            position += len(padding) + len(values) * values.itemsize
+
+        header = cls._HEADER.pack(
+            cls._MAGIC, cls._VERSION, len(cls.COLUMNS) + len(cls.NUMERIC_COLUMNS), len(rows),
+            stat.st_mtime_ns, stat.st_size, _sha256(csv_path),
+        )
+
+        directory = os.path.dirname(os.path.abspath(snapshot_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".airports-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(header)
+                for chunk in chunks:
+                    file.write(chunk)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, snapshot_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def matches_stat(self, stat: os.stat_result) -> bool:
+        """Whether the snapshot was built from a CSV with this mtime and size."""
+        return stat.st_mtime_ns == self.csv_mtime_ns and stat.st_size == self.csv_size
+
+    def get(self, column: str, index: int) -> str:
+        """
+        Decode a single field.
+
+        Args:
+            column (str): One of ``COLUMNS``
+            index (int): Row number
+
+        Returns:
+            str: The decoded value
+        """
+        offsets = self._offsets[column]
+        return str(self._strings[column][offsets[index]:offsets[index + 1]], "utf-8")
+
+    def column(self, column: str) -> List[str]:
+        """Decode a whole column in row order."""
+        offsets = self._offsets[column]
+        data = self._strings[column].tobytes()
+        return [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self.rows)]
+
+    def numeric(self, column: str) -> memoryview:
+        """
+        Return a numeric column as a zero-copy ``float64`` view into the mapping.
+
+        Args:
+            column (str): One of ``NUMERIC_COLUMNS``
+
+        Returns:
+            memoryview: Row-aligned values (NaN where the CSV had none)
+        """
+        return self._numbers[column]
+
+    def derived(self, name: str, factory: Callable[["AirportSnapshot"], Any]) -> Any:
+        """
+        Return a structure computed from this snapshot, building it once.
+
+        Indexes derived from the columns are cached here so every service
+        using the snapshot shares a single copy.
+
+        Args:
+            name (str): Cache key for the structure
+            factory (Callable): Builds the structure from the snapshot
+
+        Returns:
+            Any: The cached structure
+        """
+        with self._derived_lock:
+            if name not in self._derived:
+                self._derived[name] = factory(self)
+            return self._derived[name]
+
+    def records(self) -> "AirportRecords":
+        """
+        Return a read-only, list-like view of the rows as airport dictionaries.
+
+        Nothing is decoded up front; each dictionary is built from the mapped
+        columns when its row is accessed.
+        """
+        return AirportRecords(self)
+
+    def __len__(self) -> int:
+        return self.rows
+
+
+class AirportRecords(Sequence):
+    """A lazy sequence of airport dictionaries backed by an AirportSnapshot."""
+
+    def __init__(self, snapshot: AirportSnapshot):
+        self.snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self.snapshot.rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[row] for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("airport row out of range")
+        get = self.snapshot.get
+        return {field: get(field, index) for field in AirportSnapshot.RECORD_FIELDS}
+
+
+def read_airports_csv(path: str) -> List[Dict]:
+    """
+    Parse the OpenFlights airports CSV.
+
+    Args:
+        path (str): Path to the CSV file
+
+    Returns:
+        List[Dict]: List of airport dictionaries containing city, name, country, IATA and ICAO
+        code, latitude and longitude
+
+    Raises:
+        FileNotFoundError: If the CSV file cannot be found
+        ValueError: If the CSV file is malformed or empty
+    """
+    airports = []
+    try:
+        with open(path, encoding="utf-8") as file:
+            reader = csv.reader(file)
+            for row in reader:
+                if len(row) < 5:
+                    continue  # Skip malformed rows
+                iata = row[4].strip()
+                if iata and iata != "\\N":
+                    icao = row[5].strip() if len(row) > 5 else ""
+                    latitude, longitude = _coordinate(row, 6), _coordinate(row, 7)
+                    airports.append({
+                        "city": row[2].strip().lower(),
+                        "name": row[1].strip(),
+                        "country": row[3].strip().lower(),
+                        "iata": iata,
+                        "icao": icao if icao != "\\N" else "",
+                        "latitude": latitude,
+                        "longitude": longitude,
+                    })
+        if not airports:
+            raise ValueError("No valid airport data found in the CSV file")
+        return airports
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Airport data file not found: {path}")
+    except Exception as e:
+        raise ValueError(f"Error loading airport data: {str(e)}")
+
+
+def _sha256(path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def _coordinate(row: List[str], index: int) -> float:
+    try:
+        return float(row[index])
+    except (IndexError, ValueError):
+        return math.nan
+
+
+def _align(position: int, boundary: int = 4) -> int:
+    return (position + boundary - 1) & ~(boundary - 1)
+
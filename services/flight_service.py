@@ -1,23 +1,88 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date, timedelta
+from typing import List
 from services import Service
 from models import UserInput
 from adapters.flight.serpaapi_adapter import SerpAPIAdapter
 
 class FlightService(Service):
 
+  # Two one-way searches, one per leg
+  ONE_WAY = "one_way"
+  # One round-trip search, plus a departure_token follow-up for the return flights
+  ROUND_TRIP = "round_trip"
+  # Leg searches in flight at once across every FlightService
+  LEG_WORKERS = 8
+
+  _shared_executor: ThreadPoolExecutor = None
+  _shared_executor_lock = threading.Lock()
+
   def __init__(self, serp_api_key: str, base_url: str):
     self.adapter = SerpAPIAdapter(serp_api_key, base_url)
+    # Outbound and inbound searches are independent, so run them side by side
+    self.executor = self.shared_executor()
+
+  @classmethod
+  def shared_executor(cls) -> ThreadPoolExecutor:
+    """The process-wide pool that leg searches run on.
+
+    Services are created per tool call, so a pool per service would leave
+    its idle threads behind every time; this one is shared and reused.
+    """
+    with cls._shared_executor_lock:
+      if cls._shared_executor is None:
+        cls._shared_executor = ThreadPoolExecutor(max_workers=cls.LEG_WORKERS, thread_name_prefix="flight-search")
+      return cls._shared_executor
+
+  def _search_legs(self, input: UserInput, refresh: bool = False) -> dict:
+    """Search both legs concurrently, stopping at the first failed leg.
+
+    Returns a dict of direction -> adapter result. If a leg errors or finds no
+    flights, the other leg is cancelled (or abandoned if already in flight)
+    and only the failed leg is returned.
+    """
+    futures = {
+      self.executor.submit(self.adapter.search_flights, input, direction=direction, refresh=refresh): direction
+      for direction in ("outbound", "inbound")
+    }
+    results = {}
+    pending = set(futures)
+    while pending:
+      done, pending = wait(pending, return_when=FIRST_COMPLETED)
+      # Outbound first, as when the legs were searched one after the other
+      for future in sorted(done, key=lambda future: futures[future] != "outbound"):
+        result = future.result()
+        if "error" in result or result.get("status") == "no_flights":
+          for other in pending:
+            other.cancel()
+          return {futures[future]: result}
+        results[futures[future]] = result
+    return results
+
+  def run(self, input: UserInput, refresh: bool = False, mode: str = ONE_WAY, include_inbound: bool = True):
+    """Find the outbound and inbound flights for a trip.
+
+    mode picks how SerpAPI is queried: ONE_WAY searches each leg separately
+    (always two provider calls), ROUND_TRIP makes one round-trip query and
+    only fetches the return flights when include_inbound is set. The
+    response reports the provider calls made in "provider_calls"; cached
+    searches count as none.
+    """
+    if mode == self.ROUND_TRIP:
+      return self._run_round_trip(input, refresh=refresh, include_inbound=include_inbound)
+    if mode != self.ONE_WAY:
+      return {"error": f"Unknown flight search mode: {mode}"}
 
-  def run(self, input: UserInput):
     try:
-      outbound_result = self.adapter.search_flights(input, direction="outbound")
-      if "error" in outbound_result:
-        return outbound_result
-      outbound_flight = outbound_result.get("flight")
-
-      inbound_result = self.adapter.search_flights(input, direction="inbound")
-      if "error" in inbound_result:
-        return inbound_result
-      inbound_flight = inbound_result.get("flight")
+      results = self._search_legs(input, refresh=refresh)
+      if len(results) == 1:
+        # One leg failed; surface its error or no_flights result unchanged
+        return next(iter(results.values()))
+
+      outbound_flight = results["outbound"].get("flight")
+      inbound_flight = results["inbound"].get("flight")
   
       outbound_price = outbound_flight.details.price
       inbound_price = inbound_flight.details.price
@@ -31,8 +96,210 @@ class FlightService(Service):
           "outbound": outbound_flight,
           "inbound": inbound_flight
         },
-        "total_price": total_price
+        "total_price": total_price,
+        "provider_calls": sum(result.get("provider_calls", 0) for result in results.values())
       }
 
     except Exception as e:
-        return {"error": f"FlightService failed: {str(e)}"}
\ No newline at end of file
+        return {"error": f"FlightService failed: {str(e)}"}
+
+  def _run_round_trip(self, input: UserInput, refresh: bool = False, include_inbound: bool = True) -> dict:
+    result = self.adapter.search_round_trip(input, include_inbound=include_inbound, refresh=refresh)
+    if result.get("status") != "success":
+      return result
+    return {
+      "status": "success",
+      "flights": {
+        "outbound": result["flight"],
+        "inbound": result.get("inbound")
+      },
+      "total_price": result["total_price"],
+      "provider_calls": result["provider_calls"]
+    }
+
+  def run_flexible(self, input: UserInput, window_days: int = 3, max_concurrency: int = 8) -> dict:
+    """Search every date within +/- window_days of the requested dates.
+
+    Each outbound and inbound date is searched once as a one-way leg, so a
+    7x7 window costs 14 provider calls rather than 49, issued in parallel
+    with at most max_concurrency in flight. Dates in the past and return
+    dates on or before the departure date are skipped.
+
+    Returns a price matrix keyed by departure date then return date (None
+    where a combination has no flights), the cheapest combination and the
+    provider calls made; cached searches count as none.
+    """
+    try:
+      departure = date.fromisoformat(input.departure_date_leaving)
+      return_date = date.fromisoformat(input.arrival_date_coming_back)
+    except ValueError:
+      return {"error": "Flexible search needs ISO departure and return dates"}
+
+    offsets = range(-window_days, window_days + 1)
+    today = date.today()
+    departure_dates = [departure + timedelta(days=offset) for offset in offsets if departure + timedelta(days=offset) >= today]
+    return_dates = [return_date + timedelta(days=offset) for offset in offsets if return_date + timedelta(days=offset) > today]
+
+    legs = [("outbound", day) for day in departure_dates] + [("inbound", day) for day in return_dates]
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="flexible-flight-search") as executor:
+      futures = {
+        (direction, day): executor.submit(self._search_leg_on, input, direction, day)
+        for direction, day in legs
+      }
+      results = {leg: future.result() for leg, future in futures.items()}
+    flights = {leg: flight for leg, (flight, _) in results.items()}
+    provider_calls = sum(calls for _, calls in results.values())
+
+    price_matrix = {}
+    cheapest = None
+    for leaving in departure_dates:
+      row = price_matrix[leaving.isoformat()] = {}
+      outbound = flights[("outbound", leaving)]
+      for coming_back in return_dates:
+        if coming_back <= leaving:
+          continue
+        inbound = flights[("inbound", coming_back)]
+        if not outbound or not inbound:
+          row[coming_back.isoformat()] = None
+          continue
+        total = outbound.details.price.amount + inbound.details.price.amount
+        row[coming_back.isoformat()] = round(total, 2)
+        if cheapest is None or total < cheapest[0]:
+          cheapest = (total, leaving, coming_back, outbound, inbound)
+
+    if cheapest is None:
+      return {
+        "status": "no_flights",
+        "message": f"No flights found for {input.departure_location} to {input.arrival_location} "
+                   f"within {window_days} days of {input.departure_date_leaving}",
+        "price_matrix": price_matrix,
+        "provider_calls": provider_calls
+      }
+
+    total, leaving, coming_back, outbound, inbound = cheapest
+    return {
+      "status": "success",
+      "price_matrix": price_matrix,
+      "cheapest": {
+        "departure_date_leaving": leaving.isoformat(),
+        "arrival_date_coming_back": coming_back.isoformat(),
+        "flights": {
+          "outbound": outbound,
+          "inbound": inbound
+        },
+        "total_price": f"{outbound.details.price.currency}{total:.2f}"
+      },
+      "provider_calls": provider_calls
+    }
+
+  def _search_leg_on(self, input: UserInput, direction: str, day: date):
+    """Search one leg on a specific date, returning the Flight (or None) and the provider calls made."""
+    field = "departure_date_leaving" if direction == "outbound" else "arrival_date_coming_back"
+    result = self.adapter.search_flights(input.model_copy(update={field: day.isoformat()}), direction=direction)
+    return result.get("flight") if result.get("status") == "success" else None, result.get("provider_calls", 0)
+
+  def run_multi_airport(self, input: UserInput, origins: List[str], destinations: List[str],
+                        max_concurrency: int = 6, pair_timeout: float = 10.0, latency_budget: float = 15.0) -> dict:
+    """Search every origin x destination airport pair and rank the round trips.
+
+    Each pair's outbound and inbound legs are searched concurrently with at
+    most max_concurrency provider calls in flight. A leg still running
+    pair_timeout seconds after it started is abandoned, as is whatever has
+    not finished when latency_budget seconds have passed, so one slow pair
+    cannot hold up the response.
+
+    Returns the cheapest pair in the same "flights"/"total_price" shape as
+    run(), plus every priced pair in "options" (cheapest first) and the pairs
+    that ran out of time in "timed_out".
+    """
+    pairs = [(origin, destination) for origin in origins for destination in destinations if origin != destination]
+    if not pairs:
+      return {"error": "No airport pairs to search"}
+
+    deadline = time.monotonic() + latency_budget
+    executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="multi-airport-search")
+    futures = {}
+    # Leg -> when its search started; a queued leg has no pair deadline yet
+    started = {}
+    for origin, destination in pairs:
+      pair_input = input.model_copy(update={"departure_location": origin, "arrival_location": destination})
+      for direction in ("outbound", "inbound"):
+        leg = (origin, destination, direction)
+        futures[executor.submit(self._timed_search, pair_input, direction, started, leg)] = leg
+
+    done = set()
+    overdue = set()
+    pending = set(futures)
+    while pending:
+      now = time.monotonic()
+      for future in [future for future in pending if futures[future] in started]:
+        if now - started[futures[future]] >= pair_timeout:
+          pending.discard(future)
+          overdue.add(future)
+      if not pending or now >= deadline:
+        break
+      # Wake at the next leg's deadline (or the budget) to abandon it if it is still running
+      wake = min([deadline] + [started[futures[future]] + pair_timeout for future in pending if futures[future] in started])
+      finished, pending = wait(pending, timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+      done |= finished
+    overdue |= pending
+    for future in overdue:
+      future.cancel()
+    # Don't wait for abandoned requests; their threads finish in the background
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    legs = {}
+    timed_out = set((origin, destination) for origin, destination, _ in (futures[future] for future in overdue))
+    for future in done:
+      origin, destination, direction = futures[future]
+      result, elapsed = future.result()
+      if elapsed > pair_timeout:
+        timed_out.add((origin, destination))
+      elif result.get("status") == "success":
+        legs[(origin, destination, direction)] = result["flight"]
+
+    options = []
+    for origin, destination in pairs:
+      outbound = legs.get((origin, destination, "outbound"))
+      inbound = legs.get((origin, destination, "inbound"))
+      if outbound and inbound:
+        amount = outbound.details.price.amount + inbound.details.price.amount
+        options.append({
+          "origin": origin,
+          "destination": destination,
+          "flights": {
+            "outbound": outbound,
+            "inbound": inbound
+          },
+          "total_amount": round(amount, 2),
+          "total_price": f"{outbound.details.price.currency}{amount:.2f}"
+        })
+    options.sort(key=lambda option: option["total_amount"])
+
+    if not options:
+      return {
+        "status": "no_flights",
+        "message": f"No flights found between {', '.join(origins)} and {', '.join(destinations)}",
+        "timed_out": sorted(timed_out)
+      }
+
+    best = options[0]
+    return {
+      "status": "success",
+      "flights": best["flights"],
+      "total_price": best["total_price"],
+      "options": options,
+      "timed_out": sorted(timed_out)
+    }
+
+  def _timed_search(self, input: UserInput, direction: str, started: dict = None, leg=None):
+    """Run one adapter search and report how long it took once started.
+
+    The start time is also written to started[leg] when given, so the caller
+    can tell how long a search that hasn't finished has been running.
+    """
+    start = time.monotonic()
+    if started is not None:
+      started[leg] = start
+    result = self.adapter.search_flights(input, direction=direction)
+    return result, time.monotonic() - start
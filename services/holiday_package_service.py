@@ -4,7 +4,9 @@ from models.holiday_package import HolidayPackage
 from models.flight import Flight
 from models.hotel import Hotel
 from models.activity import Activity
+from models.itinerary import ItineraryDay
 from models.price import Price
+from services.itinerary_planner import ItineraryPlanner
 import uuid
 import logging
 
@@ -26,10 +28,18 @@ class HolidayPackageService:
         end_date: date,
         number_of_guests: int,
         number_of_rooms: int,
-        package_type: str
+        package_type: str,
+        itinerary: Optional[List[ItineraryDay]] = None
     ) -> HolidayPackage:
-        """Create a new holiday package"""
+        """Create a new holiday package
+
+        Without an itinerary, one is planned from the activities, starting
+        each day at the hotel.
+        """
         try:
+            if itinerary is None and activities:
+                itinerary = ItineraryPlanner().plan(activities, start_date, end_date, hotel.location if hotel else None)
+
             package = HolidayPackage(
                 id=str(uuid.uuid4()),
                 name=name,
@@ -38,6 +48,7 @@ class HolidayPackageService:
                 inbound_flight=inbound_flight,
                 hotel=hotel,
                 activities=activities,
+                itinerary=itinerary,
                 start_date=start_date,
                 end_date=end_date,
                 number_of_guests=number_of_guests,
@@ -87,6 +98,9 @@ class HolidayPackageService:
         package = self.get_package(package_id)
         if package:
             package.activities = activities
+            package.itinerary = ItineraryPlanner().plan(
+                activities, package.start_date, package.end_date, package.hotel.location if package.hotel else None
+            ) if activities else None
             package.total_price = package.calculate_total_price()
             package.updated_at = date.today()
             logger.info(f"Updated activities for package {package_id}")
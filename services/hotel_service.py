@@ -1,26 +1,185 @@
-from typing import List, Dict, Any
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from typing import Awaitable, Callable, List, Dict, Any, Optional
 from models.hotel import Hotel
 from services.base import Service
+from services.airport_geo import haversine_km
+from services.provider_stats import ProviderStats
 from adapters.hotel.bookingcom_adapter import BookingAdapter
+from adapters.hotel.skyscrapperbooking_adapter import SkyScrapperBookingAdapter
 from models import UserInput
 import os
 
+logger = logging.getLogger(__name__)
+
+# Words that differ between providers' names for the same property
+_NAME_NOISE = {"hotel", "the", "and", "by"}
+
+def normalise_hotel_name(name: str) -> str:
+    """Lowercase, accent-free, punctuation-free name without filler words."""
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    return " ".join(word for word in re.split(r"[^a-z0-9]+", name) if word and word not in _NAME_NOISE)
+
+def dedupe_hotels(hotels: List[Hotel], radius_km: float = 0.25) -> List[Hotel]:
+    """Drop hotels listed more than once, keeping the cheapest listing.
+
+    Two listings are the same property when their normalised names match
+    and they lie within radius_km of each other (or either has no
+    coordinates). Fields the kept listing lacks are filled from the other.
+    Order follows the first listing of each property.
+    """
+    kept: List[Hotel] = []
+    by_name: Dict[str, List[int]] = {}
+    for hotel in hotels:
+        name = normalise_hotel_name(hotel.name)
+        match = None
+        for index in by_name.get(name, ()):
+            other = kept[index]
+            if not hotel.location or not other.location or haversine_km(
+                hotel.location.lat, hotel.location.lon, other.location.lat, other.location.lon
+            ) <= radius_km:
+                match = index
+                break
+        if match is None:
+            by_name.setdefault(name, []).append(len(kept))
+            kept.append(hotel)
+            continue
+
+        other = kept[match]
+        if _price(hotel) < _price(other):
+            hotel, other = other, hotel
+        kept[match] = other.model_copy(update={
+            field: getattr(hotel, field) for field in Hotel.model_fields
+            if getattr(other, field) in (None, []) and getattr(hotel, field) not in (None, [])
+        })
+    return kept
+
+def _price(hotel: Hotel) -> float:
+    return hotel.total_price.amount if hotel.total_price else float('inf')
+
 class HotelService(Service):
+    # Once one provider has a good-enough answer, seconds to wait for the other before answering with it
+    HEDGE_DELAY = 1.0
+    # Seconds to wait for any provider at all
+    TIMEOUT = 20.0
+
     def __init__(self):
         super().__init__()
         self.booking_adapter = BookingAdapter(api_key=os.getenv("RAPIDAPIKEY"))
+        self.skyscrapper_adapter = SkyScrapperBookingAdapter(api_key=os.getenv("RAPIDAPIKEY"))
+        self.providers: Dict[str, Callable[[UserInput, int], Awaitable[List[Hotel]]]] = {
+            BookingAdapter.PROVIDER: self._search_booking,
+            SkyScrapperBookingAdapter.PROVIDER: self._search_skyscrapper,
+        }
+        self.stats = ProviderStats.shared("hotels")
+
+    async def _search_booking(self, input: UserInput, top_n: int) -> List[Hotel]:
+        return [
+            Hotel.from_api(
+                hotel_data=hotel,
+                check_in=input.departure_date_leaving,
+                check_out=input.arrival_date_coming_back
+            )
+            for hotel in await self.booking_adapter.search_hotels_async(input, top_k=top_n)
+        ]
 
-    async def search_hotels(self, input: UserInput) -> List[Dict[str, Any]]:
+    async def _search_skyscrapper(self, input: UserInput, top_n: int) -> List[Hotel]:
+        response = await self.skyscrapper_adapter.search_hotels_async(input, top_k=top_n)
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response["results"]
+
+    async def _timed_search(self, provider: str, input: UserInput, top_n: int) -> Optional[List[Hotel]]:
+        """One provider's hotels, or None if it failed; records its latency either way."""
+        start = time.perf_counter()
         try:
-            response = self.booking_adapter.search_hotels(input)
-            return response  # response is already a list of hotels
+            hotels = await self.providers[provider](input, top_n)
+        except asyncio.CancelledError:
+            self.stats.record_cancelled(provider)
+            raise
         except Exception as e:
-            print(f"Error searching hotels: {str(e)}")
-            return []
+            logger.warning("Error searching hotels on %s: %s", provider, e)
+            hotels = None
+        self.stats.record_call(provider, time.perf_counter() - start, hotels is not None)
+        return hotels
 
-    async def get_hotel_details(self, input: UserInput) -> Dict[str, Any]:
+    async def search_hotels(self, input: UserInput, top_n: int = 1, hedge_delay: float = None,
+                            timeout: float = None) -> List[Hotel]:
+        """The top_n cheapest hotels across every provider, cheapest first.
+
+        All providers are queried at once. As soon as one returns at least
+        top_n hotels, the others get hedge_delay more seconds (HEDGE_DELAY by
+        default); whatever has arrived by then is merged and deduplicated.
+        If no provider has a good-enough answer, every answer received
+        within timeout seconds is used.
+        """
+        hedge_delay = self.HEDGE_DELAY if hedge_delay is None else hedge_delay
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self.TIMEOUT if timeout is None else timeout)
+        tasks = {
+            asyncio.ensure_future(self._timed_search(provider, input, top_n)): provider
+            for provider in self.providers
+        }
+
+        answers: Dict[str, List[Hotel]] = {}
+        winner = None
+        pending = set(tasks)
+        while pending:
+            timeout_at = deadline if winner is None else min(deadline, hedge_at)
+            done, pending = await asyncio.wait(pending, timeout=max(0.0, timeout_at - loop.time()),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                hotels = task.result()
+                if hotels is None:
+                    continue
+                answers[tasks[task]] = hotels
+                if winner is None and len(hotels) >= top_n:
+                    winner = tasks[task]
+                    hedge_at = loop.time() + hedge_delay
+        for task in pending:
+            task.cancel()
+
+        if winner is None and answers:
+            winner = min(answers, key=lambda provider: _price(answers[provider][0]) if answers[provider] else float('inf'))
+        self.stats.record_search(winner, merged=len(answers) > 1)
+
+        # The winner's listings come first, so its copy of a shared property is kept on a price tie
+        ordered = ([winner] if winner else []) + [provider for provider in answers if provider != winner]
+        hotels = dedupe_hotels([hotel for provider in ordered for hotel in answers[provider]])
+        return sorted(hotels, key=_price)[:top_n]
+
+    async def get_hotel_details(self, hotel_ids: List[str], input: UserInput) -> Dict[str, Any]:
+        """Details for hotels found by a previous search, by hotel ID."""
         try:
-            return self.booking_adapter.get_hotel_details(input)
+            return await self.booking_adapter.get_hotel_details_async(hotel_ids, input)
         except Exception as e:
-            print(f"Error getting hotel details: {str(e)}")
+            logger.warning("Error getting hotel details: %s", e)
             return {}
+
+    async def search_hotels_with_details(self, input: UserInput, top_n: int = 3) -> List[Hotel]:
+        """Find the top_n cheapest hotels and fill them in from getHotelDetails.
+
+        Costs one search plus top_n detail requests; the detail requests run
+        in parallel, so the whole flow takes about two round trips.
+        """
+        try:
+            hotels = await self.booking_adapter.search_hotels_async(input, top_k=top_n)
+            if not hotels:
+                return []
+            details = await self.booking_adapter.get_hotel_details_async([hotel.get("hotel_id") for hotel in hotels], input)
+            return [
+                Hotel.from_api(
+                    hotel_data=hotel,
+                    check_in=input.departure_date_leaving,
+                    check_out=input.arrival_date_coming_back
+                ).with_details(details.get(str(hotel.get("hotel_id")), {}))
+                for hotel in hotels
+            ]
+        except Exception as e:
+            logger.warning("Error searching hotels: %s", e)
+            return []
@@ -0,0 +1,197 @@
+import math
+from datetime import date, timedelta
+from typing import List, Optional, Sequence, Union
+
+from models.activity import Activity
+from models.itinerary import ItineraryDay
+from models.location import Location
+from services.airport_geo import EARTH_RADIUS_KM
+
+# Route position that is at zero distance from everything: the open end of a
+# day with no start location
+_ANYWHERE = -1
+
+
+class ItineraryPlanner:
+    """
+    Spread activities over the days of a trip and order each day's visits.
+
+    Activities are taken in priority order (the order given, e.g. search
+    rank) and each is inserted where it adds the least travel, across every
+    day and every position in that day, as long as the day's time budget
+    still holds. A small penalty on fuller days spreads activities over the
+    trip instead of packing the first days. Each day's route is then
+    shortened with 2-opt. Days start and end at ``start`` (the hotel) when
+    it is known, otherwise they are open paths.
+
+    Distances use an equirectangular projection around the activities'
+    centre, which is accurate to well under 1% at city scale. Activities
+    without coordinates cost no travel and go wherever there is time.
+    """
+
+    # Minutes available for activities and travel on a full day
+    DAY_MINUTES = 8 * 60
+    # Arrival and departure days
+    TRAVEL_DAY_MINUTES = 4 * 60
+    # Assumed length of an activity with no duration
+    DEFAULT_ACTIVITY_MINUTES = 120
+    # Average door-to-door speed between stops in a city (walking and transit)
+    SPEED_KMH = 12.0
+    # Travel-minutes equivalent of a fully booked day when choosing where to insert
+    BALANCE_MINUTES = 45.0
+
+    def __init__(self, day_minutes: float = DAY_MINUTES, travel_day_minutes: float = TRAVEL_DAY_MINUTES,
+                 default_activity_minutes: float = DEFAULT_ACTIVITY_MINUTES, speed_kmh: float = SPEED_KMH,
+                 max_per_day: int = None, balance_minutes: float = BALANCE_MINUTES):
+        """
+        Args:
+            day_minutes (float): Budget for a full day
+            travel_day_minutes (float): Budget for the first and last day
+            default_activity_minutes (float): Duration of activities that have none
+            speed_kmh (float): Speed used to turn distance into travel time
+            max_per_day (int, optional): Most activities on one day
+            balance_minutes (float): Preference for emptier days, in travel minutes
+        """
+        self.day_minutes = day_minutes
+        self.travel_day_minutes = travel_day_minutes
+        self.default_activity_minutes = default_activity_minutes
+        self.speed_kmh = speed_kmh
+        self.max_per_day = max_per_day
+        self.balance_minutes = balance_minutes
+
+    def budgets(self, start_date: Union[date, str], end_date: Union[date, str]) -> List[tuple]:
+        """(date, minutes) for every day from start_date to end_date inclusive."""
+        start_date, end_date = _as_date(start_date), _as_date(end_date)
+        days = (end_date - start_date).days + 1
+        if days <= 0:
+            return []
+        if days == 1:
+            return [(start_date, self.travel_day_minutes)]
+        return [
+            (start_date + timedelta(days=offset),
+             self.travel_day_minutes if offset in (0, days - 1) else self.day_minutes)
+            for offset in range(days)
+        ]
+
+    def plan(self, activities: Sequence[Activity], start_date: Union[date, str], end_date: Union[date, str],
+             start: Optional[Location] = None) -> List[ItineraryDay]:
+        """
+        Build a day-by-day itinerary.
+
+        Args:
+            activities (Sequence[Activity]): Candidates, most wanted first
+            start_date (date | str): First day of the trip (ISO date string or date)
+            end_date (date | str): Last day of the trip
+            start (Location, optional): Where each day starts and ends, e.g. the hotel
+
+        Returns:
+            List[ItineraryDay]: One entry per trip day, in date order. Activities
+            that don't fit any day's budget are left out.
+        """
+        budgets = self.budgets(start_date, end_date)
+        if not budgets:
+            return []
+
+        self._project(activities, start)
+        minutes = [
+            activity.duration.total_seconds() / 60 if activity.duration else self.default_activity_minutes
+            for activity in activities
+        ]
+        routes = self._assign(minutes, [budget for _, budget in budgets])
+
+        plan = []
+        for (day, _), route in zip(budgets, routes):
+            route = self._two_opt(route)
+            km = self._route_km(route)
+            plan.append(ItineraryDay(
+                day=day,
+                activities=[activities[i] for i in route],
+                activity_minutes=sum(minutes[i] for i in route),
+                travel_minutes=round(km / self.speed_kmh * 60, 1),
+                travel_km=round(km, 3),
+            ))
+        return plan
+
+    def _project(self, activities: Sequence[Activity], start: Optional[Location]) -> None:
+        points = [activity.location for activity in activities]
+        located = [point for point in points + [start] if point is not None]
+        centre_lat = sum(point.lat for point in located) / len(located) if located else 0.0
+        scale = math.radians(1) * EARTH_RADIUS_KM
+        x_scale = scale * math.cos(math.radians(centre_lat))
+
+        def project(point: Optional[Location]):
+            return None if point is None else (point.lon * x_scale, point.lat * scale)
+
+        self._xy = [project(point) for point in points]
+        self._start = project(start)
+
+    def _km(self, a: int, b: int) -> float:
+        """Distance between route positions; the start is len(activities), _ANYWHERE is nowhere."""
+        p = self._start if a == len(self._xy) else None if a == _ANYWHERE else self._xy[a]
+        q = self._start if b == len(self._xy) else None if b == _ANYWHERE else self._xy[b]
+        if p is None or q is None:
+            return 0.0
+        return math.hypot(p[0] - q[0], p[1] - q[1])
+
+    def _ends(self) -> tuple:
+        end = len(self._xy) if self._start is not None else _ANYWHERE
+        return end, end
+
+    def _route_km(self, route: List[int]) -> float:
+        first, last = self._ends()
+        stops = [first] + route + [last]
+        return sum(self._km(stops[i], stops[i + 1]) for i in range(len(stops) - 1))
+
+    def _assign(self, minutes: List[float], budgets: List[float]) -> List[List[int]]:
+        """Cheapest feasible insertion, in priority order."""
+        first, last = self._ends()
+        routes: List[List[int]] = [[] for _ in budgets]
+        busy = [0.0] * len(budgets)
+        travel_km = [0.0] * len(budgets)
+        per_minute_km = self.speed_kmh / 60
+
+        for activity, duration in enumerate(minutes):
+            best = None
+            for day, route in enumerate(routes):
+                if self.max_per_day and len(route) >= self.max_per_day:
+                    continue
+                if busy[day] + duration > budgets[day]:
+                    continue
+                stops = [first] + route + [last]
+                # Preference for days with more room left, in travel minutes
+                load = self.balance_minutes * busy[day] / budgets[day]
+                for position in range(len(stops) - 1):
+                    before, after = stops[position], stops[position + 1]
+                    added_km = self._km(before, activity) + self._km(activity, after) - self._km(before, after)
+                    total = busy[day] + duration + (travel_km[day] + added_km) / per_minute_km
+                    if total > budgets[day]:
+                        continue
+                    cost = added_km / per_minute_km + load
+                    if best is None or cost < best[0]:
+                        best = (cost, day, position, added_km)
+            if best is None:
+                continue
+            _, day, position, added_km = best
+            routes[day].insert(position, activity)
+            busy[day] += duration
+            travel_km[day] += added_km
+        return routes
+
+    def _two_opt(self, route: List[int]) -> List[int]:
+        """Reverse segments of the day's route while that shortens it."""
+        first, last = self._ends()
+        stops = [first] + route + [last]
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, len(stops) - 2):
+                for j in range(i + 1, len(stops) - 1):
+                    a, b, c, d = stops[i - 1], stops[i], stops[j], stops[j + 1]
+                    if self._km(a, c) + self._km(b, d) < self._km(a, b) + self._km(c, d) - 1e-9:
+                        stops[i:j + 1] = reversed(stops[i:j + 1])
+                        improved = True
+        return stops[1:-1]
+
+
+def _as_date(value: Union[date, str]) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
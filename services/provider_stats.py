@@ -0,0 +1,87 @@
+import threading
+from collections import deque
+from typing import Any, Dict
+
+
+class ProviderStats:
+    """
+    Latency and win counters for providers queried side by side.
+
+    A provider "wins" a search when its answer is the one the search was
+    built on, i.e. the first good-enough answer. Latencies are kept for the
+    last ``window`` completed calls per provider; calls cancelled because
+    the search answered without them are only counted.
+    """
+
+    _shared: Dict[str, "ProviderStats"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, name: str, window: int = 200):
+        """
+        Args:
+            name (str): Label for the providers compared, e.g. "hotels"
+            window (int): Latencies kept per provider
+        """
+        self.name = name
+        self.window = window
+        self._providers: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.merged = 0
+
+    @classmethod
+    def shared(cls, name: str) -> "ProviderStats":
+        """The process-wide stats for a name, so every service instance adds to the same counters."""
+        with cls._shared_lock:
+            if name not in cls._shared:
+                cls._shared[name] = cls(name)
+            return cls._shared[name]
+
+    def _provider(self, provider: str) -> Dict[str, Any]:
+        if provider not in self._providers:
+            self._providers[provider] = {"calls": 0, "errors": 0, "cancelled": 0, "wins": 0, "latencies": deque(maxlen=self.window)}
+        return self._providers[provider]
+
+    def record_call(self, provider: str, latency: float, ok: bool) -> None:
+        """Record one provider call that took latency seconds."""
+        with self._lock:
+            entry = self._provider(provider)
+            entry["calls"] += 1
+            entry["errors"] += 0 if ok else 1
+            entry["latencies"].append(latency)
+
+    def record_cancelled(self, provider: str) -> None:
+        """Record one provider call abandoned before it finished."""
+        with self._lock:
+            self._provider(provider)["cancelled"] += 1
+
+    def record_search(self, winner: str = None, merged: bool = False) -> None:
+        """Record one search, the provider it was built on, and whether answers were merged."""
+        with self._lock:
+            self.searches += 1
+            self.merged += 1 if merged else 0
+            if winner is not None:
+                self._provider(winner)["wins"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-provider calls, errors, cancellations, latency percentiles (ms) and win rate."""
+        with self._lock:
+            providers = {}
+            for provider, entry in self._providers.items():
+                latencies = sorted(entry["latencies"])
+                providers[provider] = {
+                    "calls": entry["calls"],
+                    "errors": entry["errors"],
+                    "cancelled": entry["cancelled"],
+                    "wins": entry["wins"],
+                    "win_rate": round(entry["wins"] / self.searches, 3) if self.searches else 0.0,
+                    "p50_ms": _percentile(latencies, 0.5),
+                    "p95_ms": _percentile(latencies, 0.95),
+                }
+            return {"searches": self.searches, "merged": self.merged, "providers": providers}
+
+
+def _percentile(ordered, fraction: float):
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 1)
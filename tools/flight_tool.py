@@ -5,16 +5,25 @@ from langchain.tools import tool
 from dotenv import load_dotenv
 import os
 import json
+from typing import List, Union
 
 load_dotenv()
 
 airport_lookup = CityToAirportService("data/airports.dat")
 
 @tool()
-def get_iata_code(city_name: str) -> str:
+def get_iata_code(city_name: Union[str, List[str]]) -> str:
  """
  Returns the IATA code for a given city and its airport.
+ Accepts a list of cities to resolve every leg of a multi-city trip in one call.
  """
+ if isinstance(city_name, list):
+  codes = airport_lookup.resolve_many(city_name)
+  return json.dumps([
+   {"city": city, "iata": code} if code else {"city": city, "error": f"No IATA code found for city: {city}"}
+   for city, code in zip(city_name, codes)
+  ])
+
  code = airport_lookup.find_first_iata_by_city(city_name)
  if code:
   return code
@@ -1,10 +1,10 @@
 from services import HotelService
 from models import UserInput
+from adapters.transport import run_sync
 from langchain.tools import tool
 from dotenv import load_dotenv
 import os
 import json
-import asyncio
 
 load_dotenv()
 
@@ -32,8 +32,8 @@ def plan_hotel(departure_location: str, arrival_location: str, adult_guests: str
     # Call HotelService
     hotel_service = HotelService()
     try:
-        # Run the async search_hotels method
-        response = asyncio.run(hotel_service.search_hotels(input=hotel_input))
-        return json.dumps(response, default=str)
+        # Run the async search on the shared loop, so tool calls reuse pooled connections
+        response = run_sync(hotel_service.search_hotels(input=hotel_input))
+        return json.dumps([hotel.model_dump(mode="json") for hotel in response], default=str)
     except Exception as e:
         return json.dumps({"error": str(e)})
\ No newline at end of file